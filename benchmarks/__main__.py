@@ -0,0 +1,360 @@
+"""
+Benchmark jscc's checks, walkers and :meth:`jscc.schema.extend_schema` on synthetic corpora, at several scales.
+
+.. code-block:: bash
+
+   python -m benchmarks --save baseline.json
+   # ... make changes ...
+   python -m benchmarks --compare baseline.json
+
+For each benchmark and scale, the minimum time of :code:`--repeat` runs and the peak memory allocated by Python
+during one more run (with ``tracemalloc``) are reported. The scaling exponent is the slope of time against scale on a
+log-log plot, between the smallest and largest scales: about 1 is linear, and about 2 is quadratic.
+
+With :code:`--compare`, the exit status is 1 if any time or peak memory exceeds the baseline by more than the
+tolerance. Baselines are specific to a machine and Python version.
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import functools
+import http.server
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import warnings
+
+import jsonref
+
+from benchmarks import corpus
+from jscc.schema import NodeTable, extend_schema
+from jscc.testing import checks
+from jscc.testing.checks import (
+    get_empty_files,
+    get_invalid_json_files,
+    get_misindented_files,
+    validate_array_items,
+    validate_codelist_enum,
+    validate_codelists,
+    validate_deep_properties,
+    validate_items_type,
+    validate_letter_case,
+    validate_merge_properties,
+    validate_metadata_presence,
+    validate_null_type,
+    validate_object_id,
+    validate_ref,
+    validate_schema_codelists_match,
+)
+from jscc.testing.filesystem import CodelistCache, walk_csv_data, walk_json_data
+from jscc.testing.util import http_get
+
+BENCHMARKS = {}
+
+
+def benchmark(function):
+    """Register a function that accepts a :class:`Context` and returns the function to time."""
+    BENCHMARKS[function.__name__] = function
+    return function
+
+
+class Context:
+    def __init__(self, directory, scale, url):
+        #: The directory of the corpus, which is the working directory while benchmarking.
+        self.directory = directory
+        #: The scale of the corpus.
+        self.scale = scale
+        #: The base URL of an HTTP server for the directory.
+        self.url = url
+
+    @functools.cached_property
+    def schema(self):
+        with open(os.path.join("schema", "release-schema.json")) as f:
+            return json.load(f)
+
+    @functools.cached_property
+    def dereferenced(self):
+        return jsonref.replace_refs(self.schema)
+
+
+def _consume(iterable):
+    for _ in iterable:
+        pass
+
+
+def _schema_check(function, **kwargs):
+    def setup(context):
+        schema = context.schema
+        return lambda: function("schema/release-schema.json", schema, **kwargs)
+
+    setup.__name__ = function.__name__
+    return setup
+
+
+for _function in (
+    validate_array_items,
+    validate_deep_properties,
+    validate_items_type,
+    validate_letter_case,
+    validate_merge_properties,
+    validate_metadata_presence,
+    validate_null_type,
+    validate_ref,
+):
+    benchmark(_schema_check(_function))
+
+
+@benchmark
+def traverse(context):
+    method = checks._traverse(lambda path, data, pointer: 0)  # noqa: ARG005, SLF001
+    schema = context.schema
+    return lambda: method("schema/release-schema.json", schema)
+
+
+@benchmark
+def node_table_compile(context):
+    schema = context.schema
+    return lambda: NodeTable.compile(schema)
+
+
+@benchmark
+def validate_codelist_enum_cached(context):
+    schema = context.schema
+
+    def run():
+        validate_codelist_enum("schema/release-schema.json", schema, cache=CodelistCache())
+
+    return run
+
+
+@benchmark
+def validate_object_id_dereferenced(context):
+    schema = context.dereferenced
+    return lambda: validate_object_id("schema/release-schema.json", schema)
+
+
+@benchmark
+def validate_schema_codelists_match_core(context):
+    schema = context.schema
+    return lambda: validate_schema_codelists_match("schema/release-schema.json", schema, "schema")
+
+
+@benchmark
+def validate_codelists_tree(context):  # noqa: ARG001 # consistency
+    return lambda: validate_codelists(cache=CodelistCache())
+
+
+@benchmark
+def get_empty_files_tree(context):  # noqa: ARG001 # consistency
+    return lambda: _consume(get_empty_files())
+
+
+@benchmark
+def get_misindented_files_tree(context):  # noqa: ARG001 # consistency
+    return lambda: _consume(get_misindented_files())
+
+
+@benchmark
+def get_invalid_json_files_tree(context):  # noqa: ARG001 # consistency
+    return lambda: _consume(get_invalid_json_files())
+
+
+@benchmark
+def walk_json_data_tree(context):  # noqa: ARG001 # consistency
+    return lambda: _consume(walk_json_data())
+
+
+@benchmark
+def walk_csv_data_tree(context):  # noqa: ARG001 # consistency
+    return lambda: _consume(walk_csv_data())
+
+
+@benchmark
+def walk_csv_data_columnar(context):  # noqa: ARG001 # consistency
+    return lambda: _consume(walk_csv_data(columnar=True))
+
+
+@benchmark
+def extend_schema_local(context):
+    schema = context.schema
+    metadata = {
+        "dependencies": [
+            f"{context.url}/extensions/extension{i}/extension.json" for i in range(corpus.EXTENSIONS * context.scale)
+        ]
+    }
+
+    def run():
+        # Measure the requests, not the cache.
+        http_get.cache_clear()
+        extend_schema("release-schema.json", schema, metadata, codelists=set())
+
+    return run
+
+
+class _Handler(http.server.SimpleHTTPRequestHandler):
+    # Keep connections alive, like a CDN.
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def _serve(directory):
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_Handler, directory=directory))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def measure(function, repeat):
+    """
+    Return the minimum time of :code:`repeat` runs of a function, and its peak memory during one more run.
+
+    :param function: the function to benchmark
+    :param int repeat: the number of timed runs
+    :returns: the time in seconds and the peak memory in bytes
+    :rtype: tuple
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return min(times), peak
+
+
+def run(names, scales, repeat, stream):
+    """
+    Run the benchmarks at each scale, write a table to the stream, and return the results.
+
+    :param list names: the names of the benchmarks
+    :param list scales: the scales of the corpora
+    :param int repeat: the number of timed runs
+    :param stream: a text stream
+    :returns: a dict in which keys are benchmark names and values are dicts in which keys are scales (as strings) and
+              values are dicts with "time" (seconds) and "peak" (bytes) keys
+    :rtype: dict
+    """
+    results = {name: {} for name in names}
+    cwd = os.getcwd()
+
+    stream.write(f"{'benchmark':40} {'scale':>5} {'time (ms)':>12} {'peak (KiB)':>12}\n")
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as directory, _serve(directory) as url:
+            corpus.write(directory, scale)
+            os.chdir(directory)
+            try:
+                context = Context(directory, scale, url)
+                for name in names:
+                    function = BENCHMARKS[name](context)
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore")
+                        seconds, peak = measure(function, repeat)
+                    results[name][str(scale)] = {"time": seconds, "peak": peak}
+                    stream.write(f"{name:40} {scale:5} {seconds * 1000:12.1f} {peak / 1024:12.0f}\n")
+                    stream.flush()
+            finally:
+                os.chdir(cwd)
+
+    if len(scales) > 1:
+        low, high = str(min(scales)), str(max(scales))
+        stream.write(f"\n{'benchmark':40} {'scaling exponent':>16}\n")
+        for name in names:
+            ratio = results[name][high]["time"] / results[name][low]["time"]
+            stream.write(f"{name:40} {math.log(ratio) / math.log(int(high) / int(low)):16.2f}\n")
+
+    return results
+
+
+def compare(results, baseline, tolerance, memory_tolerance):
+    """
+    Return messages describing the results that exceed the baseline by more than the tolerance.
+
+    :param dict results: the results of :meth:`run`
+    :param dict baseline: the results of a previous :meth:`run`
+    :param float tolerance: the allowed increase in time, as a fraction of the baseline
+    :param float memory_tolerance: the allowed increase in peak memory, as a fraction of the baseline
+    :rtype: list
+    """
+    regressions = []
+    for name, scales in results.items():
+        for scale, result in scales.items():
+            expected = baseline.get(name, {}).get(scale)
+            if expected is None:
+                continue
+            for key, allowed, unit, factor in (
+                ("time", tolerance, "ms", 1000),
+                ("peak", memory_tolerance, "KiB", 1 / 1024),
+            ):
+                if result[key] > expected[key] * (1 + allowed):
+                    regressions.append(
+                        f"{name} at scale {scale}: {key} {result[key] * factor:.1f} {unit} > "
+                        f"{expected[key] * factor:.1f} {unit} + {allowed:.0%}"
+                    )
+    return regressions
+
+
+def main(args=None):
+    """Run the benchmarks, and return the exit status."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark jscc.")
+    parser.add_argument("-k", dest="patterns", action="append", help="run benchmarks matching this glob pattern")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 2, 4], help="the scales of the corpora")
+    parser.add_argument("--repeat", type=int, default=3, help="the number of timed runs of each benchmark")
+    parser.add_argument("--save", metavar="FILE", help="write the results to a JSON file, to use as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare the results to a baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="the allowed increase in time (fraction)")
+    parser.add_argument(
+        "--memory-tolerance", type=float, default=0.1, help="the allowed increase in peak memory (fraction)"
+    )
+    args = parser.parse_args(args)
+
+    names = [
+        name
+        for name in BENCHMARKS
+        if not args.patterns or any(fnmatch.fnmatch(name, pattern) for pattern in args.patterns)
+    ]
+    if not names:
+        parser.error("no benchmarks match")
+
+    results = run(names, sorted(set(args.scale)), args.repeat, sys.stdout)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"python": sys.version, "results": results}, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["results"], args.tolerance, args.memory_tolerance)
+        if regressions:
+            sys.stdout.write("\nREGRESSIONS\n")
+            for message in regressions:
+                sys.stdout.write(f"{message}\n")
+            return 1
+        sys.stdout.write("\nNo regressions.\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
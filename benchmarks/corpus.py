@@ -0,0 +1,187 @@
+"""
+Generate synthetic, deterministic corpora, shaped like the schema, codelists and extensions of a data standard.
+
+At scale 1, the release schema is about the size of OCDS 1.1's release schema: 60 definitions and 1,800 fields. Each
+scale also adds 100 extensions and 800 codelists.
+"""
+
+import csv
+import json
+import os
+import random
+
+DEFINITIONS = 60
+FIELDS = 30
+EXTENSIONS = 100
+EXTENSION_CODELISTS = 5
+CORE_CODELISTS = 300
+CODES = 12
+
+
+def _name(i):
+    return f"Definition{chr(65 + i // 676 % 26)}{chr(65 + i // 26 % 26)}{chr(65 + i % 26)}"
+
+
+def _field(rng, targets, codelists):
+    kind = rng.random()
+    # Only some definitions refer to other definitions, to bound the depth of the dereferenced schema.
+    if kind >= 0.8 and not targets:
+        kind = 0
+    if kind < 0.4:
+        field = {"type": ["string", "null"]}
+    elif kind < 0.55:
+        field = {"type": ["number", "null"], "minimum": 0}
+    elif kind < 0.7:
+        codelist = rng.choice(codelists)
+        field = {
+            "type": ["string", "null"],
+            "codelist": codelist,
+            "openCodelist": False,
+            "enum": [*_codes(codelist), None],
+        }
+    elif kind < 0.8:
+        field = {"type": "array", "items": {"type": "string"}, "codelist": rng.choice(codelists), "openCodelist": True}
+    elif kind < 0.9:
+        field = {"type": "array", "items": {"$ref": f"#/definitions/{rng.choice(targets)}"}}
+    else:
+        field = {"$ref": f"#/definitions/{rng.choice(targets)}"}
+    if "$ref" not in field:
+        field["title"] = "A field"
+        field["description"] = "The description of a field, which is usually a sentence or two. " * 2
+    return field
+
+
+def _codes(codelist):
+    return [f"{codelist[:-4]}Code{i}" for i in range(CODES)]
+
+
+def codelist_names(scale):
+    """Return the names of the core codelists."""
+    return [f"codelist{i}.csv" for i in range(CORE_CODELISTS * scale)]
+
+
+def release_schema(scale, seed=0):
+    """
+    Return a release schema.
+
+    :param int scale: the size of the schema, relative to OCDS 1.1's release schema
+    :param int seed: the seed of the random number generator
+    """
+    rng = random.Random(seed)
+    definitions = [_name(i) for i in range(DEFINITIONS * scale)]
+    # The first two thirds of definitions can refer to the last third, which refer to none.
+    leaves = definitions[len(definitions) * 2 // 3 :]
+    codelists = codelist_names(scale)
+
+    schema = {
+        "id": "https://standard.example.com/schema/release-schema.json",
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "title": "Schema for a release",
+        "description": "Each release provides data about a single contracting process at a particular point in time.",
+        "type": "object",
+        "required": ["ocid", "id"],
+        "properties": {
+            "ocid": {"title": "Identifier", "description": "A globally unique identifier.", "type": "string"},
+            "id": {"title": "Release ID", "description": "An identifier for this release.", "type": "string"},
+        },
+        "definitions": {},
+    }
+    for definition in definitions:
+        targets = [] if definition in leaves else leaves
+        properties = {"id": {"title": "ID", "description": "A local identifier.", "type": ["string", "integer"]}}
+        for i in range(FIELDS - 1):
+            properties[f"field{i}"] = _field(rng, targets, codelists)
+        schema["definitions"][definition] = {
+            "title": definition,
+            "description": f"A {definition} object.",
+            "type": "object",
+            "required": ["id"],
+            "properties": properties,
+        }
+    for definition in definitions[:20]:
+        name = definition[0].lower() + definition[1:]
+        schema["properties"][name] = {
+            "title": definition,
+            "description": f"The {definition}.",
+            "type": "array",
+            "items": {"$ref": f"#/definitions/{definition}"},
+        }
+    return schema
+
+
+def _write_json(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def _write_csv(path, codes):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["Code", "Title", "Description"])
+        for code in codes:
+            writer.writerow([code, f"Title of {code}", f"The description of {code}."])
+
+
+def write(directory, scale, seed=0):
+    """
+    Write a corpus to a directory, and return the release schema.
+
+    The directory contains ``schema/release-schema.json``, ``schema/codelists/*.csv``, and
+    ``extensions/extension{n}/``, each of which contains an ``extension.json`` file, a ``release-schema.json`` patch,
+    and codelists.
+
+    :param str directory: the directory to write to
+    :param int scale: the size of the corpus
+    :param int seed: the seed of the random number generator
+    """
+    rng = random.Random(seed)
+    schema = release_schema(scale, seed)
+
+    os.makedirs(os.path.join(directory, "schema", "codelists"))
+    _write_json(os.path.join(directory, "schema", "release-schema.json"), schema)
+    for name in codelist_names(scale):
+        _write_csv(os.path.join(directory, "schema", "codelists", name), _codes(name))
+
+    definitions = list(schema["definitions"])
+    for i in range(EXTENSIONS * scale):
+        extension = os.path.join(directory, "extensions", f"extension{i}")
+        os.makedirs(os.path.join(extension, "codelists"))
+
+        codelists = [f"extension{i}Codelist{j}.csv" for j in range(EXTENSION_CODELISTS)]
+        _write_json(
+            os.path.join(extension, "extension.json"),
+            {
+                "name": {"en": f"Extension {i}"},
+                "description": {"en": "An extension."},
+                "documentationUrl": {"en": "https://standard.example.com/"},
+                "compatibility": ["1.1"],
+                "codelists": codelists,
+                "schemas": ["release-schema.json"],
+            },
+        )
+        definition = rng.choice(definitions)
+        _write_json(
+            os.path.join(extension, "release-schema.json"),
+            {
+                "definitions": {
+                    definition: {
+                        "properties": {
+                            f"extension{i}Field{j}": {
+                                "title": "An extension field",
+                                "description": "A field added by an extension.",
+                                "type": ["string", "null"],
+                                "codelist": codelist,
+                                "openCodelist": False,
+                                "enum": [*_codes(codelist), None],
+                            }
+                            for j, codelist in enumerate(codelists)
+                        }
+                    }
+                }
+            },
+        )
+        for codelist in codelists:
+            _write_csv(os.path.join(extension, "codelists", codelist), _codes(codelist))
+
+    return schema
@@ -0,0 +1,763 @@
+"""
+Command-line interface, to run checks over a directory tree without pytest.
+
+.. code-block:: bash
+
+   jscc --jobs 4 --skip deep-properties --metaschema meta-schema.json schema
+
+Codelists are read from the directory tree, like when using the ``validate_*`` methods from its root.
+
+With ``--watch``, the checks are re-run whenever a file changes, re-parsing only the changed files and re-running only
+the checks that depend on them (see :class:`~jscc.cli.Session`).
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import warnings
+
+from jscc import instrument, jsonlib
+from jscc.exceptions import DeepPropertiesWarning, DuplicateKeyError, InvalidJSONError
+from jscc.schema import is_json_schema
+from jscc.testing.checks import (
+    CodelistRegistry,
+    ErrorBudget,
+    SubtreeMemo,
+    check_json_file,
+    get_empty_files,
+    get_invalid_json_files,
+    get_misindented_files,
+    is_empty_file,
+    is_misindented_file,
+    validate_array_items,
+    validate_codelist_enum,
+    validate_deep_properties,
+    validate_items_type,
+    validate_letter_case,
+    validate_merge_properties,
+    validate_metadata_presence,
+    validate_null_type,
+    validate_object_id,
+    validate_ref,
+    validate_schema,
+    validate_schema_codelists_match,
+)
+from jscc.testing.filesystem import CodelistCache, tracked, walk
+from jscc.testing.util import get_validator, http_get
+from jscc.watch import watch
+
+
+def _empty(path):
+    if tracked(path) and os.path.basename(path) != "__init__.py" and is_empty_file(path):
+        return ()
+    return None
+
+
+def _misindented(path):
+    if path.endswith(".json") and tracked(path) and is_misindented_file(path):
+        return ()
+    return None
+
+
+def _invalid_json(path):
+    if path.endswith(".json"):
+        try:
+            check_json_file(path)
+        except (jsonlib.JSONDecodeError, InvalidJSONError, DuplicateKeyError) as e:
+            return (e,)
+    return None
+
+
+# The method that checks a directory tree, the method that checks a file, and the message format of each file check.
+FILE_CHECKS = {
+    "empty": (get_empty_files, _empty, "{0} is empty"),
+    "indent": (get_misindented_files, _misindented, "{0} is not indented as expected"),
+    "invalid-json": (get_invalid_json_files, _invalid_json, "{0} is not valid JSON: {1}"),
+}
+
+# The "budget" option isn't passed to checks whose warnings don't count as errors.
+SCHEMA_CHECKS = {
+    "schema": lambda path, data, **options: validate_schema(
+        path, data, options["validator"], budget=options.get("budget")
+    ),
+    "array-items": lambda path, data, **options: validate_array_items(
+        path, data, memo=options["memo"], budget=options.get("budget")
+    ),
+    "items-type": lambda path, data, **options: validate_items_type(
+        path, data, memo=options["memo"], budget=options.get("budget")
+    ),
+    "codelist-enum": lambda path, data, **options: validate_codelist_enum(
+        path, data, cache=options["cache"], memo=options["memo"], budget=options.get("budget")
+    ),
+    "letter-case": lambda path, data, **options: validate_letter_case(
+        path, data, memo=options["memo"], budget=options.get("budget")
+    ),
+    "merge-properties": lambda path, data, **options: validate_merge_properties(
+        path, data, memo=options["memo"], budget=options.get("budget")
+    ),
+    "ref": lambda path, data, **options: validate_ref(path, data, budget=options.get("budget")),
+    "metadata-presence": lambda path, data, **options: validate_metadata_presence(
+        path, data, memo=options["memo"], budget=options.get("budget")
+    ),
+    "object-id": lambda path, data, **options: _validate_object_id(
+        path, options["dereference"](path, data), options.get("budget")
+    ),
+    "null-type": lambda path, data, **options: validate_null_type(path, data, budget=options.get("budget")),
+    "deep-properties": lambda path, data, **options: validate_deep_properties(path, data, memo=options["memo"]),
+    "schema-codelists-match": lambda path, data, **options: validate_schema_codelists_match(
+        path, data, os.curdir, cache=options["cache"], registry=options.get("registry"), budget=options.get("budget")
+    ),
+}
+
+
+def _validate_object_id(path, data, budget):
+    import jsonref  # noqa: PLC0415 # import on first use
+
+    try:
+        return validate_object_id(path, data, budget=budget)
+    except jsonref.JsonRefError:
+        return 0  # reported by the "ref" check
+
+
+def _dereference(path, data):
+    import jsonref  # noqa: PLC0415 # import on first use
+
+    with instrument.timed("dereference", None, path):
+        return jsonref.replace_refs(data)
+
+
+# Warnings that don't count as errors.
+NON_ERRORS = {DeepPropertiesWarning}
+
+# Checks that are run only if requested.
+OPT_IN = {"schema-codelists-match"}
+
+# Checks that read codelist files.
+CODELIST_CHECKS = {"codelist-enum", "schema-codelists-match"}
+
+# The state of each worker process.
+_options = {}
+
+
+def _initialize(metaschema, cache_dir):
+    _options.update(_make_options(metaschema, cache_dir))
+
+
+def _make_options(metaschema, cache_dir):
+    options = {"cache": CodelistCache(cache_dir), "dereference": _dereference, "memo": SubtreeMemo()}
+    if metaschema is not None:
+        options["validator"] = get_validator(metaschema)
+    return options
+
+
+def _run_file_check(name, excluded, git, budget=None):
+    method, _, message = FILE_CHECKS[name]
+    kwargs = {"git": git, "budget": budget}
+    if excluded is not None:
+        kwargs["excluded"] = excluded
+
+    diagnostics = []
+    with instrument.timed("check", name) as metrics:
+        for path, *rest in method(**kwargs):
+            path = os.path.relpath(path)  # noqa: PLW2901
+            diagnostics.append({"check": name, "path": path, "message": message.format(path, *rest), "error": True})
+        if metrics is not None:
+            metrics.update(calls=1, warnings=len(diagnostics))
+
+    return diagnostics
+
+
+def _check_file(path, names):
+    diagnostics = []
+    for name in names:
+        _, method, message = FILE_CHECKS[name]
+        with instrument.timed("check", name, path) as metrics:
+            rest = method(path)
+            if metrics is not None:
+                metrics.update(calls=1, warnings=int(rest is not None))
+        if rest is not None:
+            diagnostics.append({"check": name, "path": path, "message": message.format(path, *rest), "error": True})
+    return diagnostics
+
+
+def _read_schema(path):
+    try:
+        with instrument.timed("parse", "json", path) as metrics:
+            with open(path) as f:
+                text = f.read()
+            if metrics is not None:
+                metrics.update(files=1, bytes=len(text))
+            data = jsonlib.loads(text)
+    except (OSError, UnicodeDecodeError, jsonlib.JSONDecodeError):
+        return None  # reported by file checks
+
+    if not isinstance(data, dict) or not is_json_schema(data):
+        return None
+    return data
+
+
+def _run_schema_checks(path, names, budget=None):
+    data = _read_schema(path)
+    if data is None:
+        return []
+    return _check_schema(path, data, names, {**_options, "budget": budget})
+
+
+def _check_schema(path, data, names, options):
+    budget = options.get("budget")
+    diagnostics = []
+    with warnings.catch_warnings(record=True) as records:
+        warnings.simplefilter("always")
+        for name in names:
+            if budget is not None and budget.exhausted:
+                budget.truncated = True
+                break
+            start = len(records)
+            with instrument.timed("check", name, path) as metrics:
+                try:
+                    SCHEMA_CHECKS[name](path, data, **options)
+                except Exception as e:  # noqa: BLE001 # the schema can be invalid in unexpected ways
+                    diagnostics.append({"check": name, "path": path, "message": f"{path} raised {e!r}", "error": True})
+                    if budget is not None:
+                        budget.spend()
+                if metrics is not None:
+                    metrics.update(calls=1, warnings=len(records) - start)
+            for record in records[start:]:
+                message = str(record.message).rstrip()
+                if not message.startswith(path):
+                    message = f"{path}: {message}"
+                diagnostics.append(
+                    {"check": name, "path": path, "message": message, "error": record.category not in NON_ERRORS}
+                )
+
+    return diagnostics
+
+
+def run(checks, *, metaschema=None, excluded=None, git=False, jobs=1, cache_dir=None, collector=None, budget=None):
+    """
+    Run checks over the current working directory, and return diagnostics.
+
+    Each diagnostic is a dict with "check", "path", "message" and "error" keys. The "error" key is ``False`` for
+    diagnostics that don't count as errors, like those of ``validate_deep_properties``.
+
+    :param list checks: the names of the checks to run, from ``FILE_CHECKS`` and ``SCHEMA_CHECKS``
+    :param dict metaschema: the metaschema for the "schema" check
+    :param tuple excluded: override the directories to exclude
+    :param bool git: whether to list the files in Git's index
+    :param int jobs: the number of processes to use
+    :param str cache_dir: the directory in which to cache parsed codelists
+    :param collector: a collector of instrumentation events, including those of worker processes
+    :type collector: jscc.instrument.Collector
+    :param budget: the maximum number of errors, after which to stop running checks. With multiple processes, each
+                   process stops at the maximum, and the remaining files aren't checked.
+    :type budget: jscc.testing.checks.ErrorBudget
+    :returns: the diagnostics
+    :rtype: list
+    """
+    file_checks = [name for name in checks if name in FILE_CHECKS]
+    schema_checks = [name for name in checks if name in SCHEMA_CHECKS]
+    paths = _schema_paths(excluded, git) if schema_checks else []
+
+    diagnostics = []
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415 # import on first use
+
+        profile = collector is not None
+        with ProcessPoolExecutor(jobs, initializer=_initialize, initargs=(metaschema, cache_dir)) as executor:
+            # Each process gets a copy of the budget.
+            futures = [
+                executor.submit(_profile, profile, _run_file_check, name, excluded, git, budget)
+                for name in file_checks
+            ]
+            futures.extend(
+                executor.submit(_profile, profile, _run_schema_checks, path, schema_checks, budget) for path in paths
+            )
+            for future in futures:
+                if budget is not None and budget.exhausted:
+                    executor.shutdown(cancel_futures=True)
+                    break
+                result, report = future.result()
+                diagnostics.extend(result)
+                if report is not None:
+                    collector.merge(report)
+                if budget is not None:
+                    budget.spend(sum(diagnostic["error"] for diagnostic in result))
+        # A process's copy of the budget might have been truncated.
+        if budget is not None and budget.exhausted:
+            budget.truncated = True
+    else:
+        with collector if collector is not None else contextlib.nullcontext():
+            _initialize(metaschema, cache_dir)
+            diagnostics = _run_checks(file_checks, schema_checks, paths, excluded, git, budget)
+
+    return diagnostics
+
+
+def _schema_paths(excluded, git):
+    kwargs = {"git": git}
+    if excluded is not None:
+        kwargs["excluded"] = excluded
+    return sorted(os.path.relpath(path) for path, _ in walk(**kwargs) if path.endswith(".json"))
+
+
+def _run_checks(file_checks, schema_checks, paths, excluded, git, budget=None):
+    diagnostics = []
+    for name in file_checks:
+        diagnostics.extend(_run_file_check(name, excluded, git, budget))
+    for path in paths:
+        if budget is not None and budget.exhausted:
+            budget.truncated = True
+            break
+        diagnostics.extend(_run_schema_checks(path, schema_checks, budget))
+    return diagnostics
+
+
+def run_batch(roots, checks, *, metaschema=None, excluded=None, git=False, jobs=1, cache_dir=None, collector=None):
+    """
+    Run checks over many directory trees, like the repositories of an extension registry, and return diagnostics for
+    each.
+
+    Each directory tree is checked by one process of a pool. A process keeps its HTTP responses, parsed codelists and
+    :class:`~jscc.testing.checks.SubtreeMemo` across the directory trees that it checks, such that the work that is
+    common to the directory trees, like checking the definitions that extensions copy from a standard's schema, is
+    mostly done once per process.
+
+    Archives (like ``.zip`` and ``.tar.gz`` files) are extracted to temporary directories. If an archive contains a
+    single directory, like GitHub's archives of repositories, that directory is checked.
+
+    :param list roots: the file paths of directory trees or archives
+    :param list checks: the names of the checks to run, from ``FILE_CHECKS`` and ``SCHEMA_CHECKS``
+    :param dict metaschema: the metaschema for the "schema" check
+    :param tuple excluded: override the directories to exclude
+    :param bool git: whether to list the files in Git's index
+    :param int jobs: the number of processes to use
+    :param str cache_dir: the directory in which to cache parsed codelists, across processes
+    :param collector: a collector of instrumentation events, including those of worker processes
+    :type collector: jscc.instrument.Collector
+    :returns: a dict in which keys are the given roots and values are diagnostics, like :meth:`~jscc.cli.run`, with
+              file paths relative to the root
+    :rtype: dict
+    """
+    file_checks = [name for name in checks if name in FILE_CHECKS]
+    schema_checks = [name for name in checks if name in SCHEMA_CHECKS]
+    arguments = (file_checks, schema_checks, excluded, git)
+
+    results = {}
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415 # import on first use
+
+        profile = collector is not None
+        with ProcessPoolExecutor(jobs, initializer=_initialize, initargs=(metaschema, cache_dir)) as executor:
+            futures = {
+                root: executor.submit(_profile, profile, _run_root, os.path.abspath(root), *arguments)
+                for root in roots
+            }
+            for root, future in futures.items():
+                results[root], report = future.result()
+                if report is not None:
+                    collector.merge(report)
+    else:
+        with collector if collector is not None else contextlib.nullcontext():
+            _initialize(metaschema, cache_dir)
+            for root in roots:
+                results[root] = _run_root(os.path.abspath(root), *arguments)
+
+    return results
+
+
+def _run_root(root, file_checks, schema_checks, excluded, git):
+    cwd = os.getcwd()
+    try:
+        with _extract(root) as directory:
+            os.chdir(directory)
+            try:
+                paths = _schema_paths(excluded, git) if schema_checks else []
+                return _run_checks(file_checks, schema_checks, paths, excluded, git)
+            finally:
+                # Leave the directory, before it is removed if temporary.
+                os.chdir(cwd)
+    except Exception as e:  # noqa: BLE001 # report the error for this root only
+        return [{"check": "batch", "path": root, "message": f"{root} raised {e!r}", "error": True}]
+
+
+@contextlib.contextmanager
+def _extract(root):
+    if os.path.isdir(root):
+        yield root
+        return
+
+    import shutil  # noqa: PLC0415 # import on first use
+    import tempfile  # noqa: PLC0415 # import on first use
+    import zipfile  # noqa: PLC0415 # import on first use
+
+    with tempfile.TemporaryDirectory() as directory:
+        if zipfile.is_zipfile(root):
+            # zipfile already removes absolute paths and ".." components.
+            shutil.unpack_archive(root, directory, "zip")
+        else:
+            # Reject links and paths outside the directory, in tar archives.
+            shutil.unpack_archive(root, directory, filter="data")
+        entries = os.listdir(directory)
+        if len(entries) == 1 and os.path.isdir(os.path.join(directory, entries[0])):
+            yield os.path.join(directory, entries[0])
+        else:
+            yield directory
+
+
+def _profile(profile, function, *args):
+    if not profile:
+        return function(*args), None
+    with instrument.Collector() as collector:
+        result = function(*args)
+    return result, collector.report()
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Session:
+    """
+    Run checks over the current working directory, keeping parsed files and diagnostics in memory between runs.
+
+    The first run checks all files. Later runs accept the paths of changed files, re-parse only those files, and re-run
+    only the checks that depend on them:
+
+    -  If a file changed, its file checks.
+    -  If a JSON Schema file changed, its schema checks.
+    -  If a CSV file changed, the checks in ``CODELIST_CHECKS`` for all JSON Schema files.
+
+    .. code-block:: python
+
+       session = Session(["empty", "codelist-enum"])
+       diagnostics = session.run()
+       # ... codelists/a.csv changes ...
+       diagnostics = session.run({"codelists/a.csv"})
+    """
+
+    def __init__(self, checks, *, metaschema=None, excluded=None, git=False, cache_dir=None):
+        """
+        Initialize the session.
+
+        :param list checks: the names of the checks to run, from ``FILE_CHECKS`` and ``SCHEMA_CHECKS``
+        :param dict metaschema: the metaschema for the "schema" check
+        :param tuple excluded: override the directories to exclude
+        :param bool git: whether to list the files in Git's index
+        :param str cache_dir: the directory in which to cache parsed codelists
+        """
+        self.file_checks = [name for name in checks if name in FILE_CHECKS]
+        self.schema_checks = [name for name in checks if name in SCHEMA_CHECKS]
+        self.codelist_checks = [name for name in self.schema_checks if name in CODELIST_CHECKS]
+
+        self.walk_kwargs = {"git": git}
+        if excluded is not None:
+            self.walk_kwargs["excluded"] = excluded
+
+        self.options = _make_options(metaschema, cache_dir)
+        self.options["dereference"] = self._dereference
+
+        #: The paths of the files in the directory tree.
+        self.paths = set()
+        #: The JSON data of each JSON Schema file.
+        self.schemas = {}
+        self._dereferenced = {}
+        self._stats = {}
+        self._file_diagnostics = {}
+        self._schema_diagnostics = {}
+
+    def _dereference(self, path, data):
+        if path not in self._dereferenced:
+            self._dereferenced[path] = _dereference(path, data)
+        return self._dereferenced[path]
+
+    def _list(self):
+        return {os.path.relpath(path) for path, _ in walk(**self.walk_kwargs)}
+
+    def run(self, changed=None):
+        """
+        Run the checks that depend on the changed files, and return the diagnostics for all files.
+
+        :param set changed: the paths of changed files, or ``None`` to check all files
+        :returns: the diagnostics, like :meth:`~jscc.cli.run`
+        :rtype: list
+        """
+        if changed is None:
+            self.paths = self._list()
+            self.schemas.clear()
+            self._dereferenced.clear()
+            self._stats.clear()
+            self._file_diagnostics.clear()
+            self._schema_diagnostics.clear()
+            changed = self.paths
+            codelists_changed = True
+        else:
+            changed = {os.path.relpath(path) for path in changed}
+            # List the files again only if a file might have been created or deleted.
+            if any(path not in self.paths or not os.path.isfile(path) for path in changed):
+                self.paths = self._list()
+            codelists_changed = any(path.endswith(".csv") for path in changed)
+
+        for path in changed:
+            self.schemas.pop(path, None)
+            self._dereferenced.pop(path, None)
+            self._stats.pop(path, None)
+            self._file_diagnostics.pop(path, None)
+            self._schema_diagnostics.pop(path, None)
+            if path in self.paths:
+                self._stats[path] = _stat(path)
+                self._file_diagnostics[path] = _check_file(path, self.file_checks)
+                if self.schema_checks and path.endswith(".json"):
+                    data = _read_schema(path)
+                    if data is not None:
+                        self.schemas[path] = data
+
+        # Results are reused across files in a run, but not across runs, in case codelist files changed.
+        self.options["memo"] = SubtreeMemo()
+
+        if codelists_changed and "schema-codelists-match" in self.codelist_checks:
+            self.options["registry"] = CodelistRegistry.from_directory(os.curdir, cache=self.options["cache"])
+
+        for path, data in self.schemas.items():
+            if path in changed:
+                names = self.schema_checks
+            elif codelists_changed and self.codelist_checks:
+                names = self.codelist_checks
+            else:
+                continue
+            diagnostics = self._schema_diagnostics.setdefault(path, {})
+            for name in names:
+                diagnostics[name] = []
+            for diagnostic in _check_schema(path, data, names, self.options):
+                diagnostics[diagnostic["check"]].append(diagnostic)
+
+        return self.diagnostics()
+
+    def refresh(self):
+        """
+        Run the checks that depend on the files that changed since the last run, and return the diagnostics for all
+        files.
+
+        Changed files are found by comparing modification times and sizes. Use this method if the paths of changed
+        files aren't known.
+
+        :returns: the diagnostics, like :meth:`~jscc.cli.run`
+        :rtype: list
+        """
+        paths = self._list()
+        changed = {path for path in paths | self._stats.keys() if self._stats.get(path) != _stat(path)}
+        if changed:
+            return self.run(changed)
+        return self.diagnostics()
+
+    def diagnostics(self):
+        """
+        Return the diagnostics for all files, from the last run.
+
+        :returns: the diagnostics, like :meth:`~jscc.cli.run`
+        :rtype: list
+        """
+        paths = sorted(self.paths)
+        diagnostics = [
+            diagnostic
+            for name in self.file_checks
+            for path in paths
+            for diagnostic in self._file_diagnostics.get(path, ())
+            if diagnostic["check"] == name
+        ]
+        for path in paths:
+            if path in self._schema_diagnostics:
+                for name in self.schema_checks:
+                    diagnostics.extend(self._schema_diagnostics[path].get(name, ()))
+        return diagnostics
+
+
+def write(diagnostics, output_format="lines", stream=None, *, truncated=False):
+    """
+    Write diagnostics, and return the number of errors.
+
+    :param list diagnostics: the diagnostics
+    :param str output_format: "lines" or "json"
+    :param stream: the stream to which to write (default standard output)
+    :param bool truncated: whether the checks stopped at the maximum number of errors
+    :returns: the number of errors
+    :rtype: int
+    """
+    if stream is None:
+        stream = sys.stdout
+
+    errors = sum(diagnostic["error"] for diagnostic in diagnostics)
+
+    if output_format == "json":
+        output = {"errors": errors, "diagnostics": diagnostics}
+        if truncated:
+            output["truncated"] = True
+        json.dump(output, stream, indent=2)
+        stream.write("\n")
+    else:
+        for diagnostic in diagnostics:
+            prefix = "ERROR: " if diagnostic["error"] else ""
+            stream.write(f"{prefix}{diagnostic['message']} [{diagnostic['check']}]\n")
+        if truncated:
+            stream.write("Stopped at the maximum number of errors. Other files and checks might have errors.\n")
+    stream.flush()
+
+    return errors
+
+
+def select(diagnostics, paths):
+    """
+    Return the diagnostics for the given files.
+
+    If a CSV file is given, the diagnostics of the checks in ``CODELIST_CHECKS`` are returned for all files.
+
+    :param list diagnostics: the diagnostics
+    :param list paths: absolute file paths, or ``None`` to return all diagnostics
+    :rtype: list
+    """
+    if paths is None:
+        return diagnostics
+
+    paths = set(paths)
+    codelists = any(path.endswith(".csv") for path in paths)
+    return [
+        diagnostic
+        for diagnostic in diagnostics
+        if os.path.abspath(diagnostic["path"]) in paths or (codelists and diagnostic["check"] in CODELIST_CHECKS)
+    ]
+
+
+def parse_args(args=None):
+    """
+    Parse the command-line arguments, load the metaschema, and select the checks.
+
+    The ``checks`` attribute of the returned namespace is the names of the checks to run, and the ``metaschema``
+    attribute is the loaded metaschema, if any. File paths are made absolute.
+
+    :param list args: the command-line arguments (default ``sys.argv[1:]``)
+    :rtype: argparse.Namespace
+    """
+    choices = [*FILE_CHECKS, *SCHEMA_CHECKS]
+
+    parser = argparse.ArgumentParser(prog="jscc", description="Check a directory tree's JSON Schema and codelists.")
+    parser.add_argument("directory", nargs="?", default=os.curdir, help="the directory tree to check")
+    parser.add_argument(
+        "--check",
+        action="append",
+        choices=choices,
+        metavar="CHECK",
+        help=f"a check to run, one of: {', '.join(choices)} (default all, except {', '.join(OPT_IN)})",
+    )
+    parser.add_argument(
+        "--skip", action="append", choices=choices, default=[], metavar="CHECK", help="a check to skip"
+    )
+    parser.add_argument("--metaschema", help="the file path or URL of the metaschema for the schema check")
+    parser.add_argument("--exclude", action="append", metavar="DIRECTORY", help="a directory name to exclude")
+    parser.add_argument("--git", action="store_true", help="list the files in Git's index")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="the number of processes to use")
+    parser.add_argument("--cache-dir", help="the directory in which to cache parsed codelists")
+    parser.add_argument("--format", choices=["lines", "json"], default="lines", help="the output format")
+    parser.add_argument("--path", action="append", metavar="PATH", help="a file whose diagnostics to report")
+    parser.add_argument("--watch", action="store_true", help="re-run the checks whenever a file changes")
+    parser.add_argument("--poll", action="store_true", help="with --watch, poll for changes instead of using inotify")
+    parser.add_argument("--profile", metavar="FILE", help="write a JSON report of time spent and work done per check")
+    parser.add_argument("--max-errors", type=int, metavar="N", help="stop after N errors")
+    args = parser.parse_args(args)
+
+    if args.max_errors is not None and args.max_errors < 1:
+        parser.error("--max-errors must be at least 1")
+    if args.max_errors and args.watch:
+        parser.error("--max-errors can't be used with --watch")
+
+    metaschema = None
+    if args.metaschema:
+        if args.metaschema.startswith(("http://", "https://")):
+            metaschema = http_get(args.metaschema).json()
+        else:
+            with open(args.metaschema) as f:
+                metaschema = json.load(f)
+
+    checks = args.check or [name for name in choices if name not in OPT_IN and (name != "schema" or metaschema)]
+    checks = [name for name in checks if name not in args.skip]
+    if "schema" in checks and metaschema is None:
+        parser.error("the schema check requires --metaschema")
+
+    args.checks = checks
+    args.metaschema = metaschema
+    args.directory = os.path.abspath(args.directory)
+    args.exclude = tuple(args.exclude) if args.exclude else None
+    if args.cache_dir:
+        args.cache_dir = os.path.abspath(args.cache_dir)
+    if args.path:
+        args.path = [os.path.abspath(path) for path in args.path]
+    if args.profile:
+        args.profile = os.path.abspath(args.profile)
+
+    return args
+
+
+def main(args=None):
+    """Run the command-line interface, and return the exit status."""
+    args = parse_args(args)
+    os.chdir(args.directory)
+
+    if args.watch:
+        return _watch(args)
+
+    collector = instrument.Collector() if args.profile else None
+    budget = ErrorBudget(args.max_errors) if args.max_errors else None
+    diagnostics = run(
+        args.checks,
+        metaschema=args.metaschema,
+        excluded=args.exclude,
+        git=args.git,
+        jobs=args.jobs,
+        cache_dir=args.cache_dir,
+        collector=collector,
+        budget=budget,
+    )
+    if collector is not None:
+        collector.write(args.profile)
+
+    truncated = budget is not None and budget.truncated
+    return 1 if write(select(diagnostics, args.path), args.format, truncated=truncated) else 0
+
+
+def _watch(args):
+    session = Session(
+        args.checks, metaschema=args.metaschema, excluded=args.exclude, git=args.git, cache_dir=args.cache_dir
+    )
+    kwargs = {"polling": args.poll}
+    if args.exclude is not None:
+        kwargs["excluded"] = args.exclude
+
+    # Start watching before the first run, so that no change is missed.
+    changes = watch(os.curdir, **kwargs)
+    try:
+        write(select(_run_session(session, args), args.path), args.format)
+        for changed in changes:
+            sys.stdout.write("\n")
+            write(select(_run_session(session, args, changed), args.path), args.format)
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+def _run_session(session, args, changed=None):
+    # Write a report for each run, in which only the changed files are checked.
+    if not args.profile:
+        return session.run(changed)
+    with instrument.Collector() as collector:
+        diagnostics = session.run(changed)
+    collector.write(args.profile)
+    return diagnostics
+
+
+if __name__ == "__main__":
+    sys.exit(main())
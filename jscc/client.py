@@ -0,0 +1,104 @@
+"""
+A thin client for :mod:`jscc.server`, which accepts the same arguments as the ``jscc`` command.
+
+.. code-block:: bash
+
+   jscc-client --check codelist-enum --path schema/release-schema.json schema
+
+If no server is running, the checks are run in-process, like the ``jscc`` command. Otherwise, only the standard
+library is imported.
+"""
+
+import getpass
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+
+
+def socket_path():
+    """
+    Return the file path of the server's socket: the ``JSCC_SOCKET`` environment variable, or ``jscc.sock`` in the
+    ``XDG_RUNTIME_DIR`` directory, or else in a per-user directory in the temporary directory, which the server creates
+    with access by the current user only.
+    """
+    if path := os.getenv("JSCC_SOCKET"):
+        return path
+    directory = os.getenv("XDG_RUNTIME_DIR") or os.path.join(tempfile.gettempdir(), f"jscc-{getpass.getuser()}")
+    return os.path.join(directory, "jscc.sock")
+
+
+def check_socket(path):
+    """
+    Check that a file is a socket that is owned by the current user, and not by another user who might impersonate
+    the server.
+
+    :param str path: the file path of the socket
+    :raises FileNotFoundError: if the file doesn't exist
+    :raises PermissionError: if the file isn't a socket, or is owned by another user
+    """
+    info = os.stat(path)
+    if not stat.S_ISSOCK(info.st_mode):
+        raise PermissionError(f"{path} is not a socket")  # noqa: TRY003
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by another user")  # noqa: TRY003
+
+
+def request(args, path=None):
+    """
+    Send command-line arguments to the server, and return its response, or ``None`` if no server is running.
+
+    The response is a dict with "status" (the exit status), "output" (the standard output), "error" (the standard
+    error) and "diagnostics" keys.
+
+    :param list args: the command-line arguments of the ``jscc`` command
+    :param str path: the file path of the server's socket (default :meth:`~jscc.client.socket_path`)
+    :rtype: dict
+    :raises PermissionError: if the file isn't a socket, or is owned by another user
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+
+    path = path or socket_path()
+    try:
+        check_socket(path)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+            client.sendall(json.dumps({"cwd": os.getcwd(), "args": args}).encode() + b"\n")
+            with client.makefile("rb") as f:
+                line = f.readline()
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+
+    # The server stopped before responding.
+    if not line:
+        return None
+
+    return json.loads(line)
+
+
+def main(args=None):
+    """Run the command-line interface, and return the exit status."""
+    if args is None:
+        args = sys.argv[1:]
+
+    try:
+        response = request(args)
+    except PermissionError as e:
+        sys.stderr.write(f"jscc-client: {e}, running the checks in-process\n")
+        response = None
+
+    if response is None:
+        from jscc.cli import main  # noqa: PLC0415 # import only if no server is running
+
+        return main(args)
+
+    sys.stdout.write(response["output"])
+    sys.stderr.write(response["error"])
+    return response["status"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
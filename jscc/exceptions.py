@@ -6,6 +6,26 @@ class DuplicateKeyError(JSCCError):
     """Raised if a JSON message has members with duplicate names."""
 
 
+class InvalidJSONError(JSCCError):
+    """Raised if a JSON text is invalid, when checked incrementally."""
+
+    def __init__(self, msg, pos, pointer):
+        """
+        Initialize the exception.
+
+        :param str msg: the error message
+        :param int pos: the byte offset of the error
+        :param str pointer: the JSON Pointer of the value containing the error
+        """
+        super().__init__(f"{msg}: byte {pos}, pointer {pointer!r}")
+        #: The error message.
+        self.msg = msg
+        #: The byte offset of the error.
+        self.pos = pos
+        #: The JSON Pointer of the value containing the error.
+        self.pointer = pointer
+
+
 class JSCCWarning(UserWarning):
     """Base class for warnings from within this package."""
 
@@ -18,6 +38,10 @@ class CodelistEnumWarning(JSCCWarning):
     pass
 
 
+class CodelistsWarning(JSCCWarning):
+    pass
+
+
 class DeepPropertiesWarning(JSCCWarning):
     pass
 
@@ -0,0 +1,197 @@
+"""
+Instrument the checks, to find where the time goes: in walking directory trees, parsing files, dereferencing, HTTP
+requests or a specific check.
+
+.. code-block:: python
+
+   from jscc.instrument import Collector
+
+   with Collector() as collector:
+       for path, name, text, data in walk_json_data():
+           validate_letter_case(path, data)
+
+   collector.write("profile.json")
+
+Or, run ``jscc --profile profile.json``.
+
+Instrumented code calls each function in :data:`hooks` with an event's kind, name, file path (or ``None``) and
+metrics (a dict). If no hook is registered, events aren't created, so that instrumentation costs close to nothing.
+
+=============== ============================= ===============================================
+Kind            Name                          Metrics
+=============== ============================= ===============================================
+``walk``        ``None``                      ``seconds``, ``files``
+``parse``       ``json`` or ``csv``           ``seconds``, ``files``, ``bytes`` (or characters)
+``dereference`` ``None``                      ``seconds``
+``http_get``    the URL                       ``seconds``, ``bytes``
+``traverse``    the ``validate_*`` method     ``seconds``, ``calls``, ``nodes``, ``errors``
+``check``       the ``jscc`` command's check  ``seconds``, ``calls``, ``warnings``
+``cache``       ``codelists``, ``memo``, or   ``hits``, ``misses``
+                ``blobs``
+=============== ============================= ===============================================
+"""
+
+import contextlib
+import json
+import time
+from collections import Counter, defaultdict
+
+#: The functions to call with each event. Use :meth:`register` and :meth:`unregister` to change.
+hooks = []
+
+_disabled = contextlib.nullcontext()
+
+
+def register(hook):
+    """
+    Call a function with each event.
+
+    :param hook: a function that accepts an event's kind, name, file path and metrics
+    """
+    hooks.append(hook)
+
+
+def unregister(hook):
+    """
+    Stop calling a function with each event.
+
+    :param hook: a registered function
+    """
+    hooks.remove(hook)
+
+
+def emit(kind, name, path=None, **metrics):
+    """
+    Call each hook with an event.
+
+    :param str kind: the kind of event
+    :param str name: the name of the instrumented code, like a check
+    :param str path: the file path, if any
+    """
+    for hook in hooks:
+        hook(kind, name, path, metrics)
+
+
+class _Timer:
+    def __init__(self, kind, name, path):
+        self.kind = kind
+        self.name = name
+        self.path = path
+        self.metrics = {}
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self.metrics
+
+    def __exit__(self, *args):
+        self.metrics["seconds"] = time.perf_counter() - self.start
+        emit(self.kind, self.name, self.path, **self.metrics)
+
+
+def timed(kind, name, path=None):
+    """
+    Return a context manager that emits an event with the number of seconds spent in its block.
+
+    The context manager's target is a dict of metrics to add to the event, or ``None`` if no hook is registered.
+
+    :param str kind: the kind of event
+    :param str name: the name of the instrumented code
+    :param str path: the file path, if any
+    """
+    if not hooks:
+        return _disabled
+    return _Timer(kind, name, path)
+
+
+def iterate(kind, name, iterator, metric):
+    """
+    Yield the items of an iterator, and emit an event with the number of items and the number of seconds spent in the
+    iterator (not in the caller).
+
+    :param str kind: the kind of event
+    :param str name: the name of the instrumented code
+    :param iterator: the iterator
+    :param str metric: the name of the metric for the number of items
+    """
+    seconds = 0
+    count = 0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                seconds += time.perf_counter() - start
+            count += 1
+            yield item
+    finally:
+        emit(kind, name, None, seconds=seconds, **{metric: count})
+
+
+class Collector:
+    """
+    A hook that sums the metrics of events, by kind and name, and by file path.
+
+    Use as a context manager, to register and unregister the collector.
+    """
+
+    def __init__(self):
+        """Initialize the collector."""
+        self._names = defaultdict(Counter)
+        self._paths = defaultdict(lambda: defaultdict(Counter))
+
+    def __call__(self, kind, name, path, metrics):
+        """Add an event's metrics."""
+        key = kind if name is None else f"{kind}:{name}"
+        self._names[key].update(metrics)
+        if path is not None:
+            self._paths[path][key].update(metrics)
+
+    def __enter__(self):
+        """Register the collector."""
+        register(self)
+        return self
+
+    def __exit__(self, *args):
+        """Unregister the collector."""
+        unregister(self)
+
+    def report(self):
+        """
+        Return the sums of the metrics of events, by kind and name ("names"), and by file path ("paths").
+
+        Keys are ``kind:name``, or ``kind`` if the name is ``None``, like ``check:letter-case`` or ``walk``.
+
+        :rtype: dict
+        """
+        return {
+            "names": {key: dict(metrics) for key, metrics in sorted(self._names.items())},
+            "paths": {
+                path: {key: dict(metrics) for key, metrics in sorted(keys.items())}
+                for path, keys in sorted(self._paths.items())
+            },
+        }
+
+    def merge(self, report):
+        """
+        Add the metrics of a report, like one from another process.
+
+        :param dict report: the return value of :meth:`report`
+        """
+        for key, metrics in report["names"].items():
+            self._names[key].update(metrics)
+        for path, keys in report["paths"].items():
+            for key, metrics in keys.items():
+                self._paths[path][key].update(metrics)
+
+    def write(self, path):
+        """
+        Write the report to a JSON file.
+
+        :param str path: the file path
+        """
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+            f.write("\n")
@@ -0,0 +1,230 @@
+"""
+Methods for parsing and serializing JSON, using `orjson <https://github.com/ijl/orjson>`__ if it is installed.
+
+The results are the same as the ``json`` module's. If orjson can't parse a JSON text, like a text containing a lone
+surrogate or ``NaN``, it is parsed by the ``json`` module, which either returns the same value as it otherwise would,
+or raises the same exception. Since orjson parses large integers as floats, a JSON text containing a sequence of 19 or
+more digits is also parsed by the ``json`` module.
+"""
+
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from jscc.exceptions import DuplicateKeyError, InvalidJSONError
+
+JSONDecodeError = json.JSONDecodeError
+
+# 19 digits is the shortest integer that might not fit in a signed 64-bit integer.
+_long_number = re.compile(r"\d{19}")
+
+
+def loads(text, **kwargs):
+    """
+    Parse a JSON text.
+
+    If keyword arguments are provided, like ``object_pairs_hook``, the ``json`` module is used.
+
+    :param str text: a JSON text
+    :raises json.JSONDecodeError: if the JSON text is invalid
+    """
+    if orjson is not None and not kwargs and not _long_number.search(text):
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text, **kwargs)
+
+
+def dumps(data, **kwargs):
+    """
+    Serialize data as a JSON text.
+
+    The ``json`` module is always used, because orjson formats some numbers differently (like ``1e16``).
+
+    Accepts the same keyword arguments as ``json.dumps``.
+    """
+    return json.dumps(data, **kwargs)
+
+
+# A token, after any whitespace: a structural character (group 1), a string without its closing quotation mark
+# (group 2), or a number or literal name (group 3). Like the json module, NaN, Infinity and -Infinity are accepted.
+_token = re.compile(
+    rb"[ \t\n\r]*(?:"
+    rb"([\[\]{}:,])"
+    rb'|("(?:[^"\\\x00-\x1f]|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*)'
+    rb"|(-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?|true|false|null|NaN|Infinity|-Infinity)"
+    rb")"
+)
+_whitespace = re.compile(rb"[ \t\n\r]*")
+
+# More than the length of the longest literal name ("-Infinity") or escape sequence ("\\uXXXX").
+_LOOKAHEAD = 16
+
+# The states of the incremental checker.
+_VALUE = 0  # expecting a value
+_VALUE_OR_END = 1  # expecting a value or "]"
+_KEY = 2  # expecting a name
+_KEY_OR_END = 3  # expecting a name or "}"
+_COLON = 4  # expecting ":"
+_COMMA_OR_END = 5  # expecting "," or the end of the container
+_END = 6  # expecting the end of the text
+
+# The error messages of the json module, for each state.
+_messages = {
+    _VALUE: "Expecting value",
+    _VALUE_OR_END: "Expecting value",
+    _KEY: "Expecting property name enclosed in double quotes",
+    _KEY_OR_END: "Expecting property name enclosed in double quotes",
+    _COLON: "Expecting ':' delimiter",
+    _COMMA_OR_END: "Expecting ',' delimiter",
+    _END: "Extra data",
+}
+_invalid_string = "Invalid string"
+_invalid_utf8 = "Invalid UTF-8"
+
+
+def check(f, chunk_size=65536):
+    """
+    Check that a JSON text is valid and that its objects have no duplicate names, without parsing it into memory.
+
+    The JSON text is read incrementally. Memory use is bounded by the nesting depth, by the number of names in the
+    open objects, and by the length of the longest token.
+
+    :param f: a file object, opened in binary mode
+    :param int chunk_size: the number of bytes to read at a time
+    :raises jscc.exceptions.InvalidJSONError: if the JSON text is invalid
+    :raises jscc.exceptions.DuplicateKeyError: if a JSON object has members with duplicate names. The exception's
+        ``pos`` and ``pointer`` attributes are the byte offset and JSON Pointer of the duplicate member.
+    """
+    # Each frame is a list of [names, name] for an object, or [None, index] for an array.
+    stack = []
+
+    buffer = b""
+    size = 0  # the length of the buffer
+    offset = 0  # the byte offset of the start of the buffer
+    pos = 0  # the position in the buffer
+    lookahead = _LOOKAHEAD  # the number of bytes to buffer after the position
+    eof = False
+    state = _VALUE
+
+    def pointer():
+        return "".join("/" + str(part).replace("~", "~0").replace("/", "~1") for _, part in stack if part is not None)
+
+    def error(at, msg=None):
+        return InvalidJSONError(msg or _messages[state], offset + at, pointer())
+
+    while True:
+        if size - pos < lookahead and not eof:
+            buffer = buffer[pos:]
+            offset += pos
+            pos = 0
+            while len(buffer) < lookahead:
+                # Read at least as many bytes as are buffered, to read long tokens in linear time.
+                chunk = f.read(max(chunk_size, len(buffer)))
+                if not chunk:
+                    eof = True
+                    break
+                buffer += chunk
+            size = len(buffer)
+            lookahead = _LOOKAHEAD
+
+        match = _token.match(buffer, pos)
+        if match is None:
+            start = _whitespace.match(buffer, pos).end()
+            # A token after whitespace might continue past the end of the buffer.
+            if start < size and not eof and start >= size - _LOOKAHEAD:
+                lookahead = size - pos + _LOOKAHEAD
+                continue
+            if start < size:
+                raise error(start)
+            if not eof:
+                lookahead = size - pos + 1
+                continue
+            if state != _END:
+                raise error(start)
+            return
+
+        group = match.lastindex
+        end = match.end()
+
+        # A token might continue past the end of the buffer.
+        if not eof and (end == size or (group == 2 and end >= size - _LOOKAHEAD)):
+            lookahead = size - pos + _LOOKAHEAD
+            continue
+
+        start = match.start(group)
+
+        if group == 1:
+            c = buffer[start]
+            if state == _COMMA_OR_END:
+                frame = stack[-1]
+                if c == 0x2C:  # ,
+                    if frame[0] is None:
+                        frame[1] += 1
+                        state = _VALUE
+                    else:
+                        state = _KEY
+                elif c == (0x5D if frame[0] is None else 0x7D):  # ] or }
+                    stack.pop()
+                    state = _COMMA_OR_END if stack else _END
+                else:
+                    raise error(start)
+            elif c == 0x3A:  # :
+                if state != _COLON:
+                    raise error(start)
+                state = _VALUE
+            elif state in {_VALUE, _VALUE_OR_END}:
+                if c == 0x7B:  # {
+                    stack.append([set(), None])
+                    state = _KEY_OR_END
+                elif c == 0x5B:  # [
+                    stack.append([None, 0])
+                    state = _VALUE_OR_END
+                elif c == 0x5D and state == _VALUE_OR_END:  # ]
+                    stack.pop()
+                    state = _COMMA_OR_END if stack else _END
+                else:
+                    raise error(start)
+            elif c == 0x7D and state == _KEY_OR_END:  # }
+                stack.pop()
+                state = _COMMA_OR_END if stack else _END
+            else:
+                raise error(start)
+            pos = end
+
+        elif group == 2:
+            if end == size or buffer[end] != 0x22:  # "
+                raise error(end, _invalid_string)
+            token = buffer[start : end + 1]
+            if not token.isascii():
+                try:
+                    token.decode()
+                except UnicodeDecodeError as e:
+                    raise error(start + e.start, f"{_invalid_utf8} ({e.reason})") from None
+            if state in {_KEY, _KEY_OR_END}:
+                frame = stack[-1]
+                name = json.loads(token) if 0x5C in token else token[1:-1].decode()  # \
+                frame[1] = name
+                if name in frame[0]:
+                    e = DuplicateKeyError(name)
+                    e.pos = offset + start
+                    e.pointer = pointer()
+                    raise e
+                frame[0].add(name)
+                state = _COLON
+            elif state in {_VALUE, _VALUE_OR_END}:
+                state = _COMMA_OR_END if stack else _END
+            else:
+                raise error(start)
+            pos = end + 1
+
+        else:
+            if state not in {_VALUE, _VALUE_OR_END}:
+                raise error(start)
+            state = _COMMA_OR_END if stack else _END
+            pos = end
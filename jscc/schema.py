@@ -1,12 +1,12 @@
 """Methods for interacting with or reasoning about JSON Schema and CSV codelists."""
 
+import csv
+import sys
+from array import array
 from collections import UserDict
 from copy import deepcopy
 
-import json_merge_patch
-
 from jscc.exceptions import DuplicateKeyError
-from jscc.testing.util import http_get
 
 
 def is_codelist(fieldnames):
@@ -19,6 +19,107 @@ def is_codelist(fieldnames):
     return "Code" in fieldnames or "code" in fieldnames
 
 
+def _code_index(fieldnames):
+    """Return the index of the "Code" or "code" fieldname, or ``None``."""
+    for fieldname in ("Code", "code"):
+        if fieldname in fieldnames:
+            return fieldnames.index(fieldname)
+    return None
+
+
+class Codelist:
+    """
+    A CSV codelist, stored as one tuple per column.
+
+    Iterating over a codelist yields rows as dicts, like :class:`csv.DictReader`. Short rows are padded with ``None``,
+    but, unlike :class:`csv.DictReader`, extra values in long rows are discarded.
+    """
+
+    __slots__ = ("_index", "columns", "fieldnames")
+
+    def __init__(self, fieldnames, columns):
+        """
+        :param list fieldnames: the fieldnames of the CSV
+        :param list columns: one tuple of values per fieldname
+        """
+        #: The fieldnames of the CSV.
+        self.fieldnames = fieldnames
+        #: One tuple of values per fieldname.
+        self.columns = columns
+
+        self._index = {}
+        code = _code_index(fieldnames)
+        if code is not None:
+            for i, value in enumerate(columns[code]):
+                self._index.setdefault(value, i)
+
+    @classmethod
+    def read(cls, f):
+        """
+        Read a codelist from a file object, in a single pass.
+
+        :param f: a file object opened with ``newline=""``
+        :raises csv.Error: if the CSV is invalid
+        """
+        reader = csv.reader(f)
+        fieldnames = next(reader, None) or []
+        columns = [[] for _ in fieldnames]
+        width = len(fieldnames)
+        code = _code_index(fieldnames)
+
+        for row in reader:
+            # Like `csv.DictReader`, skip blank rows.
+            if not row:
+                continue
+            if len(row) < width:
+                row.extend([None] * (width - len(row)))
+            if code is not None and row[code] is not None:
+                row[code] = sys.intern(row[code])
+            for column, value in zip(columns, row, strict=False):
+                column.append(value)
+
+        return cls(fieldnames, [tuple(column) for column in columns])
+
+    @property
+    def codes(self):
+        """
+        :returns: the codes, in order, without duplicates
+        :rtype: dict_keys
+        """
+        return self._index.keys()
+
+    def column(self, fieldname):
+        """
+        :param str fieldname: a fieldname
+        :returns: the column's values
+        :rtype: tuple
+        """
+        return self.columns[self.fieldnames.index(fieldname)]
+
+    def row(self, code):
+        """
+        :param str code: a code
+        :returns: the first row with the code, as a dict
+        :rtype: dict
+        :raises KeyError: if the code isn't in the codelist
+        """
+        i = self._index[code]
+        return {fieldname: column[i] for fieldname, column in zip(self.fieldnames, self.columns, strict=True)}
+
+    def __contains__(self, code):
+        """Return whether the code is in the codelist."""
+        return code in self._index
+
+    def __len__(self):
+        """Return the number of rows."""
+        return len(self.columns[0]) if self.columns else 0
+
+    def __iter__(self):
+        """Yield each row as a dict."""
+        for values in zip(*self.columns, strict=True):
+            yield dict(zip(self.fieldnames, values, strict=True))
+
+
 def is_json_schema(data):
     """
     :param dict data: JSON data
@@ -75,6 +176,284 @@ def get_types(field):
     return field["type"]
 
 
+def collect_codelists(data, codelists=None):
+    """
+    Collect the "codelist" values from JSON Schema, in a single pass.
+
+    :param data: JSON Schema
+    :param set codelists: the set to which to add the values (default a new set)
+    :returns: the "codelist" values
+    :rtype: set
+    """
+    if codelists is None:
+        codelists = set()
+
+    seen = set()
+    stack = [data]
+    while stack:
+        data = stack.pop()
+        # Break cycles in dereferenced schemas.
+        if id(data) in seen:
+            continue
+        if isinstance(data, dict):
+            seen.add(id(data))
+            if "codelist" in data:
+                codelists.add(data["codelist"])
+            stack.extend(data.values())
+        elif isinstance(data, list):
+            seen.add(id(data))
+            stack.extend(data)
+
+    return codelists
+
+
+# Placeholders for diff().
+_leave = object()
+_missing = object()
+
+
+def diff(old, new, pointer=""):
+    """
+    Yield the JSON Pointers of the values that differ between two versions of JSON data, like JSON Schema.
+
+    If a value is added, removed or changed, its JSON Pointer is yielded, but not the JSON Pointers of its descendants.
+    If an array's length changes, the array's JSON Pointer is yielded. Values of different types are different, even
+    if equal in Python, like ``1`` and ``True``.
+
+    Like in the messages of the ``validate_*`` methods, reference tokens aren't escaped.
+
+    :param old: the old version of the data
+    :param new: the new version of the data
+    :param str pointer: the JSON Pointer of the data
+    """
+    # Iterate, instead of recursing, to not exceed Python's recursion limit on deeply nested data. Each item is a
+    # pair of values to compare, or a pair of dicts or lists whose comparison ends.
+    stack = [(old, new, pointer)]
+    # The IDs of the pairs of dicts and lists being compared, to break cycles in dereferenced data.
+    ancestors = set()
+
+    while stack:
+        old, new, pointer = stack.pop()
+
+        if old is _leave:
+            ancestors.discard(new)
+        elif (isinstance(old, dict) and isinstance(new, dict)) or (isinstance(old, list) and isinstance(new, list)):
+            pair = (id(old), id(new))
+            if pair in ancestors:
+                continue
+            ancestors.add(pair)
+            stack.append((_leave, pair, None))
+
+            if isinstance(old, dict):
+                for key in old:
+                    if key not in new:
+                        yield f"{pointer}/{key}"
+                # Push in reverse order, to yield in order. Added values differ from the _missing placeholder.
+                stack.extend((old.get(key, _missing), new[key], f"{pointer}/{key}") for key in reversed(new))
+            elif len(old) != len(new):
+                yield pointer
+            else:
+                stack.extend((old[index], new[index], f"{pointer}/{index}") for index in reversed(range(len(new))))
+        elif type(old) is not type(new) or old != new:
+            yield pointer
+
+
+class NodeTable:
+    """
+    JSON Schema, flattened into a table of its objects and arrays, stored as one array per column.
+
+    Compile a schema once, then scan the columns with tight loops, instead of traversing the schema and re-deriving
+    each node's types, flags, parent and grandparent. The table can be pickled, to cache it across runs.
+
+    Nodes are in preorder, and node ``0`` is the root. Node ``i``'s descendants are the nodes from ``i + 1`` to
+    ``end[i] - 1``. Scalars aren't nodes. In dereferenced schemas, cycles are broken, like in the ``validate_*``
+    methods.
+
+    .. code-block:: python
+
+       table = NodeTable.compile(schema)
+       for i in table.select(NodeTable.CODELIST, NodeTable.TYPES["array"]):
+           print(table.pointer(i))
+    """
+
+    #: The bit of each "type" value in the ``types`` column.
+    TYPES = {"string": 1, "number": 2, "integer": 4, "boolean": 8, "null": 16, "object": 32, "array": 64}  # noqa: RUF012
+
+    #: The node is an array, not an object.
+    ARRAY = 1
+    #: The node sets "$ref".
+    REF = 2
+    #: The node sets "codelist".
+    CODELIST = 4
+    #: The node sets "openCodelist" to ``true``.
+    OPEN_CODELIST = 8
+    #: The node is a property whose name is in its object's "required".
+    REQUIRED = 16
+    #: The node is an array of objects, per :meth:`is_array_of_objects`.
+    ARRAY_OF_OBJECTS = 32
+    #: The node sets "enum".
+    ENUM = 64
+    #: The node sets "items".
+    ITEMS = 128
+
+    __slots__ = ("end", "flags", "keys", "parent", "types")
+
+    def __init__(self, parent, end, keys, types, flags):
+        """
+        :param array.array parent: the index of each node's parent (``-1`` for the root)
+        :param array.array end: the index after each node's last descendant
+        :param list keys: each node's key in its parent (``None`` for the root)
+        :param array.array types: each node's "type" values, as a bitmask of :attr:`TYPES`
+        :param array.array flags: each node's flags, as a bitmask
+        """
+        #: The index of each node's parent (``-1`` for the root).
+        self.parent = parent
+        #: The index after each node's last descendant.
+        self.end = end
+        #: Each node's key in its parent: a property name, an array index, or ``None`` for the root.
+        self.keys = keys
+        #: Each node's "type" values, as a bitmask of :attr:`TYPES`.
+        self.types = types
+        #: Each node's flags, as a bitmask of :attr:`ARRAY`, :attr:`REF`, etc.
+        self.flags = flags
+
+    @classmethod
+    def compile(cls, data):
+        """
+        Flatten JSON Schema into a table, in a single pass.
+
+        :param data: JSON Schema
+        """
+        parent = array("l")
+        end = array("l")
+        keys = []
+        types = array("B")
+        flags = array("B")
+
+        bits = cls.TYPES
+        # The IDs of the objects being compiled, to break cycles in dereferenced data, and the indices of their nodes.
+        ancestors = set()
+        path = []
+        # Each item is a value, its key, its parent's index, whether it is a required property, and, if the value is
+        # "properties", the "required" names. Or, it is the index of a node being left.
+        stack = [(data, None, -1, False, None)]
+
+        while stack:
+            item = stack.pop()
+
+            if isinstance(item, int):
+                end[item] = len(keys)
+                ancestors.discard(path.pop())
+                continue
+
+            data, key, up, required, names = item
+            if id(data) in ancestors:
+                continue
+
+            index = len(keys)
+            parent.append(up)
+            end.append(0)
+            keys.append(key)
+
+            mask = 0
+            flag = cls.REQUIRED if required else 0
+            if isinstance(data, dict):
+                _type = data.get("type")
+                if isinstance(_type, str):
+                    mask = bits.get(_type, 0)
+                elif isinstance(_type, list):
+                    for value in _type:
+                        if isinstance(value, str):
+                            mask |= bits.get(value, 0)
+                if "$ref" in data:
+                    flag |= cls.REF
+                if "codelist" in data:
+                    flag |= cls.CODELIST
+                if data.get("openCodelist") is True:
+                    flag |= cls.OPEN_CODELIST
+                if "enum" in data:
+                    flag |= cls.ENUM
+                if "items" in data:
+                    flag |= cls.ITEMS
+                    if mask & bits["array"] and isinstance(data["items"], dict) and is_array_of_objects(data):
+                        flag |= cls.ARRAY_OF_OBJECTS
+
+                required = data.get("required")
+                if not isinstance(required, list):
+                    required = None
+                children = reversed(data.items())
+            else:
+                flag |= cls.ARRAY
+                required = None
+                children = zip(reversed(range(len(data))), reversed(data), strict=True)
+
+            types.append(mask)
+            flags.append(flag)
+
+            ancestors.add(id(data))
+            path.append(id(data))
+            stack.append(index)
+            stack.extend(
+                (
+                    value,
+                    child,
+                    index,
+                    names is not None and child in names,
+                    required if child == "properties" and isinstance(value, dict) else None,
+                )
+                for child, value in children
+                if isinstance(value, (dict, list))
+            )
+
+        return cls(parent, end, keys, types, flags)
+
+    def __len__(self):
+        """Return the number of nodes."""
+        return len(self.keys)
+
+    def pointer(self, index):
+        """
+        Like in the messages of the ``validate_*`` methods, reference tokens aren't escaped.
+
+        :param int index: a node's index
+        :returns: the node's JSON Pointer
+        :rtype: str
+        """
+        parts = []
+        while index > 0:
+            parts.append(self.keys[index])
+            index = self.parent[index]
+        return "".join(f"/{part}" for part in reversed(parts))
+
+    def children(self, index):
+        """
+        Yield the indices of a node's children.
+
+        :param int index: a node's index
+        """
+        child = index + 1
+        stop = self.end[index]
+        while child < stop:
+            yield child
+            child = self.end[child]
+
+    def select(self, flags=0, types=0):
+        """
+        Return the indices of the nodes that have all the given flags and, if any, at least one of the given types.
+
+        :param int flags: a bitmask of flags, like ``NodeTable.REF | NodeTable.CODELIST``
+        :param int types: a bitmask of :attr:`TYPES`
+        :rtype: list
+        """
+        if types:
+            return [
+                i
+                for i, (flag, mask) in enumerate(zip(self.flags, self.types, strict=True))
+                if flag & flags == flags and mask & types
+            ]
+        return [i for i, flag in enumerate(self.flags) if flag & flags == flags]
+
+
 def extend_schema(basename, schema, metadata, codelists=None):
     """
     Patches a JSON Schema with an extension's dependencies, recursively.
@@ -98,6 +477,9 @@ def extend_schema(basename, schema, metadata, codelists=None):
     :returns: the patched schema
     :rtype: dict
     """
+    import json_merge_patch  # noqa: PLC0415 # import on first use
+
+    from jscc.testing.util import http_get  # noqa: PLC0415 # requests is slow to import
 
     def recurse(metadata):
         for metadata_url in metadata.get("dependencies", []) + metadata.get("testDependencies", []):
@@ -127,6 +509,18 @@ class RejectingDict(UserDict):
 
 
 def rejecting_dict(pairs):
-    """Allow a key to be set at most once. Use as an ``object_pairs_hook`` method."""
-    # Return the wrapped dict, not the RejectingDict itself, because jsonschema checks the type.
-    return RejectingDict(pairs).data
+    """
+    Allow a key to be set at most once. Use as an ``object_pairs_hook`` method.
+
+    :raises DuplicateKeyError: if a key is set more than once
+    """
+    # Return a dict, not a RejectingDict, because jsonschema checks the type.
+    data = dict(pairs)
+    # Look for the first duplicate key only if there is one, to not set each key individually.
+    if len(data) < len(pairs):
+        seen = set()
+        for k, _ in pairs:
+            if k in seen:
+                raise DuplicateKeyError(k)
+            seen.add(k)
+    return data
@@ -0,0 +1,157 @@
+"""
+A server that keeps parsed files, codelists, HTTP responses and validators in memory between runs of the checks, for
+editor and pre-commit integrations.
+
+.. code-block:: bash
+
+   jscc-server &
+   jscc-client --check codelist-enum --path schema/release-schema.json schema
+
+The server listens on a Unix domain socket (see :meth:`jscc.client.socket_path`), to which the client connects only
+if it is owned by the current user. Each request is a line of JSON, with the client's working directory ("cwd") and
+the arguments of the ``jscc`` command ("args"). Each response is a line of JSON, like :meth:`jscc.client.request`.
+
+A :class:`~jscc.cli.Session` is kept for each directory tree and set of options. Before each run, files that changed
+since the previous run are found by comparing modification times and sizes.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+
+from jscc import cli, instrument
+from jscc.client import check_socket, socket_path
+
+
+class Server(socketserver.UnixStreamServer):
+    """A server that runs the checks of the ``jscc`` command, for one request at a time."""
+
+    def __init__(self, path):
+        """
+        Initialize the server, and bind its socket, which only the current user can access.
+
+        :param str path: the file path of the socket
+        """
+        self.sessions = {}
+
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, _Handler)
+        finally:
+            os.umask(umask)
+
+    def respond(self, request):
+        """
+        Run the checks, and return the response.
+
+        :param dict request: the client's working directory ("cwd") and the arguments of the ``jscc`` command ("args")
+        :rtype: dict
+        """
+        os.chdir(request["cwd"])
+
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                args = cli.parse_args(request["args"])
+        except SystemExit as e:  # --help or invalid arguments
+            return {"status": e.code, "output": stdout.getvalue(), "error": stderr.getvalue(), "diagnostics": []}
+
+        if args.watch:
+            return {
+                "status": 2,
+                "output": "",
+                "error": "jscc: --watch is not supported by the server\n",
+                "diagnostics": [],
+            }
+        if args.max_errors:
+            return {
+                "status": 2,
+                "output": "",
+                "error": "jscc: --max-errors is not supported by the server\n",
+                "diagnostics": [],
+            }
+
+        os.chdir(args.directory)
+
+        key = (
+            args.directory,
+            tuple(args.checks),
+            json.dumps(args.metaschema, sort_keys=True),
+            args.exclude,
+            args.git,
+            args.cache_dir,
+        )
+        session = self.sessions.get(key)
+        new = session is None
+        if new:
+            session = cli.Session(
+                args.checks, metaschema=args.metaschema, excluded=args.exclude, git=args.git, cache_dir=args.cache_dir
+            )
+            self.sessions[key] = session
+
+        collector = instrument.Collector() if args.profile else None
+        with collector or contextlib.nullcontext():
+            diagnostics = session.run() if new else session.refresh()
+        if collector is not None:
+            collector.write(args.profile)
+
+        diagnostics = cli.select(diagnostics, args.path)
+        errors = cli.write(diagnostics, args.format, stdout)
+
+        return {"status": 1 if errors else 0, "output": stdout.getvalue(), "error": "", "diagnostics": diagnostics}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = self.server.respond(json.loads(line))
+            except Exception as e:  # noqa: BLE001 # keep serving
+                response = {"status": 2, "output": "", "error": f"jscc: {e!r}\n", "diagnostics": []}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+def main(args=None):
+    """Run the server until interrupted, and return the exit status."""
+    parser = argparse.ArgumentParser(prog="jscc-server", description="Serve the checks of the jscc command.")
+    parser.add_argument("--socket", default=socket_path(), help="the file path of the socket")
+    args = parser.parse_args(args)
+
+    # Create the per-user directory, if needed, and check that another user can't replace the socket.
+    directory = os.path.dirname(os.path.abspath(args.socket))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if os.stat(directory).st_uid not in {os.getuid(), 0}:
+        parser.error(f"{directory} is owned by another user")
+
+    if os.path.exists(args.socket):
+        try:
+            check_socket(args.socket)
+        except PermissionError as e:
+            parser.error(str(e))
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(args.socket)
+            except ConnectionRefusedError:
+                os.remove(args.socket)  # left by a server that stopped
+            else:
+                parser.error(f"a server is already listening on {args.socket}")
+
+    with Server(args.socket) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(args.socket)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
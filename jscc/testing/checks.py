@@ -86,18 +86,24 @@ You can monkeypatch ``warnings.formatwarning`` to customize and abbreviate the w
 # the last component of the pointer (the "parent"). However, it's easier when *using* the module to write JSON Pointers
 # as strings. Therefore, we use strings instead of tuples.
 
-import json
+import codecs
+import mmap
 import os
 import re
+import time
+import warnings
+from collections import Counter, defaultdict
+from io import BytesIO, TextIOWrapper
 from warnings import warn
 
-import jsonref
-
+from jscc import instrument, jsonlib
 from jscc.exceptions import (
     ArrayItemsWarning,
     CodelistEnumWarning,
+    CodelistsWarning,
     DeepPropertiesWarning,
     DuplicateKeyError,
+    InvalidJSONError,
     ItemsTypeWarning,
     LetterCaseWarning,
     MergePropertiesWarning,
@@ -108,9 +114,31 @@ from jscc.exceptions import (
     SchemaCodelistsMatchWarning,
     SchemaWarning,
 )
-from jscc.schema import get_types, is_array_of_objects, is_codelist, is_missing_property, rejecting_dict
+from jscc.schema import (
+    collect_codelists,
+    diff,
+    get_types,
+    is_array_of_objects,
+    is_codelist,
+    is_missing_property,
+    rejecting_dict,
+)
 from jscc.testing.filesystem import tracked, walk, walk_csv_data, walk_json_data
-from jscc.testing.util import difference
+from jscc.testing.util import difference, get_validator
+
+# Matches any character that `str.strip()` doesn't remove, or any non-ASCII byte.
+_non_whitespace = re.compile(rb"[^\t\n\x0b\x0c\r\x1c-\x1f ]")
+# Matches any character that `json.loads()` doesn't ignore around values.
+_non_json_whitespace = re.compile(rb"[^\t\n\r ]")
+# Maps the first character of a possibly empty JSON value to the next character, if empty.
+_json_empty = {
+    ord("["): ord("]"),
+    ord("{"): ord("}"),
+    ord('"'): ord('"'),
+}
+_mmap_threshold = 65536
+# The validator of each worker process.
+_validator_options = {}
 
 
 def _true(*args):
@@ -123,15 +151,20 @@ def _false(*args):
     return False
 
 
-def get_empty_files(include=_true, **kwargs):
+def get_empty_files(include=_true, *, budget=None, **kwargs):
     """
     Yield the path (as a tuple) of any file that is empty.
 
     JSON files are empty if their parsed contents are empty (empty array, empty object, empty string or ``null``).
     Other files are empty if they contain whitespace only.
 
+    Zero-length files are not opened. Otherwise, files are scanned up to their first non-whitespace character, and are
+    decoded and parsed only if they might be empty.
+
     :param function include: a method that accepts a file path and file name, and returns whether to test the file
                              (default true)
+    :param budget: the maximum number of files to yield, across checks
+    :type budget: ErrorBudget
 
     pytest example::
 
@@ -143,26 +176,134 @@ def get_empty_files(include=_true, **kwargs):
                             'Files are empty. See warnings below.')
 
     """
-    for path, name in walk(**kwargs):
-        if tracked(path) and include(path, name) and name != "__init__.py":
-            try:
-                with open(path) as f:
-                    text = f.read()
-            except UnicodeDecodeError:
-                continue  # the file is non-empty, and might be binary
-
-            if not text.strip():
-                yield (path,)
-            elif name.endswith(".json"):
-                try:
-                    value = json.loads(text)
-                    if not value and not isinstance(value, (bool, int, float)):
-                        yield (path,)
-                except json.JSONDecodeError:
-                    continue  # the file is non-empty
-
-
-def get_misindented_files(include=_true, **kwargs):
+    source = kwargs.get("source")
+
+    def empty(path, name):
+        if source is None:
+            return is_empty_file(path)
+        # Like is_empty_file(), decide zero-length files without reading them.
+        if not source.size(path):
+            return True
+        # The result depends on the file's content and on whether it is a JSON file.
+        kind = "empty-json" if name.endswith(".json") else "empty"
+        return source.parse(path, kind, _is_empty_blob, path, name, source)
+
+    results = (
+        (path,)
+        for path, name in walk(**kwargs)
+        if tracked(path) and include(path, name) and name != "__init__.py" and empty(path, name)
+    )
+    yield from _spend(results, budget)
+
+
+def is_empty_file(path):
+    """
+    Return whether a file is empty, like :meth:`~jscc.testing.checks.get_empty_files`.
+
+    :param str path: a file path
+    """
+    name = os.path.basename(path)
+    size = os.stat(path).st_size
+    if not size:
+        return True
+
+    with open(path, "rb") as f:
+        if size > _mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                empty = _is_empty(buffer, name)
+        else:
+            empty = _is_empty(f.read(), name)
+
+    if empty is None:
+        # The file is a possibly empty JSON file.
+        try:
+            with open(path) as f:
+                return _is_empty_text(f.read(), name)
+        except UnicodeDecodeError:
+            return False  # the file is non-empty, and might be binary
+
+    return empty
+
+
+def _is_empty_blob(path, name, source):
+    """Return whether a file in a source is empty, like :meth:`~jscc.testing.checks.is_empty_file`."""
+    blob = source.read(path)
+    if not blob:
+        return True
+
+    empty = _is_empty(blob, name)
+    if empty is None:
+        try:
+            return _is_empty_text(TextIOWrapper(BytesIO(blob)).read(), name)
+        except UnicodeDecodeError:
+            return False  # the file is non-empty, and might be binary
+
+    return empty
+
+
+def _is_empty(buffer, name):
+    """
+    Return whether the bytes are empty, or ``None`` if the text needs to be decoded to decide.
+
+    Only the leading bytes are scanned, up to the first non-whitespace character.
+    """
+    match = _non_whitespace.search(buffer)
+    if not match:
+        return True
+    # The first non-whitespace character is non-ASCII, and might be Unicode whitespace.
+    if buffer[match.start()] >= 0x80:
+        return _is_blank(buffer, match.start())
+    if not name.endswith(".json"):
+        return False
+
+    start = _non_json_whitespace.search(buffer).start()
+    character = buffer[start]
+    if character == ord("n"):
+        return None
+    if character in _json_empty:
+        match = _non_json_whitespace.search(buffer, start + 1)
+        if match and buffer[match.start()] == _json_empty[character]:
+            return None
+    # The JSON value is a non-empty array, object or string, a number, a boolean, or invalid.
+    return False
+
+
+def _is_blank(buffer, start):
+    """
+    Return whether the bytes from the start are whitespace, decoding only up to the first non-whitespace character.
+
+    Binary files, like images and archives, are decided after decoding a few bytes.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    size = len(buffer)
+    step = 64
+    try:
+        while start < size:
+            end = start + step
+            if decoder.decode(buffer[start:end], final=end >= size).strip():
+                return False
+            start = end
+            # Decode larger chunks of long runs of whitespace.
+            step = min(step * 2, _mmap_threshold)
+    except UnicodeDecodeError:
+        return False  # the file is non-empty, and might be binary
+    return True
+
+
+def _is_empty_text(text, name):
+    """Return whether the text is empty."""
+    if not text.strip():
+        return True
+    if name.endswith(".json"):
+        try:
+            value = jsonlib.loads(text)
+        except jsonlib.JSONDecodeError:
+            return False  # the file is non-empty
+        return not value and not isinstance(value, (bool, int, float))
+    return False
+
+
+def get_misindented_files(include=_true, *, budget=None, **kwargs):
     r"""
     Yield the path (as a tuple) of any JSON file that isn't formatted for humans.
 
@@ -171,6 +312,8 @@ def get_misindented_files(include=_true, **kwargs):
 
     :param function include: a method that accepts a file path and file name, and returns whether to test the file
                              (default true)
+    :param budget: the maximum number of files to yield, across checks
+    :type budget: ErrorBudget
 
     pytest example::
 
@@ -181,19 +324,58 @@ def get_misindented_files(include=_true, **kwargs):
             warn_and_assert(get_misindented_files(), '{0} is not indented as expected, run: ocdskit indent {0}',
                             'Files are not indented as expected. See warnings below, or run: ocdskit indent -r .')
     """
-    for path, name, text, data in walk_json_data(**kwargs):
-        if tracked(path) and include(path, name):
-            expected = json.dumps(data, ensure_ascii=False, indent=2) + "\n"
-            if text != expected:
-                yield (path,)
+    source = kwargs.get("source")
+    # Like walk_json_data(), don't share the results for patched text with other revisions.
+    if kwargs.get("patch"):
+        source = None
+
+    def misindented(path, text, data):
+        if source is None:
+            return _is_misindented(text, data)
+        return source.parse(path, "indent", _is_misindented, text, data)
+
+    results = (
+        (path,)
+        for path, name, text, data in walk_json_data(**kwargs)
+        if tracked(path) and include(path, name) and misindented(path, text, data)
+    )
+    yield from _spend(results, budget)
+
+
+def is_misindented_file(path):
+    """
+    Return whether a JSON file isn't formatted for humans, like :meth:`~jscc.testing.checks.get_misindented_files`.
 
+    Returns ``False`` if the file is empty or isn't valid JSON.
 
-def get_invalid_json_files(**kwargs):
+    :param str path: a file path
+    """
+    with open(path) as f:
+        text = f.read()
+    if not text:
+        return False
+    try:
+        data = jsonlib.loads(text)
+    except jsonlib.JSONDecodeError:
+        return False
+    return _is_misindented(text, data)
+
+
+def _is_misindented(text, data):
+    return text != jsonlib.dumps(data, ensure_ascii=False, indent=2) + "\n"
+
+
+def get_invalid_json_files(include=_true, *, stream_size=104857600, budget=None, **kwargs):
     """
     Yield the path and exception (as a tuple) of any JSON file that isn't valid.
 
     JSON files must be parsed without error by the ``json`` module, and JSON objects mustn't have duplicate keys.
 
+    JSON files larger than ``stream_size`` bytes are checked incrementally with :meth:`jscc.jsonlib.check`, instead of
+    being parsed into memory. In that case, the exception is either a
+    :class:`~jscc.exceptions.InvalidJSONError` or a :class:`~jscc.exceptions.DuplicateKeyError`, with the byte offset
+    and JSON Pointer of the first error.
+
     See https://tools.ietf.org/html/rfc7493#section-2.3
 
     pytest example::
@@ -204,41 +386,227 @@ def get_invalid_json_files(**kwargs):
         def test_invalid_json():
             warn_and_assert(get_invalid_json_files(), '{0} is not valid JSON: {1}',
                             'JSON files are invalid. See warnings below.')
+
+    :param function include: a method that accepts a file path and file name, and returns whether to test the file
+                             (default true)
+    :param int stream_size: the size in bytes above which to check files incrementally
+    :param budget: the maximum number of files to yield, across checks
+    :type budget: ErrorBudget
     """
-    for path, _ in walk(**kwargs):
-        if path.endswith(".json"):
-            with open(path) as f:
-                text = f.read()
-                if text:
-                    try:
-                        json.loads(text, object_pairs_hook=rejecting_dict)
-                    except (json.JSONDecodeError, DuplicateKeyError) as e:
-                        yield path, e
+    source = kwargs.get("source")
+
+    def results():
+        for path, name in walk(**kwargs):
+            if path.endswith(".json") and include(path, name):
+                if source is None:
+                    error = _json_error(path, stream_size)
+                else:
+                    error = source.parse(path, "invalid-json", _json_error, path, stream_size, source)
+                if error is not None:
+                    yield path, error
+
+    yield from _spend(results(), budget)
 
 
-def validate_schema(path, data, validator):  # noqa: ARG001 # consistency
+def _json_error(path, stream_size, source=None):
+    try:
+        check_json_file(path, stream_size=stream_size, source=source)
+    except (jsonlib.JSONDecodeError, InvalidJSONError, DuplicateKeyError) as e:
+        return e
+    return None
+
+
+def check_json_file(path, *, stream_size=104857600, source=None):
+    """
+    Check that a JSON file is valid, like :meth:`~jscc.testing.checks.get_invalid_json_files`.
+
+    :param str path: a file path
+    :param int stream_size: the size in bytes above which to check the file incrementally
+    :param source: the source from which to read the file, instead of the filesystem
+    :type source: jscc.testing.filesystem.GitTree
+    :raises json.JSONDecodeError: if the file isn't valid JSON
+    :raises jscc.exceptions.InvalidJSONError: if the file isn't valid JSON, and is checked incrementally
+    :raises jscc.exceptions.DuplicateKeyError: if a JSON object has members with duplicate names
+    """
+    if source is not None:
+        blob = source.read(path)
+        if len(blob) > stream_size:
+            jsonlib.check(BytesIO(blob))
+            return
+        text = TextIOWrapper(BytesIO(blob)).read()
+    elif os.path.getsize(path) > stream_size:
+        with open(path, "rb") as f:
+            jsonlib.check(f)
+        return
+    else:
+        with open(path) as f:
+            text = f.read()
+
+    if text:
+        jsonlib.loads(text, object_pairs_hook=rejecting_dict)
+
+
+def validate_schema(path, data, validator, *, budget=None):  # noqa: ARG001 # consistency
     """
     Warn and return the number of errors relating to JSON Schema validation.
 
     Uses the `jsonschema <https://python-jsonschema.readthedocs.io/>`__ module.
 
     :param validator: The validator to use
+    :param budget: the maximum number of errors, across checks
+    :type budget: ErrorBudget
     :returns: the number of errors
     :rtype: int
     """
     errors = 0
 
-    for error in validator.iter_errors(data):
+    for error in _spend(validator.iter_errors(data), budget):
         errors += 1
         warn(
-            f"{json.dumps(error.instance, indent=2)}\n{error.message} ({'/'.join(error.absolute_schema_path)})\n",
+            f"{jsonlib.dumps(error.instance, indent=2)}\n{error.message} ({'/'.join(error.absolute_schema_path)})\n",
             SchemaWarning,
         )
 
     return errors
 
 
-def validate_letter_case(*args, property_exceptions=(), definition_exceptions=()):
+def get_schema_errors(paths, schema, *, format_checker=True, jobs=None, budget=None):
+    """
+    Yield the path, error message, and absolute schema path (as a tuple) of each error from validating JSON files
+    against a schema, like a metaschema, in a process pool.
+
+    Files that aren't valid JSON are skipped. See :meth:`jscc.testing.checks.get_invalid_json_files`.
+
+    :param list paths: file paths of JSON files
+    :param dict schema: the schema against which to validate
+    :param bool format_checker: whether to check the ``format`` property
+    :param int jobs: the number of processes to use (default the number of CPUs). If ``1``, no process pool is used.
+    :param budget: the maximum number of errors to yield, across checks
+    :type budget: ErrorBudget
+
+    pytest example::
+
+        from jscc.testing.checks import get_schema_errors
+        from jscc.testing.util import http_get, warn_and_assert
+
+        def test_schemas():
+            metaschema = http_get('http://json-schema.org/draft-04/schema').json()
+            paths = [path for path, _, _, data in walk_json_data() if is_json_schema(data)]
+            warn_and_assert(get_schema_errors(paths, metaschema), '{0}: {1} ({2})',
+                            'JSON Schema files are invalid. See warnings below.')
+    """
+    paths = list(paths)
+    batches = [paths[i : i + 8] for i in range(0, len(paths), 8)]
+    yield from _spend(_validate_in_pool(_get_schema_errors, batches, schema, format_checker, jobs), budget)
+
+
+def get_data_errors(schema, include=_true, *, format_checker=True, jobs=None, max_size=1048576, budget=None, **kwargs):
+    """
+    Yield the path, JSON Pointer and error message (as a tuple) of each error from validating JSON data files against a
+    JSON Schema, like a patched schema from :meth:`jscc.schema.extend_schema`, in a process pool.
+
+    The validator is built once per process. Remote references are resolved with :meth:`jscc.testing.util.http_get`.
+
+    Files are read by the processes, not by the caller. Files up to :code:`max_size` bytes are sent to the processes in
+    batches of up to :code:`max_size` bytes, and larger files are sent one at a time.
+
+    Files that aren't valid JSON are skipped. See :meth:`jscc.testing.checks.get_invalid_json_files`.
+
+    Accepts the same keyword arguments as :meth:`jscc.testing.filesystem.walk`.
+
+    :param dict schema: the schema against which to validate
+    :param function include: a method that accepts a file path and file name, and returns whether to test the file
+                             (default true)
+    :param bool format_checker: whether to check the ``format`` property
+    :param int jobs: the number of processes to use (default the number of CPUs). If ``1``, no process pool is used.
+    :param int max_size: the maximum size in bytes of a batch of files
+    :param budget: the maximum number of errors to yield, across checks
+    :type budget: ErrorBudget
+
+    pytest example::
+
+        from jscc.testing.checks import get_data_errors
+        from jscc.testing.util import warn_and_assert
+
+        def test_examples():
+            schema = extend_schema('release-schema.json', core, metadata)
+            warn_and_assert(get_data_errors(schema, lambda path, name: 'examples' in path), '{0}: {2} at {1}',
+                            'Examples are invalid. See warnings below.')
+    """
+
+    def batches():
+        batch = []
+        total = 0
+        for path, name in walk(**kwargs):
+            if path.endswith(".json") and include(path, name):
+                size = os.path.getsize(path)
+                if size > max_size:
+                    yield [path]
+                    continue
+                if total + size > max_size:
+                    yield batch
+                    batch = []
+                    total = 0
+                batch.append(path)
+                total += size
+        if batch:
+            yield batch
+
+    yield from _spend(_validate_in_pool(_get_data_errors, batches(), schema, format_checker, jobs), budget)
+
+
+def _validate_in_pool(function, batches, schema, format_checker, jobs):
+    if jobs == 1:
+        _initialize_validator(schema, format_checker)
+        for batch in batches:
+            yield from function(batch)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415 # import on first use
+
+    executor = ProcessPoolExecutor(jobs, initializer=_initialize_validator, initargs=(schema, format_checker))
+    try:
+        for errors in executor.map(function, batches):
+            yield from errors
+    finally:
+        # If the caller stops iterating, don't wait for the remaining files.
+        executor.shutdown(cancel_futures=True)
+
+
+def _initialize_validator(schema, format_checker):
+    _validator_options["validator"] = get_validator(schema, format_checker=format_checker)
+
+
+def _iter_errors(paths):
+    for path in paths:
+        try:
+            with open(path) as f:
+                data = jsonlib.loads(f.read())
+        except (OSError, UnicodeDecodeError, jsonlib.JSONDecodeError):
+            continue
+
+        for error in _validator_options["validator"].iter_errors(data):
+            yield path, error
+
+
+def _get_schema_errors(paths):
+    return [
+        (path, error.message, "/".join(map(str, error.absolute_schema_path))) for path, error in _iter_errors(paths)
+    ]
+
+
+def _get_data_errors(paths):
+    return [
+        (
+            path,
+            "".join(f"/{str(part).replace('~', '~0').replace('/', '~1')}" for part in error.absolute_path),
+            error.message,
+        )
+        for path, error in _iter_errors(paths)
+    ]
+
+
+def validate_letter_case(*args, property_exceptions=(), definition_exceptions=(), memo=None, state=None, budget=None):
     """
     Warn and return the number of errors relating to the letter case of properties and definitions.
 
@@ -248,6 +616,12 @@ def validate_letter_case(*args, property_exceptions=(), definition_exceptions=()
     :type property_exceptions: list, tuple or set
     :param definition_exceptions: definition names to ignore
     :type definition_exceptions: list, tuple or set
+    :param memo: a memo of results on identical subtrees
+    :type memo: SubtreeMemo
+    :param state: the results of the previous call, to re-run the check only on changed parts of the file
+    :type state: IncrementalState
+    :param budget: the maximum number of errors, across checks, after which to stop traversing
+    :type budget: ErrorBudget
     :returns: the number of errors
     :rtype: int
     """
@@ -270,10 +644,11 @@ def validate_letter_case(*args, property_exceptions=(), definition_exceptions=()
 
         return errors
 
-    return _traverse(block)(*args)
+    check = ("letter_case", frozenset(property_exceptions), frozenset(definition_exceptions))
+    return _traverse(block, memo, check, state, budget)(*args)
 
 
-def validate_metadata_presence(*args, allow_missing=_false):
+def validate_metadata_presence(*args, allow_missing=_false, memo=None, state=None, budget=None):
     """
     Warn and return the number of errors relating to metadata in a JSON Schema.
 
@@ -282,7 +657,14 @@ def validate_metadata_presence(*args, allow_missing=_false):
     properties, unless it has a `"$ref" <https://tools.ietf.org/html/draft-pbryan-zyp-json-ref-03>`__ property.
 
     :param function allow_missing: a method that accepts a JSON Pointer, and returns whether the field is allowed to
-                                   not have a "title" or "description" property
+                                   not have a "title" or "description" property, like a
+                                   :class:`~jscc.testing.util.PointerMatcher`
+    :param memo: a memo of results on identical subtrees
+    :type memo: SubtreeMemo
+    :param state: the results of the previous call, to re-run the check only on changed parts of the file
+    :type state: IncrementalState
+    :param budget: the maximum number of errors, across checks, after which to stop traversing
+    :type budget: ErrorBudget
     :returns: the number of errors
     :rtype: int
     """
@@ -320,11 +702,20 @@ def validate_metadata_presence(*args, allow_missing=_false):
 
         return errors
 
-    return _traverse(block)(*args)
+    return _traverse(block, memo if allow_missing is _false else None, ("metadata_presence",), state, budget)(*args)
 
 
 def validate_null_type(
-    path, data, pointer="", *, no_null=False, expect_null=True, allow_object_null=(), allow_no_null=(), allow_null=()
+    path,
+    data,
+    pointer="",
+    *,
+    no_null=False,
+    expect_null=True,
+    allow_object_null=(),
+    allow_no_null=(),
+    allow_null=(),
+    budget=None,
 ):
     """
     Warn and return the number of errors relating to non-nullable optional fields and nullable required fields.
@@ -339,63 +730,85 @@ def validate_null_type(
     :param bool no_null: whether the standard disallows "null" in the "type" property of any field
     :param bool expect_null: whether the field, in context, is expected to have "null" in its "type" property
     :param allow_object_null: JSON Pointers of fields whose "type" properties are allowed to include "object", "null"
-    :type allow_object_null: list, tuple or set
+    :type allow_object_null: list, tuple, set or :class:`~jscc.testing.util.PointerMatcher`
     :param allow_no_null: JSON Pointers of fields whose "type" properties are allowed to exclude "null"
-    :type allow_no_null: list, tuple or set
+    :type allow_no_null: list, tuple, set or :class:`~jscc.testing.util.PointerMatcher`
     :param allow_null: JSON Pointers of fields whose "type" properties are allowed to include "null"
-    :type allow_null: list, tuple or set
+    :type allow_null: list, tuple, set or :class:`~jscc.testing.util.PointerMatcher`
+    :param budget: the maximum number of errors, across checks, after which to stop traversing
+    :type budget: ErrorBudget
     :returns: the number of errors
     :rtype: int
     """
+    if budget is not None and budget.exhausted:
+        budget.truncated = True
+        return 0
+
     errors = 0
 
-    kwargs = {
-        "allow_object_null": allow_object_null,
-        "allow_no_null": allow_no_null,
-        "allow_null": allow_null,
-    }
+    # Traverse iteratively, to not reach the recursion limit on deeply nested data.
+    # The IDs of the objects being traversed, to break cycles in dereferenced data.
+    ancestors = set()
+    # Each item is a value, its JSON Pointer and whether it's expected to be nullable, or the ID of an object to leave.
+    stack = [(data, pointer, expect_null, None)]
+    # The number of errors spent from the budget.
+    spent = 0
 
-    if no_null:
-        expect_null = False
-
-    if isinstance(data, list):
-        for index, item in enumerate(data):
-            errors += validate_null_type(path, item, pointer=f"{pointer}/{index}", **kwargs, no_null=no_null)
-    elif isinstance(data, dict):
-        if "type" in data and pointer:
-            null_in_type = "null" in data["type"]
-            null_not_allowed = "object" in data["type"] or is_array_of_objects(data)
-            # Objects and arrays of objects mustn't be nullable.
-            if null_in_type and null_not_allowed and pointer not in allow_object_null:
-                errors += 1
-                warn(f'{path} includes "null" in "type" at {pointer}', NullTypeWarning)
-            elif expect_null:
-                if not null_in_type and not null_not_allowed and pointer not in allow_no_null:
+    while stack:
+        data, pointer, expect_null, leave = stack.pop()
+
+        if leave is not None:
+            ancestors.discard(leave)
+            continue
+
+        if no_null:
+            expect_null = False
+
+        if isinstance(data, list):
+            stack.extend((data[index], f"{pointer}/{index}", True, None) for index in reversed(range(len(data))))
+        elif isinstance(data, dict) and id(data) not in ancestors:
+            if "type" in data and pointer:
+                null_in_type = "null" in data["type"]
+                null_not_allowed = "object" in data["type"] or is_array_of_objects(data)
+                # Objects and arrays of objects mustn't be nullable.
+                if null_in_type and null_not_allowed and pointer not in allow_object_null:
                     errors += 1
-                    warn(f'{path} is missing "null" in "type" at {pointer}', NullTypeWarning)
-            elif null_in_type and pointer not in allow_null:
-                errors += 1
-                warn(f'{path} includes "null" in "type" at {pointer}', NullTypeWarning)
+                    warn(f'{path} includes "null" in "type" at {pointer}', NullTypeWarning)
+                elif expect_null:
+                    if not null_in_type and not null_not_allowed and pointer not in allow_no_null:
+                        errors += 1
+                        warn(f'{path} is missing "null" in "type" at {pointer}', NullTypeWarning)
+                elif null_in_type and pointer not in allow_null:
+                    errors += 1
+                    warn(f'{path} includes "null" in "type" at {pointer}', NullTypeWarning)
+
+                if budget is not None and errors > spent:
+                    exhausted = budget.spend(errors - spent)
+                    spent = errors
+                    if exhausted:
+                        budget.truncated = True
+                        break
 
-        required = data.get("required", [])
+            required = data.get("required", [])
 
-        for key, value in data.items():
-            if key in {"properties", "definitions", "$defs"}:
-                for k, v in value.items():
-                    expect_null = key == "properties" and k not in required
-                    errors += validate_null_type(
-                        path, v, pointer=f"{pointer}/{key}/{k}", **kwargs, no_null=no_null, expect_null=expect_null
-                    )
-            else:
-                v = data["items"] if key == "items" else value
-                errors += validate_null_type(
-                    path, v, pointer=f"{pointer}/{key}", **kwargs, no_null=no_null, expect_null=key != "items"
-                )
+            children = []
+            for key, value in data.items():
+                if key in {"properties", "definitions", "$defs"}:
+                    for k, v in value.items():
+                        children.append((v, f"{pointer}/{key}/{k}", key == "properties" and k not in required, None))
+                else:
+                    children.append((value, f"{pointer}/{key}", key != "items", None))
+
+            ancestors.add(id(data))
+            stack.append((None, None, None, id(data)))
+            stack.extend(reversed(children))
 
     return errors
 
 
-def validate_codelist_enum(*args, fallback=None, allow_enum=_false, allow_missing=_false):
+def validate_codelist_enum(
+    *args, fallback=None, allow_enum=_false, allow_missing=_false, cache=None, memo=None, state=None, budget=None
+):
     """
     Warn and return the number of errors relating to codelists in a JSON Schema.
 
@@ -412,15 +825,44 @@ def validate_codelist_enum(*args, fallback=None, allow_enum=_false, allow_missin
 
     :param dict fallback: a dict in which keys are JSON Pointers and values are lists of "type" values
     :param function allow_enum: a method that accepts a JSON Pointer, and returns whether the field is allowed to set
-                                the "enum" property without setting the "codelist" property
+                                the "enum" property without setting the "codelist" property, like a
+                                :class:`~jscc.testing.util.PointerMatcher`
     :param function allow_missing: a method that accepts a codelist name, and returns whether the codelist file
                                    is allowed to be missing from the repository
+    :param cache: a cache from which to read parsed codelists
+    :type cache: jscc.testing.filesystem.CodelistCache
+    :param memo: a memo of results on identical subtrees
+    :type memo: SubtreeMemo
+    :param state: the results of the previous call, to re-run the check only on changed parts of the file
+    :type state: IncrementalState
+    :param budget: the maximum number of errors, across checks, after which to stop traversing
+    :type budget: ErrorBudget
     :returns: the number of errors
     :rtype: int
     """
     if not fallback:
         fallback = {}
 
+    # The first codelist with each name, if a `cache` is provided.
+    codelists = None
+
+    def find(name):
+        nonlocal codelists
+
+        # Without a `cache`, the CSVs are parsed again for each closed codelist.
+        if cache is None:
+            for _, csvname, _, _, codelist in walk_csv_data(columnar=True):
+                if csvname == name:
+                    return codelist
+            return None
+
+        # With a `cache`, the directory is walked once, not once for each closed codelist.
+        if codelists is None:
+            codelists = {}
+            for _, csvname, _, _, codelist in walk_csv_data(columnar=True, cache=cache):
+                codelists.setdefault(csvname, codelist)
+        return codelists.get(name)
+
     def block(path, data, pointer):
         errors = 0
 
@@ -447,34 +889,30 @@ def validate_codelist_enum(*args, fallback=None, allow_enum=_false, allow_missin
                 else:
                     actual = set(data["items"]["enum"])
 
-                # It'd be faster to cache the CSVs, but most extensions have only one closed codelist.
-                for _, csvname, _, _, rows in walk_csv_data():
-                    # The codelist's CSV file must exist.
-                    if csvname == data["codelist"]:
-                        if actual:
-                            expected = {row["Code"] for row in rows}
-                            if "string" in types and "null" in types:
-                                expected.add(None)
-
-                            if actual != expected:
-                                added, removed = difference(actual, expected)
-
-                                errors += 1
-                                warn(
-                                    f"{path}: {pointer}/enum doesn't match codelists/{data['codelist']}"
-                                    f"{added}{removed}",
-                                    CodelistEnumWarning,
-                                )
-                        break
-                else:
-                    # When validating a patched schema, the above code will fail to find the core codelists in an
-                    # extension, but that is not an error. This overlaps with `validate_schema_codelists_match`.
-                    if not allow_missing(data["codelist"]):
-                        errors += 1
-                        warn(
-                            f"{path} refers to missing file codelists/{data['codelist']} at {pointer}",
-                            CodelistEnumWarning,
-                        )
+                codelist = find(data["codelist"])
+                # The codelist's CSV file must exist.
+                if codelist is not None:
+                    if actual:
+                        expected = set(codelist.codes)
+                        if "string" in types and "null" in types:
+                            expected.add(None)
+
+                        if actual != expected:
+                            added, removed = difference(actual, expected)
+
+                            errors += 1
+                            warn(
+                                f"{path}: {pointer}/enum doesn't match codelists/{data['codelist']}{added}{removed}",
+                                CodelistEnumWarning,
+                            )
+                # When validating a patched schema, the above code will fail to find the core codelists in an
+                # extension, but that is not an error. This overlaps with `validate_schema_codelists_match`.
+                elif not allow_missing(data["codelist"]):
+                    errors += 1
+                    warn(
+                        f"{path} refers to missing file codelists/{data['codelist']} at {pointer}",
+                        CodelistEnumWarning,
+                    )
         elif ("enum" in data and parent != "items") or ("items" in data and "enum" in data["items"]):
             if not allow_enum(pointer):
                 errors += 1
@@ -482,17 +920,25 @@ def validate_codelist_enum(*args, fallback=None, allow_enum=_false, allow_missin
 
         return errors
 
-    return _traverse(block)(*args)
+    if fallback or allow_enum is not _false:
+        memo = None
+    return _traverse(block, memo, ("codelist_enum", allow_missing, os.getcwd()), state, budget)(*args)
 
 
-def validate_array_items(*args, allow_invalid=()):
+def validate_array_items(*args, allow_invalid=(), memo=None, state=None, budget=None):
     """
     Warn and return the number of errors relating to array fields without an "items" property.
 
     A field whose "type" property includes "array" must set the "items" property.
 
     :param allow_invalid: JSON Pointers of fields whose "items" properties are allowed to be missing
-    :type allow_invalid: list, tuple or set
+    :type allow_invalid: list, tuple, set or :class:`~jscc.testing.util.PointerMatcher`
+    :param memo: a memo of results on identical subtrees
+    :type memo: SubtreeMemo
+    :param state: the results of the previous call, to re-run the check only on changed parts of the file
+    :type state: IncrementalState
+    :param budget: the maximum number of errors, across checks, after which to stop traversing
+    :type budget: ErrorBudget
     :returns: the number of errors
     :rtype: int
     """
@@ -506,10 +952,10 @@ def validate_array_items(*args, allow_invalid=()):
 
         return errors
 
-    return _traverse(block)(*args)
+    return _traverse(block, None if allow_invalid else memo, ("array_items",), state, budget)(*args)
 
 
-def validate_items_type(*args, additional_valid_types=None, allow_invalid=()):
+def validate_items_type(*args, additional_valid_types=None, allow_invalid=(), memo=None, state=None, budget=None):
     """
     Warn and return the number of errors relating to the "type" property under an "items" property.
 
@@ -519,7 +965,13 @@ def validate_items_type(*args, additional_valid_types=None, allow_invalid=()):
     :param additional_valid_types: additional valid values of the "type" property under an "items" property
     :type additional_valid_types: list, tuple or set
     :param allow_invalid: JSON Pointers of fields whose "type" properties are allowed to include invalid values
-    :type allow_invalid: list, tuple or set
+    :type allow_invalid: list, tuple, set or :class:`~jscc.testing.util.PointerMatcher`
+    :param memo: a memo of results on identical subtrees
+    :type memo: SubtreeMemo
+    :param state: the results of the previous call, to re-run the check only on changed parts of the file
+    :type state: IncrementalState
+    :param budget: the maximum number of errors, across checks, after which to stop traversing
+    :type budget: ErrorBudget
     :returns: the number of errors
     :rtype: int
     """
@@ -544,17 +996,25 @@ def validate_items_type(*args, additional_valid_types=None, allow_invalid=()):
 
         return errors
 
-    return _traverse(block)(*args)
+    return _traverse(block, None if allow_invalid else memo, ("items_type", frozenset(valid_types)), state, budget)(
+        *args
+    )
 
 
-def validate_deep_properties(*args, allow_deep=()):
+def validate_deep_properties(*args, allow_deep=(), memo=None, state=None, budget=None):
     """
     Warn and return the number of errors relating to deep objects.
 
     The schema must use "definitions" or "$defs" instead of nesting "properties".
 
     :param allow_deep: JSON Pointers of fields to ignore
-    :type allow_deep: list, tuple or set
+    :type allow_deep: list, tuple, set or :class:`~jscc.testing.util.PointerMatcher`
+    :param memo: a memo of results on identical subtrees
+    :type memo: SubtreeMemo
+    :param state: the results of the previous call, to re-run the check only on changed parts of the file
+    :type state: IncrementalState
+    :param budget: the maximum number of errors, across checks, after which to stop traversing
+    :type budget: ErrorBudget
     :returns: the number of errors
     :rtype: int
     """
@@ -576,10 +1036,10 @@ def validate_deep_properties(*args, allow_deep=()):
 
         return errors
 
-    return _traverse(block)(*args)
+    return _traverse(block, None if allow_deep else memo, ("deep_properties",), state, budget)(*args)
 
 
-def validate_object_id(*args, allow_missing=_false, allow_optional=()):
+def validate_object_id(*args, allow_missing=_false, allow_optional=(), budget=None):
     """
     Warn and return the number of errors relating to objects within arrays lacking "id" fields.
 
@@ -587,9 +1047,11 @@ def validate_object_id(*args, allow_missing=_false, allow_optional=()):
     ``null``, then the object fields under it must have an "id" field, and the "id" field must be required.
 
     :param function allow_missing: a method that accepts a JSON Pointer, and returns whether the field is allowed to
-                                   not have an "id" field
+                                   not have an "id" field, like a :class:`~jscc.testing.util.PointerMatcher`
     :param allow_optional: JSON Pointers of fields whose "id" field is allowed to be optional
-    :type allow_optional: list, tuple or set
+    :type allow_optional: list, tuple, set or :class:`~jscc.testing.util.PointerMatcher`
+    :param budget: the maximum number of errors, across checks, after which to stop traversing
+    :type budget: ErrorBudget
     :returns: the number of errors
     :rtype: int
     """
@@ -624,10 +1086,10 @@ def validate_object_id(*args, allow_missing=_false, allow_optional=()):
 
         return errors
 
-    return _traverse(block)(*args)
+    return _traverse(block, budget=budget)(*args)
 
 
-def validate_merge_properties(*args):
+def validate_merge_properties(*args, memo=None, state=None, budget=None):
     """
     Warn and return the number of errors relating to missing or extra merge properties.
 
@@ -636,6 +1098,12 @@ def validate_merge_properties(*args):
 
     See https://standard.open-contracting.org/1.1/en/schema/merging/#whole-list-merge
 
+    :param memo: a memo of results on identical subtrees
+    :type memo: SubtreeMemo
+    :param state: the results of the previous call, to re-run the check only on changed parts of the file
+    :type state: IncrementalState
+    :param budget: the maximum number of errors, across checks, after which to stop traversing
+    :type budget: ErrorBudget
     :returns: the number of errors
     :rtype: int
     """
@@ -662,28 +1130,49 @@ def validate_merge_properties(*args):
 
         return errors
 
-    return _traverse(block)(*args)
+    return _traverse(block, memo, ("merge_properties",), state, budget)(*args)
 
 
-def validate_ref(path, data, **kwargs):
+def validate_ref(path, data, *, budget=None, **kwargs):
     """
     Warn and return ``1`` if not all ``$ref``'erences can be resolved.
 
     Uses the `jsonref <https://jsonref.readthedocs.io/>`__ module.
 
+    :param budget: the maximum number of errors, across checks
+    :type budget: ErrorBudget
     :returns: ``0`` or ``1``
     :rtype: int
     """
+    import jsonref  # noqa: PLC0415 # import on first use
+
+    if budget is not None and budget.exhausted:
+        budget.truncated = True
+        return 0
+
     try:
         jsonref.replace_refs(data, lazy_load=False, **kwargs)
     except jsonref.JsonRefError as e:
         warn(f"{path} has {e.message} at {'/'.join(map(str, e.path))}", RefWarning)
+        if budget is not None:
+            budget.spend()
         return 1
 
     return 0
 
 
-def validate_schema_codelists_match(path, data, top, *, is_extension=False, is_profile=False, external_codelists=None):
+def validate_schema_codelists_match(
+    path,  # noqa: ARG001 # consistency
+    data,
+    top,
+    *,
+    is_extension=False,
+    is_profile=False,
+    external_codelists=None,
+    cache=None,
+    registry=None,
+    budget=None,
+):
     """
     Warn and return the number of errors relating to mismatches between codelist files and codelist references from
     JSON Schema.
@@ -692,77 +1181,689 @@ def validate_schema_codelists_match(path, data, top, *, is_extension=False, is_p
     must match codelist filenames or be in :code:`external_codelists`. All codelist filenames that start with ``+`` or
     ``-`` must be in :code:`external_codelists`.
 
+    If :code:`registry` is provided, the codelist files and external codelists are read from it, instead of from
+    :code:`top` and :code:`external_codelists`.
+
     :param str top: the file path of the directory tree
     :param bool is_extension: whether the repository is an extension or a profile
     :param bool is_profile: whether the repository is a profile (a collection of extensions)
     :param external_codelists: names of codelists defined by the standard
     :type external_codelists: list, tuple or set
+    :param cache: a cache from which to read parsed codelists
+    :type cache: jscc.testing.filesystem.CodelistCache
+    :param registry: the codelists in the directory tree
+    :type registry: CodelistRegistry
+    :param budget: the maximum number of errors, across checks
+    :type budget: ErrorBudget
     :returns: the number of errors
     :rtype: int
     """
-    if not external_codelists:
-        external_codelists = set()
+    if budget is not None and budget.exhausted:
+        budget.truncated = True
+        return 0
+
+    if registry is None:
+        parent = CodelistRegistry(external_codelists or ())
+        registry = CodelistRegistry.from_directory(
+            top, is_extension=is_extension, is_profile=is_profile, parent=parent, cache=cache
+        )
+        external = is_extension
+    else:
+        external = True
 
-    def collect_codelist_values(path, data, pointer=""):
-        """Collect ``codelist`` values from JSON Schema."""
-        codelists = set()
+    errors = 0
 
-        if isinstance(data, list):
-            for index, item in enumerate(data):
-                codelists.update(collect_codelist_values(path, item, pointer=f"{pointer}/{index}"))
-        elif isinstance(data, dict):
-            if "codelist" in data:
-                codelists.add(data["codelist"])
+    unused_codelists, missing_codelists, unknown_patches = registry.match(collect_codelists(data), external=external)
 
-            for key, value in data.items():
-                codelists.update(collect_codelist_values(path, value, pointer=f"{pointer}/{key}"))
+    for csvname in unknown_patches:
+        errors += 1
+        warn(f"{csvname} patches unknown codelist", SchemaCodelistsMatchWarning)
+    if unused_codelists:
+        errors += 1
+        warn(f"unused codelists: {', '.join(sorted(unused_codelists))}", SchemaCodelistsMatchWarning)
+    if missing_codelists:
+        errors += 1
+        warn(f"missing codelists: {', '.join(sorted(missing_codelists))}", SchemaCodelistsMatchWarning)
+
+    if budget is not None:
+        budget.spend(errors)
 
-        return codelists
+    return errors
+
+
+def validate_codelists(*, base_codelists=None, cache=None, budget=None, **kwargs):
+    """
+    Warn and return the number of errors in the contents of codelist files.
+
+    All codelist files in the directory tree are read into columns, in one pass, and then checked with set operations:
+
+    -  A codelist must not have duplicate codes.
+    -  A codelist must not have blank codes.
+    -  Codelist files with the same name must have consistent headers. Copies in the same language, like in
+       ``patched`` directories, must have the same headers, in the same order. Translations, which share no headers
+       other than the code header, must have the same number of headers, with the code header in the same position.
+    -  A codelist file whose name starts with ``+`` must not add codes that the codelist already has, and one whose
+       name starts with ``-`` must not remove codes that the codelist doesn't have.
+
+    A ``+`` or ``-`` codelist file patches the codelist in :code:`base_codelists`, or else the codelist files with the
+    same name in the directory tree. If neither has the codelist, the patch isn't checked. (See
+    :meth:`~jscc.testing.checks.validate_schema_codelists_match`.)
 
+    Only CSV files with a "Code" or "code" header are checked (see :meth:`jscc.schema.is_codelist`).
+
+    Accepts the same keyword arguments as :meth:`jscc.testing.filesystem.walk`.
+
+    :param dict base_codelists: the codes of codelists defined by the standard, in which keys are codelist names and
+                                values are codes, like :attr:`jscc.schema.Codelist.codes`
+    :param cache: a cache from which to read parsed codelists
+    :type cache: jscc.testing.filesystem.CodelistCache
+    :param budget: the maximum number of errors, across checks
+    :type budget: ErrorBudget
+    :returns: the number of errors
+    :rtype: int
+    """
     errors = 0
+    for message in _spend(_codelist_errors(base_codelists or {}, cache, kwargs), budget):
+        errors += 1
+        warn(message, CodelistsWarning)
+    return errors
+
+
+def _codelist_errors(base_codelists, cache, kwargs):
+    files = defaultdict(list)
+    for csvpath, csvname, _, fieldnames, codelist in walk_csv_data(columnar=True, cache=cache, **kwargs):
+        if is_codelist(fieldnames):
+            files[csvname].append((csvpath, codelist))
+
+    # Walk order depends on the filesystem. Sort, so that warnings (and the errors within a budget) are deterministic.
+    for csvname, codelists in sorted(files.items()):
+        codelists.sort(key=lambda item: item[0])
+        first_path, first = codelists[0]
+        for csvpath, codelist in codelists:
+            column = codelist.column(_code_header(codelist.fieldnames))
+            blank = {code for code in codelist.codes if not code or code.isspace()}
+
+            # The codes are indexed without duplicates, so only count the codes of codelists that have duplicates.
+            if len(codelist.codes) < len(column):
+                duplicates = [code for code, count in Counter(column).items() if count > 1 and code not in blank]
+                if duplicates:
+                    yield f"{csvpath} has duplicate codes: {', '.join(duplicates)}"
+            if blank:
+                yield f"{csvpath} has blank codes"
+            if not _consistent_headers(codelist.fieldnames, first.fieldnames):
+                yield (
+                    f"{csvpath} has headers {', '.join(codelist.fieldnames)}, but {first_path} has headers "
+                    f"{', '.join(first.fieldnames)}"
+                )
 
-    codelist_files = set()
-    for csvpath, csvname, _, fieldnames, _ in walk_csv_data(top=top):
-        parts = csvpath.replace(top, "").split(os.sep)  # maybe inelegant way to isolate consolidated extension
-        # Take all codelists in extensions, all codelists in core, and non-core codelists in profiles.
-        if is_codelist(fieldnames) and ((is_extension and not is_profile) or "patched" not in parts):
             if csvname.startswith(("+", "-")):
-                if csvname[1:] not in external_codelists:
-                    errors += 1
-                    warn(f"{csvname} patches unknown codelist", SchemaCodelistsMatchWarning)
+                basename = csvname[1:]
+                if basename in base_codelists:
+                    codes = base_codelists[basename]
+                elif basename in files:
+                    codes = set().union(*(other.codes for _, other in files[basename]))
+                else:
+                    continue
+                patch = codelist.codes - blank
+                if csvname[0] == "+":
+                    if existing := patch.intersection(codes):
+                        yield f"{csvpath} adds codes that {basename} already has: {', '.join(sorted(existing))}"
+                elif missing := patch.difference(codes):
+                    yield f"{csvpath} removes codes that {basename} doesn't have: {', '.join(sorted(missing))}"
+
+
+def _code_header(fieldnames):
+    return "Code" if "Code" in fieldnames else "code"
+
+
+def _consistent_headers(fieldnames, other):
+    if fieldnames == other:
+        return True
+    # Translations share no headers other than the code header. Compare their structure only.
+    if set(fieldnames) & set(other) - {"Code", "code"}:
+        return False
+    return len(fieldnames) == len(other) and fieldnames.index(_code_header(fieldnames)) == other.index(
+        _code_header(other)
+    )
+
+
+class CodelistRegistry:
+    """
+    The names of the codelist files in a directory tree, layered on the codelists of other directory trees.
+
+    For example, a profile's registry is layered on its extensions' registries, which are layered on the standard's
+    registry. Build the standard's registry once, and reuse it as the parent of each extension's registry::
+
+        core = CodelistRegistry.from_directory("standard/schema")
+        for top in extensions:
+            registry = CodelistRegistry.from_directory(top, is_extension=True, parent=core)
+            validate_schema_codelists_match(path, data, top, registry=registry)
+    """
+
+    def __init__(self, codelists=(), patches=(), parent=None):
+        """
+        Initialize the registry.
+
+        :param codelists: names of codelist files that don't start with ``+`` or ``-``
+        :type codelists: list, tuple or set
+        :param patches: names of codelist files that start with ``+`` or ``-``
+        :type patches: list, tuple or set
+        :param CodelistRegistry parent: the registry on which this registry is layered
+        """
+        #: The names of codelist files in this layer that don't start with ``+`` or ``-``.
+        self.codelists = frozenset(codelists)
+        #: The names of codelist files in this layer that start with ``+`` or ``-``.
+        self.patches = frozenset(patches)
+        #: The registry on which this registry is layered.
+        self.parent = parent
+        #: The names of codelists in this layer and all lower layers.
+        self.all_codelists = self.codelists | parent.all_codelists if parent else self.codelists
+
+    @classmethod
+    def from_directory(cls, top, *, is_extension=False, is_profile=False, parent=None, cache=None):
+        """
+        Build a registry from the codelist files in a directory tree.
+
+        :param str top: the file path of the directory tree
+        :param bool is_extension: whether the repository is an extension or a profile
+        :param bool is_profile: whether the repository is a profile (a collection of extensions)
+        :param CodelistRegistry parent: the registry on which to layer this registry
+        :param cache: a cache from which to read parsed codelists
+        :type cache: jscc.testing.filesystem.CodelistCache
+        """
+        codelists = set()
+        patches = set()
+
+        for csvpath, csvname, _, fieldnames, _ in walk_csv_data(top=top, columnar=True, cache=cache):
+            parts = csvpath.replace(top, "").split(os.sep)  # maybe inelegant way to isolate consolidated extension
+            # Take all codelists in extensions, all codelists in core, and non-core codelists in profiles.
+            if is_codelist(fieldnames) and ((is_extension and not is_profile) or "patched" not in parts):
+                if csvname.startswith(("+", "-")):
+                    patches.add(csvname)
+                else:
+                    codelists.add(csvname)
+
+        return cls(codelists, patches, parent)
+
+    def match(self, references, *, external=True):
+        """
+        Return the unused codelists, the missing codelists, and the patches of unknown codelists.
+
+        :param set references: the codelist references from JSON Schema
+        :param bool external: whether codelist references can match codelists in lower layers
+        :returns: the unused codelists, missing codelists and unknown patches, as sets
+        :rtype: tuple
+        """
+        available = self.all_codelists if external else self.codelists
+        lower = self.parent.all_codelists if self.parent else frozenset()
+
+        return (
+            self.codelists - references,
+            references - available,
+            {csvname for csvname in self.patches if csvname[1:] not in lower},
+        )
+
+
+class SubtreeMemo:
+    """
+    A memo of the results of ``validate_*`` methods on subtrees of JSON Schema, to reuse the results on identical
+    subtrees, like the definitions that a standard's schema shares with its extensions' schemas and patched schemas.
+
+    Pass the same memo to each call:
+
+    .. code-block:: python
+
+       memo = SubtreeMemo()
+       for path, data in schemas:
+           errors += validate_letter_case(path, data, memo=memo)
+           errors += validate_metadata_presence(path, data, memo=memo)
+
+    Subtrees are identified structurally, bottom-up, such that identical subtrees have the same identifier, across
+    files. A check's result on a subtree is reused if the subtree is identical, and if its JSON Pointer ends in the
+    same two reference tokens (on which the checks depend). The warnings are re-issued with the new file path and JSON
+    Pointer. While a check runs, its warnings are deferred until it returns.
+
+    The memo isn't used by a check if its results depend on the full JSON Pointer: that is, if it is given an
+    ``allow_*`` argument or ``fallback`` argument that accepts JSON Pointers. The memo isn't used by
+    :meth:`~jscc.testing.checks.validate_object_id`, whose results depend on the references in the dereferenced data.
+    :meth:`~jscc.testing.checks.validate_codelist_enum` reuses results in the same working directory only. Use a new
+    memo if codelist files change.
+    """
+
+    def __init__(self):
+        """Initialize the memo."""
+        #: The number of subtrees whose results were reused.
+        self.hits = 0
+        #: The number of subtrees whose results were computed.
+        self.misses = 0
+        # The identifier of each structure. A dict's or list's structure is a tuple of its children's identifiers.
+        self._structures = {}
+        # The errors and warnings (without the JSON Pointer of the subtree) of each check key, JSON Pointer context and
+        # subtree identifier.
+        self._results = {}
+        # The state of the current call.
+        self._nodes = {}
+        self._records = None
+
+    def _identify(self, data):
+        """Identify the structure of each object, unless it is recursive, iteratively."""
+        if not isinstance(data, (dict, list)):
+            return
+
+        # The identifier of each dict and list, or None if it is recursive.
+        identifiers = {}
+        # The IDs of the dicts and lists being identified.
+        ancestors = set()
+        stack = [(data, False)]
+
+        while stack:
+            data, leaving = stack.pop()
+
+            if not leaving:
+                if id(data) in identifiers or id(data) in ancestors:
+                    continue
+                ancestors.add(id(data))
+                stack.append((data, True))
+                values = data.values() if isinstance(data, dict) else data
+                stack.extend((value, False) for value in values if isinstance(value, (dict, list)))
+                continue
+
+            ancestors.discard(id(data))
+            children = []
+            for key, value in data.items() if isinstance(data, dict) else enumerate(data):
+                if isinstance(value, (dict, list)):
+                    # A value that is still being identified is an ancestor.
+                    child = identifiers.get(id(value))
+                    if child is None:
+                        break
+                else:
+                    # The type distinguishes values that are equal in Python, like 1, 1.0 and True.
+                    child = self._structures.setdefault((type(value), value), len(self._structures))
+                children.append((key, child) if isinstance(data, dict) else child)
             else:
-                codelist_files.add(csvname)
+                structure = (dict if isinstance(data, dict) else list, tuple(children))
+                identifier = self._structures.setdefault(structure, len(self._structures))
+                identifiers[id(data)] = identifier
+                if isinstance(data, dict):
+                    self._nodes[id(data)] = identifier
+                continue
 
-    codelist_values = collect_codelist_values(path, data)
-    all_codelist_files = codelist_files | external_codelists if is_extension else codelist_files
+            identifiers[id(data)] = None
 
-    unused_codelists = [codelist for codelist in codelist_files if codelist not in codelist_values]
-    missing_codelists = [codelist for codelist in codelist_values if codelist not in all_codelist_files]
+    def wrap(self, method):
+        """Return a method that identifies subtrees and records warnings, before traversing the data."""
 
-    if unused_codelists:
-        errors += 1
-        warn(f"unused codelists: {', '.join(sorted(unused_codelists))}", SchemaCodelistsMatchWarning)
-    if missing_codelists:
-        errors += 1
-        warn(f"missing codelists: {', '.join(sorted(missing_codelists))}", SchemaCodelistsMatchWarning)
+        def wrapper(path, data, pointer=""):
+            self._nodes = {}
+            self._identify(data)
 
-    return errors
+            records = []
+            try:
+                with warnings.catch_warnings(record=True) as records:
+                    warnings.simplefilter("always")
+                    self._records = records
+                    return method(path, data, pointer)
+            finally:
+                self._nodes = {}
+                self._records = None
+                for record in records:
+                    warn(record.message, record.category)
+
+        return wrapper
+
+    def _key(self, key, data, pointer):
+        identifier = self._nodes.get(id(data))
+        if identifier is None:
+            return None
+        parts = pointer.split("/")
+        context = tuple(parts[-2:]) if len(parts) > 2 else (None, parts[-1])
+        return (key, context, identifier)
+
+    def start(self):
+        """Return the number of warnings recorded so far."""
+        return len(self._records)
+
+    def replay(self, key, path, data, pointer):
+        """Re-issue the warnings for a subtree, and return the number of errors, or ``None`` if not memoized."""
+        memo_key = self._key(key, data, pointer)
+        result = self._results.get(memo_key) if memo_key else None
+        if result is None:
+            return None
+
+        errors, messages = result
+        for head, rest, category in messages:
+            warn(f"{path}{head}{pointer}{rest}", category)
+
+        self.hits += 1
+        if instrument.hooks:
+            instrument.emit("cache", "memo", path, hits=1)
+        return errors
 
+    def record(self, key, path, data, pointer, errors, start):
+        """Memoize the number of errors and the warnings for a subtree."""
+        memo_key = self._key(key, data, pointer)
+        if memo_key is None:
+            return
+
+        messages = []
+        for record in self._records[start:]:
+            message = str(record.message)
+            # All messages from these checks start with the file path.
+            if not message.startswith(path):
+                return
+            # Split the message at the subtree's JSON Pointer, which follows a space, to replace only that prefix of
+            # the pointer in the message, and not any repetition of its tokens.
+            head, separator, rest = message[len(path) :].partition(f" {pointer}")
+            if not separator:
+                return
+            messages.append((f"{head} ", rest, record.category))
+
+        self._results[memo_key] = (errors, messages)
+        self.misses += 1
+        if instrument.hooks:
+            instrument.emit("cache", "memo", path, misses=1)
+
+
+class IncrementalState:
+    """
+    The results of a ``validate_*`` method on a file, to re-run the method only on the parts of the file that changed.
 
-def _traverse(block):
-    def method(path, data, pointer="", ancestors=()):
-        errors = 0
+    Pass the same state to each call of the same method on the same file:
 
-        if isinstance(data, list):
-            for index, item in enumerate(data):
-                errors += method(path, item, pointer=f"{pointer}/{index}", ancestors=ancestors)
-        elif isinstance(data, dict) and id(data) not in ancestors:
-            ancestors = (*ancestors, id(data))
-            errors += block(path, data, pointer)
+    .. code-block:: python
 
-            for key, value in data.items():
-                errors += method(path, value, pointer=f"{pointer}/{key}", ancestors=ancestors)
+       state = IncrementalState()
+       validate_letter_case(path, data, state=state)
+       # ... the file changes ...
+       validate_letter_case(path, new_data, state=state)
+
+    On each later call, the JSON Pointers of changed values are found with :meth:`jscc.schema.diff`. The method is
+    re-run on the objects at, below and above the changed values, and the results for all other objects are reused,
+    including their warnings. Unchanged subtrees aren't traversed.
+
+    The method is re-run on all objects if the method, file path or JSON Pointer differs from the previous call. Use a
+    new state if the method's other arguments change, or if codelist files change. If a state is given, the ``memo``
+    argument is ignored. While the method runs, its warnings are deferred until it returns.
+    """
+
+    def __init__(self):
+        """Initialize the state."""
+        #: The number of objects whose results were reused in the last call.
+        self.reused = 0
+        #: The number of objects on which the method was run in the last call.
+        self.visited = 0
+        self._key = None
+        self._data = None
+        # The JSON Pointer, number of errors, warnings, and number of objects in the subtree of each object, in order.
+        self._entries = []
+        self._index = {}
+
+    def wrap(self, block, check):
+        """Return a method that traverses the data, re-running the block on objects related to changed values."""
+
+        def method(path, data, pointer=""):
+            key = (check, path, pointer)
+            if key == self._key:
+                changed = set(diff(self._data, data, pointer))
+                affected = set()
+                for changed_pointer in changed:
+                    # Add the changed pointer and its ancestors.
+                    ancestor = changed_pointer
+                    while ancestor not in affected:
+                        affected.add(ancestor)
+                        ancestor = ancestor.rpartition("/")[0]
+            else:
+                changed = None
+                affected = None
+
+            previous = self._entries
+            index = self._index
+            entries = []
+            self.reused = 0
+            self.visited = 0
+
+            def traverse(data, pointer):
+                errors = 0
+                # The IDs of the dicts being traversed, to break cycles in dereferenced schemas.
+                ancestors = set()
+                # Iterate, instead of recursing, to not exceed Python's recursion limit on deeply nested schemas. Each
+                # item is a value to traverse, or the position of an object whose subtree ends.
+                stack = [(data, pointer, False)]
+
+                while stack:
+                    item = stack.pop()
+                    if isinstance(item, int):
+                        pointer, block_errors, messages, identifier = entries[item]
+                        entries[item] = (pointer, block_errors, messages, len(entries) - item)
+                        ancestors.discard(identifier)
+                        continue
+
+                    data, pointer, inside = item
+                    if isinstance(data, list):
+                        inside = inside or changed is None or pointer in changed
+                        stack.extend((data[i], f"{pointer}/{i}", inside) for i in reversed(range(len(data))))
+                    elif isinstance(data, dict) and id(data) not in ancestors:
+                        inside = inside or changed is None or pointer in changed
+                        if not inside and pointer not in affected and pointer in index:
+                            start = index[pointer]
+                            subtree = previous[start : start + previous[start][3]]
+                            for _, block_errors, messages, _ in subtree:
+                                errors += block_errors
+                                for message, category in messages:
+                                    warn(message, category)
+                            entries.extend(subtree)
+                            self.reused += len(subtree)
+                            continue
+
+                        start = len(records)
+                        block_errors = block(path, data, pointer)
+                        messages = [(str(record.message), record.category) for record in records[start:]]
+                        self.visited += 1
+                        errors += block_errors
+
+                        # The entry's last item is set to the size of the subtree, when leaving the object.
+                        stack.append(len(entries))
+                        entries.append((pointer, block_errors, messages, id(data)))
+                        ancestors.add(id(data))
+                        stack.extend((value, f"{pointer}/{key}", inside) for key, value in reversed(data.items()))
+
+                return errors
+
+            records = []
+            try:
+                with warnings.catch_warnings(record=True) as records:
+                    warnings.simplefilter("always")
+                    errors = traverse(data, pointer)
+            finally:
+                for record in records:
+                    warn(record.message, record.category)
+
+            self._key = key
+            self._data = _copy(data)
+            self._entries = entries
+            self._index = {}
+            duplicates = set()
+            for i, entry in enumerate(entries):
+                # Keys can contain "/", so different objects can have the same JSON Pointer.
+                if entry[0] in self._index:
+                    duplicates.add(entry[0])
+                self._index[entry[0]] = i
+            for duplicate in duplicates:
+                del self._index[duplicate]
+
+            return errors
+
+        return method
+
+
+def _copy(data):
+    # Like copy.deepcopy() for JSON data, but iteratively, to not exceed Python's recursion limit.
+    if not isinstance(data, (dict, list)):
+        return data
+
+    # The copy of each dict and list, to preserve shared and recursive values.
+    copies = {id(data): {} if isinstance(data, dict) else []}
+    stack = [data]
+    while stack:
+        original = stack.pop()
+        copy = copies[id(original)]
+        for key, value in original.items() if isinstance(original, dict) else enumerate(original):
+            if isinstance(value, (dict, list)):
+                if id(value) not in copies:
+                    copies[id(value)] = {} if isinstance(value, dict) else []
+                    stack.append(value)
+                value = copies[id(value)]  # noqa: PLW2901
+            if isinstance(copy, dict):
+                copy[key] = value
+            else:
+                copy.append(value)
+
+    return copies[id(data)]
+
+
+class ErrorBudget:
+    """
+    A maximum number of errors, after which the ``get_*`` and ``validate_*`` methods stop, to fail fast.
+
+    Pass the same budget to each call, to cap the number of errors across checks and files, or a new budget to each
+    call, to cap the number of errors per check:
+
+    .. code-block:: python
+
+       budget = ErrorBudget(1)
+       for path, data in schemas:
+           validate_letter_case(path, data, budget=budget)
+           validate_metadata_presence(path, data, budget=budget)
+       if budget.truncated:
+           print("Stopped at the first error.")
+
+    ``validate_*`` methods stop traversing after the object at which the budget is exhausted, and ``get_*`` methods
+    stop walking directories and reading files. If the budget is already exhausted, they return immediately. Either
+    way, :attr:`truncated` is set to ``True``.
+
+    If a budget is given, the ``memo`` and ``state`` arguments are ignored, because they re-issue the warnings of
+    reused subtrees all at once, and because the results of a truncated call are incomplete.
+    """
+
+    def __init__(self, limit):
+        """
+        Initialize the budget.
+
+        :param int limit: the maximum number of errors
+        """
+        #: The maximum number of errors.
+        self.limit = limit
+        #: The number of errors so far.
+        self.errors = 0
+        #: Whether a method stopped, because the budget was exhausted.
+        self.truncated = False
+
+    @property
+    def exhausted(self):
+        """Whether the maximum number of errors is reached."""
+        return self.errors >= self.limit
+
+    def spend(self, errors=1):
+        """
+        Add errors, and return whether the budget is exhausted.
+
+        :param int errors: the number of errors
+        :rtype: bool
+        """
+        self.errors += errors
+        return self.errors >= self.limit
+
+
+def _spend(results, budget):
+    # Stop iterating, and thus walking directories and reading files, once the budget is exhausted.
+    if budget is None:
+        yield from results
+        return
+
+    if budget.exhausted:
+        budget.truncated = True
+        return
+
+    for result in results:
+        exhausted = budget.spend()
+        yield result
+        if exhausted:
+            budget.truncated = True
+            return
+
+
+def _traverse(block, memo=None, check=None, state=None, budget=None):
+    # The name of the validate_* method, for instrumentation.
+    name = block.__qualname__.partition(".")[0]
+
+    # A memo or state would re-issue all the warnings of a reused subtree at once, exceeding the budget. Also, the
+    # results of a truncated call are incomplete.
+    if budget is not None:
+        memo = None
+        state = None
+
+    # Traverse iteratively, to not reach the recursion limit on deeply nested data.
+    def method(path, data, pointer=""):
+        if budget is not None and budget.exhausted:
+            budget.truncated = True
+            return 0
+
+        start_time = time.perf_counter() if instrument.hooks else None
+        errors = 0
+        nodes = 0
+        # The IDs of the objects being traversed, to break cycles in dereferenced data.
+        ancestors = set()
+        # Each item is a value and its JSON Pointer, or an object being left, with the number of errors and warnings
+        # before the object was entered.
+        stack = [(data, pointer, None)]
+
+        while stack:
+            data, pointer, before = stack.pop()
+
+            if before is not None:
+                ancestors.discard(id(data))
+                if before[1] is not None:
+                    memo.record(check, path, data, pointer, errors - before[0], before[1])
+            elif isinstance(data, list):
+                stack.extend(
+                    (data[index], f"{pointer}/{index}", None)
+                    for index in reversed(range(len(data)))
+                    if isinstance(data[index], (dict, list))
+                )
+            elif isinstance(data, dict) and id(data) not in ancestors:
+                start = None
+                if memo is not None and pointer:
+                    cached = memo.replay(check, path, data, pointer)
+                    if cached is not None:
+                        errors += cached
+                        continue
+                    start = memo.start()
+
+                nodes += 1
+                ancestors.add(id(data))
+                # Keep the JSON Pointer only if needed, to not keep the JSON Pointers of all ancestors in memory.
+                stack.append((data, pointer if start is not None else None, (errors, start)))
+                block_errors = block(path, data, pointer)
+                errors += block_errors
+                if budget is not None and block_errors and budget.spend(block_errors):
+                    budget.truncated = True
+                    break
+
+                # Skip scalars, to not build their JSON Pointers.
+                stack.extend(
+                    (value, f"{pointer}/{key}", None)
+                    for key, value in reversed(data.items())
+                    if isinstance(value, (dict, list))
+                )
+
+        if start_time is not None:
+            seconds = time.perf_counter() - start_time
+            instrument.emit("traverse", name, path, seconds=seconds, calls=1, nodes=nodes, errors=errors)
 
         return errors
 
-    return method
+    if state is not None:
+        return state.wrap(block, check)
+    if memo is None:
+        return method
+    return memo.wrap(method)
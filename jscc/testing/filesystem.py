@@ -1,10 +1,17 @@
 """Methods for interacting with or reasoning about the filesystem."""
 
 import csv
-import json
+import hashlib
+import marshal
 import os
+import subprocess
+import sys
+import tempfile
 from fnmatch import fnmatch
-from io import StringIO
+from io import BytesIO, StringIO, TextIOWrapper
+
+from jscc import instrument, jsonlib
+from jscc.schema import Codelist
 
 untracked = {
     "*.egg-info",
@@ -17,17 +24,47 @@ untracked = {
 }
 
 
-def walk(top=None, excluded=(".git", ".ve", ".venv", "_static", "build", "fixtures")):
+def walk(top=None, excluded=(".git", ".ve", ".venv", "_static", "build", "fixtures"), *, git=False, source=None):
     """
     Walk a directory tree, and yield tuples consistent of a file path and file name, excluding Git files and
     third-party files under virtual environment, static, build, and test fixture directories (by default).
 
+    If :code:`git` is ``True`` and the directory tree is in a Git repository, list the files in Git's index, instead of
+    walking the filesystem. This excludes untracked and ignored files (per ``.gitignore``), and is faster on large
+    trees. Outside a Git repository, or if the ``git`` command isn't available, walk the filesystem as usual.
+
+    If :code:`source` is set, list its files instead, like the files of a Git revision. :code:`top` and :code:`git`
+    are ignored.
+
     :param str top: the file path of the directory tree
     :param tuple exclude: override the directories to exclude
+    :param bool git: whether to list the files in Git's index
+    :param source: the files to list, instead of the filesystem's
+    :type source: GitTree
     """
+    files = _walk(top, excluded, git) if source is None else source.walk(excluded)
+    if instrument.hooks:
+        yield from instrument.iterate("walk", None, files, "files")
+    else:
+        yield from files
+
+
+def _walk(top, excluded, git):
     if not top:
         top = os.getcwd()
 
+    if git:
+        paths = git_ls_files(top)
+        if paths is not None:
+            for path in paths:
+                parts = path.split("/")
+                if not any(part in excluded for part in parts[:-1]):
+                    filepath = os.path.join(top, *parts)
+                    # Skip files that are deleted from the working tree, and submodules.
+                    if os.path.isfile(filepath):
+                        yield filepath, parts[-1]
+            return
+
     for root, dirs, files in os.walk(top):
         for directory in excluded:
             if directory in dirs:
@@ -36,44 +73,435 @@ def walk(top=None, excluded=(".git", ".ve", ".venv", "_static", "build", "fixtur
             yield os.path.join(root, name), name
 
 
+def git_ls_files(top):
+    """
+    Return the paths, relative to the directory tree and separated by ``/``, of the files in Git's index.
+
+    :param str top: the file path of the directory tree
+    :returns: the file paths, or ``None`` if the directory tree isn't in a Git repository
+    :rtype: list
+    """
+    try:
+        process = subprocess.run(
+            ["git", "ls-files", "-z", "--cached"],  # noqa: S607
+            cwd=top,
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return os.fsdecode(process.stdout).split("\0")[:-1]
+
+
 def walk_json_data(patch=None, **kwargs):
     """
     Walk a directory tree, and yield tuples consisting of a file path, file name, text content, and JSON data.
 
-    Accepts the same keyword arguments as :meth:`jscc.testing.filesystem.walk`.
+    Accepts the same keyword arguments as :meth:`jscc.testing.filesystem.walk`. If :code:`source` is set, and
+    :code:`patch` isn't, the JSON data is shared with other revisions that have identical files: don't modify it.
 
     :param function patch: a method that accepts text, and returns modified text.
     """
+    source = kwargs.get("source")
     for path, name in walk(**kwargs):
         if path.endswith(".json"):
-            with open(path) as f:
-                text = f.read()
-                if text:
-                    if patch:
-                        text = patch(text)
-                    try:
-                        yield path, name, text, json.loads(text)
-                    except json.JSONDecodeError:
-                        continue
+            if source is None or patch:
+                result = _read_json(path, source, patch)
+            else:
+                result = source.parse(path, "json", _read_json, path, source, None)
+            if result is not None:
+                yield path, name, *result
+
+
+def _read_json(path, source, patch):
+    with instrument.timed("parse", "json", path) as metrics:
+        text = _read_text(path, source)
+        if metrics is not None:
+            metrics.update(files=1, bytes=len(text))
+        if not text:
+            return None
+        if patch:
+            text = patch(text)
+        try:
+            data = jsonlib.loads(text)
+        except jsonlib.JSONDecodeError:
+            return None
+    return text, data
+
+
+def _read_text(path, source, newline=None):
+    if source is not None:
+        return source.read_text(path, newline=newline)
+    with open(path, newline=newline) as f:
+        return f.read()
 
 
-def walk_csv_data(**kwargs):
+def walk_csv_data(*, columnar=False, cache=None, **kwargs):
     """
     Walk a directory tree, and yield tuples consisting of a file path, file name, text content, fieldnames, and rows.
 
-    Accepts the same keyword arguments as :meth:`jscc.testing.filesystem.walk`.
+    If :code:`columnar` is ``True``, the text content is ``None`` and the rows are a :class:`jscc.schema.Codelist`,
+    which is read in a single pass and uses less memory than a list of dicts.
+
+    Accepts the same keyword arguments as :meth:`jscc.testing.filesystem.walk`. If :code:`source` is set, the
+    :code:`cache` is ignored, and the rows are shared with other revisions that have identical files: don't modify
+    them.
+
+    :param bool columnar: whether to yield a :class:`jscc.schema.Codelist` instead of the text content and row dicts
+    :param cache: a cache from which to read parsed codelists (implies :code:`columnar`)
+    :type cache: CodelistCache
     """
+    source = kwargs.get("source")
     for path, name in walk(**kwargs):
         if path.endswith(".csv"):
-            with open(path, newline="") as f:
-                text = f.read()
-                reader = csv.DictReader(StringIO(text))
-                try:
-                    fieldnames = reader.fieldnames
-                    rows = list(reader)
-                    yield (path, name, text, fieldnames, rows)
-                except csv.Error:
-                    continue
+            try:
+                if cache is not None or columnar:
+                    if source is not None:
+                        codelist = source.parse(path, "codelist", _read_codelist, path, source)
+                    elif cache is not None:
+                        codelist = cache.get(path)
+                    else:
+                        codelist = _read_codelist(path)
+                    result = (None, codelist.fieldnames, codelist)
+                elif source is not None:
+                    result = source.parse(path, "csv", _read_csv, path, source)
+                else:
+                    result = _read_csv(path, source)
+            except csv.Error:
+                continue
+            yield (path, name, *result)
+
+
+def _read_csv(path, source):
+    with instrument.timed("parse", "csv", path) as metrics:
+        text = _read_text(path, source, newline="")
+        if metrics is not None:
+            metrics.update(files=1, bytes=len(text))
+        reader = csv.DictReader(StringIO(text))
+        return text, reader.fieldnames, list(reader)
+
+
+def _read_codelist(path, source=None):
+    if source is not None:
+        with instrument.timed("parse", "csv", path) as metrics:
+            blob = source.read(path)
+            codelist = Codelist.read(TextIOWrapper(BytesIO(blob), newline=""))
+            if metrics is not None:
+                metrics.update(files=1, bytes=len(blob))
+        return codelist
+
+    with instrument.timed("parse", "csv", path) as metrics, open(path, newline="") as f:
+        codelist = Codelist.read(f)
+        if metrics is not None:
+            metrics.update(files=1, bytes=os.fstat(f.fileno()).st_size)
+    return codelist
+
+
+class CodelistCache:
+    """
+    A cache of parsed codelists, keyed by file path, and invalidated if a file's modification time or size changes.
+
+    Codelists are cached in memory. If :code:`directory` is set, they are also cached on disk, in the compact binary
+    format of the ``marshal`` module, so that other processes (like pytest-xdist workers or later CI runs) can skip
+    parsing the CSV files.
+
+    .. attention:: Malformed files in the directory can crash the interpreter. Don't use a directory that untrusted
+       users can write to.
+    """
+
+    def __init__(self, directory=None):
+        """
+        Initialize the cache.
+
+        :param str directory: the directory in which to cache parsed codelists on disk
+        """
+        #: The directory in which to cache parsed codelists on disk, if any.
+        self.directory = directory
+        #: The number of codelists read from the cache.
+        self.hits = 0
+        #: The number of codelists parsed from CSV files.
+        self.misses = 0
+
+        self._memory = {}
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, path):
+        """
+        Return the parsed codelist at the path.
+
+        :param str path: the file path of a CSV file
+        :rtype: jscc.schema.Codelist
+        :raises csv.Error: if the CSV is invalid
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+
+        entry = self._memory.get(path)
+        if entry and entry[0] == key:
+            self.hits += 1
+            if instrument.hooks:
+                instrument.emit("cache", "codelists", path, hits=1)
+            return entry[1]
+
+        codelist = self._load(key)
+        if codelist is None:
+            self.misses += 1
+            if instrument.hooks:
+                instrument.emit("cache", "codelists", path, misses=1)
+            codelist = _read_codelist(path)
+            self._dump(key, codelist)
+        else:
+            self.hits += 1
+            if instrument.hooks:
+                instrument.emit("cache", "codelists", path, hits=1)
+
+        self._memory[path] = (key, codelist)
+        return codelist
+
+    def _filename(self, path):
+        # marshal's format can change between Python versions.
+        digest = hashlib.sha256(path.encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.{sys.implementation.cache_tag}")
+
+    def _load(self, key):
+        if not self.directory:
+            return None
+
+        try:
+            with open(self._filename(key[0]), "rb") as f:
+                stored_key, fieldnames, columns = marshal.load(f)  # noqa: S302 # the cache directory is trusted
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        if stored_key != key:
+            return None
+        return Codelist(list(fieldnames), list(columns))
+
+    def _dump(self, key, codelist):
+        if not self.directory:
+            return
+
+        data = marshal.dumps((key, tuple(codelist.fieldnames), tuple(codelist.columns)))
+        # Write atomically, in case another process is reading or writing the same file.
+        with tempfile.NamedTemporaryFile(dir=self.directory, delete=False) as f:
+            f.write(data)
+        os.replace(f.name, self._filename(key[0]))
+
+
+class GitObjectStore:
+    """
+    A Git repository's object store, to read the files of any revision without checking it out.
+
+    Files are read by a single, long-lived ``git cat-file --batch`` process. Parsed files are shared between revisions
+    by object ID, such that checking another revision parses only the files that differ.
+
+    .. code-block:: python
+
+       with GitObjectStore() as store:
+           for revision in ("main", "1.1.5", "pull-request"):
+               for path, name, text, data in walk_json_data(source=store.tree(revision)):
+                   ...
+
+    .. attention:: Parsed files are shared, not copied. Don't modify them.
+    """
+
+    def __init__(self, top=None):
+        """
+        Initialize the store.
+
+        :param str top: the file path of a directory in the repository (default the current working directory)
+        """
+        #: The file path of a directory in the repository.
+        self.top = top or os.getcwd()
+        #: The number of files whose parsed results were reused.
+        self.hits = 0
+        #: The number of files that were parsed.
+        self.misses = 0
+
+        self._process = None
+        self._parsed = {}
+
+    def tree(self, revision="HEAD"):
+        """
+        Return the files of a revision, under the store's directory.
+
+        :param str revision: a Git revision, like a branch, tag or commit
+        :rtype: GitTree
+        :raises subprocess.CalledProcessError: if the revision isn't in the repository
+        """
+        return GitTree(self, revision)
+
+    def read(self, oid):
+        """
+        Return the content of a blob.
+
+        :param str oid: the blob's object ID
+        :rtype: bytes
+        :raises KeyError: if the object isn't in the repository
+        """
+        if self._process is None:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],  # noqa: S607
+                cwd=self.top,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+
+        self._process.stdin.write(f"{oid}\n".encode())
+        self._process.stdin.flush()
+        # "<oid> <type> <size>" or "<oid> missing"
+        header = self._process.stdout.readline().split()
+        if len(header) != 3:
+            raise KeyError(oid)
+        content = self._process.stdout.read(int(header[2]))
+        self._process.stdout.read(1)  # newline
+        return content
+
+    def parse(self, oid, kind, function, *args, path=None):
+        """
+        Return the result of a function on a file, reusing the result for the same object ID and kind.
+
+        :param str oid: the file's object ID
+        :param str kind: the kind of result, like "json"
+        :param function: a method that accepts the arguments, and returns the result
+        :param str path: the file path, for instrumentation
+        """
+        key = (oid, kind)
+        if key in self._parsed:
+            self.hits += 1
+            if instrument.hooks:
+                instrument.emit("cache", "blobs", path, hits=1)
+            return self._parsed[key]
+
+        result = function(*args)
+        self._parsed[key] = result
+        self.misses += 1
+        if instrument.hooks:
+            instrument.emit("cache", "blobs", path, misses=1)
+        return result
+
+    def close(self):
+        """Stop the ``git cat-file`` process."""
+        if self._process is not None:
+            self._process.stdin.close()
+            self._process.wait()
+            self._process.stdout.close()
+            self._process = None
+
+    def __enter__(self):
+        """Return the store."""
+        return self
+
+    def __exit__(self, *args):
+        """Stop the ``git cat-file`` process."""
+        self.close()
+
+
+class GitTree:
+    """
+    The files of a Git revision, under a :class:`~jscc.testing.filesystem.GitObjectStore`'s directory.
+
+    Pass it as the ``source`` argument of :meth:`~jscc.testing.filesystem.walk`,
+    :meth:`~jscc.testing.filesystem.walk_json_data`, :meth:`~jscc.testing.filesystem.walk_csv_data`,
+    :meth:`~jscc.testing.checks.get_empty_files`, :meth:`~jscc.testing.checks.get_misindented_files` or
+    :meth:`~jscc.testing.checks.get_invalid_json_files`, to read the revision's files instead of the working tree's.
+    File paths are the same as in the working tree. Symbolic links and submodules are skipped.
+    """
+
+    def __init__(self, store, revision):
+        """
+        List the files of the revision, with ``git ls-tree``.
+
+        :param store: the object store
+        :type store: GitObjectStore
+        :param str revision: a Git revision, like a branch, tag or commit
+        :raises subprocess.CalledProcessError: if the revision isn't in the repository
+        """
+        #: The object store.
+        self.store = store
+        #: The Git revision.
+        self.revision = revision
+
+        # The revision is never interpreted as an option.
+        process = subprocess.run(  # noqa: S603
+            ["git", "ls-tree", "-r", "-z", "--long", "--end-of-options", revision],  # noqa: S607
+            cwd=store.top,
+            capture_output=True,
+            check=True,
+        )
+
+        # The path, relative to the store's directory, of each file, and its object ID and size.
+        self._files = []
+        self._oids = {}
+        self._sizes = {}
+        for entry in os.fsdecode(process.stdout).split("\0")[:-1]:
+            # "<mode> SP <type> SP <object> SP+ <size> TAB <file>"
+            info, _, relpath = entry.partition("\t")
+            mode, kind, oid, size = info.split()
+            if kind == "blob" and mode != "120000":
+                path = os.path.join(store.top, *relpath.split("/"))
+                self._files.append(relpath)
+                self._oids[path] = oid
+                self._sizes[path] = int(size)
+
+    def walk(self, excluded):
+        """
+        Yield tuples consisting of a file path and file name, like :meth:`~jscc.testing.filesystem.walk`.
+
+        :param tuple excluded: the directories to exclude
+        """
+        for relpath, path in zip(self._files, self._oids, strict=True):
+            parts = relpath.split("/")
+            if not any(part in excluded for part in parts[:-1]):
+                yield path, parts[-1]
+
+    def oid(self, path):
+        """
+        :param str path: a file path
+        :returns: the file's object ID
+        :rtype: str
+        """
+        return self._oids[path]
+
+    def size(self, path):
+        """
+        :param str path: a file path
+        :returns: the file's size in bytes, without reading it
+        :rtype: int
+        """
+        return self._sizes[path]
+
+    def read(self, path):
+        """
+        :param str path: a file path
+        :returns: the file's content
+        :rtype: bytes
+        """
+        return self.store.read(self._oids[path])
+
+    def read_text(self, path, newline=None):
+        """
+        Return the file's content, decoded like a file opened in text mode.
+
+        :param str path: a file path
+        :param str newline: like the ``newline`` argument of :func:`open`
+        :rtype: str
+        """
+        return TextIOWrapper(BytesIO(self.read(path)), newline=newline).read()
+
+    def parse(self, path, kind, function, *args):
+        """
+        Return the result of a function on a file, reusing the result for identical files in other revisions.
+
+        :param str path: a file path
+        :param str kind: the kind of result, like "json"
+        :param function: a method that accepts the arguments, and returns the result
+        """
+        return self.store.parse(self._oids[path], kind, function, *args, path=path)
 
 
 def tracked(path):
@@ -0,0 +1,165 @@
+"""
+A pytest plugin that provides session-scoped fixtures, to share parsed files and caches between tests.
+
+Enable the plugin in ``conftest.py``:
+
+.. code-block:: python
+
+   pytest_plugins = ["jscc.testing.plugin"]
+
+Then, use the ``jscc_schema_path`` fixture to generate one test per JSON Schema file:
+
+.. code-block:: python
+
+   def test_schema_valid(jscc_schema_path, jscc_schemas, jscc_http_get_json):
+       metaschema = jscc_http_get_json("http://json-schema.org/draft-04/schema")
+       validate_json_schema(jscc_schema_path, jscc_schemas[jscc_schema_path], metaschema)
+
+Tests are generated in decreasing order of file size, so that the costliest tests start first. Under ``pytest -n``
+(pytest-xdist), tests are also assigned to as many groups as there are workers, such that each group has a similar
+total file size. Use ``--dist loadgroup`` to run each group on a different worker.
+
+Configure the plugin in ``pytest.ini`` or ``pyproject.toml``:
+
+``jscc_git``
+  Whether to list the files in Git's index (see :meth:`jscc.testing.filesystem.walk`).
+``jscc_prefetch``
+  URLs of JSON files to fetch once per session, before starting any workers.
+
+Responses from ``jscc_http_get_json`` and parsed codelists are cached in pytest's cache directory, which is shared by
+workers and by later sessions. Run ``pytest --cache-clear`` to clear it.
+"""
+
+import hashlib
+import os
+
+import jsonref
+import pytest
+
+from jscc.schema import is_json_schema
+from jscc.testing.checks import CodelistRegistry
+from jscc.testing.filesystem import CodelistCache, walk_csv_data, walk_json_data
+from jscc.testing.util import http_get
+
+
+def pytest_addoption(parser):
+    """Add the plugin's configuration options."""
+    parser.addini("jscc_git", "whether to list the files in Git's index", type="bool", default=False)
+    parser.addini("jscc_prefetch", "URLs of JSON files to fetch once per session", type="linelist", default=[])
+
+
+def pytest_sessionstart(session):
+    """Warm the shared caches, if this process isn't a pytest-xdist worker."""
+    config = session.config
+    if hasattr(config, "workerinput"):
+        return
+
+    for url in config.getini("jscc_prefetch"):
+        _http_get_json(config, url)
+
+    # Parse the codelists once, instead of once per worker.
+    if getattr(config.option, "numprocesses", None):
+        for _ in walk_csv_data(cache=_codelist_cache(config), git=config.getini("jscc_git")):
+            pass
+
+
+def pytest_generate_tests(metafunc):
+    """Parametrize the ``jscc_schema_path`` fixture with the file paths of JSON Schema files."""
+    if "jscc_schema_path" not in metafunc.fixturenames:
+        return
+
+    config = metafunc.config
+    paths = sorted(
+        (path for path, _, _, data in _corpus(config) if isinstance(data, dict) and is_json_schema(data)),
+        key=lambda path: (-os.path.getsize(path), path),
+    )
+
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput:
+        groups = shard({path: os.path.getsize(path) for path in paths}, workerinput["workercount"])
+        parameters = [pytest.param(path, marks=pytest.mark.xdist_group(f"jscc{groups[path]}")) for path in paths]
+    else:
+        parameters = paths
+
+    metafunc.parametrize("jscc_schema_path", parameters, ids=[os.path.relpath(path) for path in paths])
+
+
+def shard(costs, n):
+    """
+    Assign items to ``n`` groups, such that each group has a similar total cost.
+
+    Items are assigned in decreasing order of cost, each to the group with the lowest total cost, so far.
+
+    :param dict costs: the cost of each item
+    :param int n: the number of groups
+    :returns: the group number of each item
+    :rtype: dict
+    """
+    totals = [0] * n
+    groups = {}
+    for item, cost in sorted(costs.items(), key=lambda pair: (-pair[1], pair[0])):
+        group = totals.index(min(totals))
+        groups[item] = group
+        totals[group] += cost
+    return groups
+
+
+def _corpus(config):
+    if not hasattr(config, "_jscc_corpus"):
+        config._jscc_corpus = list(walk_json_data(git=config.getini("jscc_git")))  # noqa: SLF001
+    return config._jscc_corpus  # noqa: SLF001
+
+
+def _codelist_cache(config):
+    if not hasattr(config, "_jscc_codelist_cache"):
+        config._jscc_codelist_cache = CodelistCache(str(config.cache.mkdir("jscc-codelists")))  # noqa: SLF001
+    return config._jscc_codelist_cache  # noqa: SLF001
+
+
+def _http_get_json(config, url):
+    key = f"jscc/http/{hashlib.sha256(url.encode()).hexdigest()}"
+    value = config.cache.get(key, None)
+    if value is None:
+        value = http_get(url).json()
+        config.cache.set(key, value)
+    return value
+
+
+@pytest.fixture(scope="session")
+def jscc_corpus(pytestconfig):
+    """Return the file path, file name, text content and JSON data of each JSON file."""
+    return _corpus(pytestconfig)
+
+
+@pytest.fixture(scope="session")
+def jscc_schemas(jscc_corpus):
+    """Return a dict in which keys are the file paths of JSON Schema files, and values are JSON data."""
+    return {path: data for path, _, _, data in jscc_corpus if isinstance(data, dict) and is_json_schema(data)}
+
+
+@pytest.fixture(scope="session")
+def jscc_dereferenced(jscc_schemas):
+    """Return a dict in which keys are the file paths of JSON Schema files, and values are dereferenced JSON data."""
+    return {path: jsonref.replace_refs(data) for path, data in jscc_schemas.items()}
+
+
+@pytest.fixture(scope="session")
+def jscc_codelist_cache(pytestconfig):
+    """Return a cache of parsed codelists, shared by workers and by later sessions."""
+    return _codelist_cache(pytestconfig)
+
+
+@pytest.fixture(scope="session")
+def jscc_codelists(jscc_codelist_cache):
+    """Return the codelists in the current working directory, as a :class:`~jscc.testing.checks.CodelistRegistry`."""
+    return CodelistRegistry.from_directory(os.getcwd(), cache=jscc_codelist_cache)
+
+
+@pytest.fixture(scope="session")
+def jscc_http_get_json(pytestconfig):
+    """Return a method that accepts a URL, and returns the parsed JSON response, shared by workers and sessions."""
+
+    def get(url):
+        return _http_get_json(pytestconfig, url)
+
+    return get
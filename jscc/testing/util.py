@@ -1,9 +1,16 @@
 """Miscellaneous methods, mainly used by other repositories."""
 
+import hashlib
+import json
 import warnings
 from functools import lru_cache
 
-import requests
+from jscc import instrument
+
+_validators = {}
+
+# The reference token in a pattern of a PointerMatcher that matches any one reference token.
+_WILDCARD = "*"
 
 
 @lru_cache
@@ -15,7 +22,12 @@ def http_get(url):
 
     :param str url: the URL to request
     """
-    response = requests.get(url)  # noqa: S113
+    import requests  # noqa: PLC0415 # slow to import
+
+    with instrument.timed("http_get", url) as metrics:
+        response = requests.get(url)  # noqa: S113
+        if metrics is not None:
+            metrics["bytes"] = len(response.content)
     response.raise_for_status()
     return response
 
@@ -29,11 +41,48 @@ def http_head(url):
 
     :param str url: the URL to request
     """
+    import requests  # noqa: PLC0415 # slow to import
+
     response = requests.head(url)  # noqa: S113
     response.raise_for_status()
     return response
 
 
+def get_validator(schema, *, format_checker=True):
+    """
+    Return a `jsonschema <https://python-jsonschema.readthedocs.io/>`__ validator for the schema, memoized by the
+    schema's content and the format checker configuration.
+
+    The validator class is determined by the schema's ``$schema`` property, defaulting to Draft 4. Remote references
+    are retrieved with :meth:`jscc.testing.util.http_get`.
+
+    .. attention:: This function is vulnerable to server-side request forgery (SSRF), if the schema is untrusted.
+
+    :param dict schema: the schema against which to validate, like a metaschema
+    :param bool format_checker: whether to check the ``format`` property
+    """
+    from jsonschema import FormatChecker  # noqa: PLC0415 # optional dependency
+    from jsonschema.validators import Draft4Validator, validator_for  # noqa: PLC0415 # optional dependency
+    from referencing import Registry  # noqa: PLC0415 # optional dependency
+
+    key = (hashlib.sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest(), format_checker)
+    if key not in _validators:
+        cls = validator_for(schema, default=Draft4Validator)
+        _validators[key] = cls(
+            schema,
+            format_checker=FormatChecker() if format_checker else None,
+            registry=Registry(retrieve=_retrieve),
+        )
+    return _validators[key]
+
+
+def _retrieve(uri):
+    from referencing import Resource  # noqa: PLC0415 # optional dependency
+    from referencing.jsonschema import DRAFT4  # noqa: PLC0415 # optional dependency
+
+    return Resource.from_contents(http_get(uri).json(), default_specification=DRAFT4)
+
+
 def difference(actual, expected):
     """
     Return strings describing the differences between actual and expected sets.
@@ -72,3 +121,83 @@ def warn_and_assert(paths, warn_message, assert_message):
         success = False
 
     assert success, assert_message  # noqa: S101 # false positive
+
+
+class PointerMatcher:
+    """
+    JSON Pointers and wildcard patterns, compiled into a set and a trie, to test whether a JSON Pointer matches in time
+    proportional to its depth, instead of to the number of patterns.
+
+    A ``*`` reference token in a pattern matches any one reference token. For example, ``/definitions/*/properties/id``
+    matches ``/definitions/Award/properties/id``. Like in the messages of the ``validate_*`` methods, reference tokens
+    aren't escaped.
+
+    A matcher can be passed as any ``allow_*`` argument of the ``validate_*`` methods, whether the argument is a
+    collection of JSON Pointers (``pointer in matcher``) or a method (``matcher(pointer)``).
+
+    .. code-block:: python
+
+       allow = PointerMatcher(["/properties/tag", "/definitions/*/properties/id"])
+       validate_null_type(path, data, allow_no_null=allow)
+       validate_metadata_presence(path, data, allow_missing=allow)
+    """
+
+    __slots__ = ("_exact", "_patterns", "_trie")
+
+    def __init__(self, patterns=()):
+        """
+        :param patterns: JSON Pointers and wildcard patterns
+        :type patterns: list, tuple or set
+        """
+        self._patterns = tuple(patterns)
+        self._exact = set()
+        # Each node is a dict in which keys are reference tokens (or the wildcard) and values are nodes. A node that
+        # ends a pattern has a None key.
+        self._trie = {}
+
+        for pattern in self._patterns:
+            tokens = pattern.split("/")
+            if _WILDCARD in tokens:
+                node = self._trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node[None] = True
+            else:
+                self._exact.add(pattern)
+
+    def __contains__(self, pointer):
+        """Return whether the JSON Pointer matches a pattern."""
+        if pointer in self._exact:
+            return True
+        if not self._trie:
+            return False
+
+        nodes = [self._trie]
+        for token in pointer.split("/"):
+            matches = []
+            for node in nodes:
+                if token in node and token != _WILDCARD:
+                    matches.append(node[token])
+                if _WILDCARD in node:
+                    matches.append(node[_WILDCARD])
+            if not matches:
+                return False
+            nodes = matches
+
+        return any(None in node for node in nodes)
+
+    def __call__(self, pointer):
+        """Return whether the JSON Pointer matches a pattern."""
+        return pointer in self
+
+    def __iter__(self):
+        """Yield the patterns."""
+        return iter(self._patterns)
+
+    def __len__(self):
+        """Return the number of patterns."""
+        return len(self._patterns)
+
+    def __repr__(self):
+        """Return the matcher's representation."""
+        return f"{type(self).__name__}({list(self._patterns)!r})"
@@ -0,0 +1,163 @@
+"""
+Watch a directory tree for changes to files, using inotify on Linux, or by polling otherwise.
+
+.. code-block:: python
+
+   from jscc.watch import watch
+
+   for paths in watch("schema"):
+       print(paths)
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# https://man7.org/linux/man-pages/man7/inotify.7.html
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_mask = IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_event = struct.Struct("iIII")
+
+
+def watch(top=None, excluded=(".git", ".ve", ".venv", "_static", "build", "fixtures"), *, interval=1.0, polling=False):
+    """
+    Watch a directory tree, and yield the paths of changed files (as a set) after each batch of changes.
+
+    A batch ends when no change occurs for 50 milliseconds (or for :code:`interval` seconds, if polling). Created,
+    modified, moved and deleted files are all reported as changed. If changes might have been missed, like if the
+    kernel's event queue overflows, ``None`` is yielded instead of a set, to indicate that any file might have changed.
+
+    On Linux, the directory tree is watched with inotify. Otherwise, or if :code:`polling` is ``True``, the
+    modification times and sizes of files are compared every :code:`interval` seconds.
+
+    Watching starts when this method is called, not when iteration starts.
+
+    :param str top: the file path of the directory tree
+    :param tuple excluded: override the directories to exclude
+    :param float interval: the number of seconds between polls
+    :param bool polling: whether to poll, even if inotify is available
+    :returns: a generator of sets of file paths
+    """
+    if not top:
+        top = os.getcwd()
+
+    if not polling:
+        inotify = _Inotify.create()
+        if inotify is not None:
+            inotify.add_tree(top, excluded)
+            return _watch_inotify(inotify, excluded)
+
+    return _watch_polling(top, excluded, interval, _snapshot(top, excluded))
+
+
+def _watch_polling(top, excluded, interval, snapshot):
+    while True:
+        time.sleep(interval)
+        current = _snapshot(top, excluded)
+        changed = {path for path in snapshot.keys() | current.keys() if snapshot.get(path) != current.get(path)}
+        snapshot = current
+        if changed:
+            yield changed
+
+
+def _snapshot(top, excluded):
+    snapshot = {}
+    for root, dirs, files in os.walk(top):
+        dirs[:] = [directory for directory in dirs if directory not in excluded]
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # deleted since listed
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def _watch_inotify(inotify, excluded):
+    try:
+        while True:
+            select.select([inotify.fd], [], [])
+            changed = set()
+            # Read events until none occur for 50 milliseconds.
+            while select.select([inotify.fd], [], [], 0.05)[0]:
+                changed = inotify.read(changed, excluded)
+            if changed is None or changed:
+                yield changed
+    finally:
+        os.close(inotify.fd)
+
+
+class _Inotify:
+    def __init__(self, libc, fd):
+        self.libc = libc
+        self.fd = fd
+        # The directory path of each watch descriptor.
+        self.directories = {}
+
+    @classmethod
+    def create(cls):
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        return cls(libc, fd)
+
+    def add_tree(self, top, excluded, changed=None):
+        for root, dirs, files in os.walk(top):
+            dirs[:] = [directory for directory in dirs if directory not in excluded]
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(root), _mask)
+            if wd >= 0:
+                self.directories[wd] = root
+            # Report the files in a directory that is created or moved into the tree.
+            if changed is not None:
+                changed.update(os.path.join(root, name) for name in files)
+
+    def read(self, changed, excluded):
+        try:
+            buffer = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, length = _event.unpack_from(buffer, offset)
+            offset += _event.size
+            name = os.fsdecode(buffer[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                changed = None
+            elif mask & IN_IGNORED:
+                self.directories.pop(wd, None)
+            elif wd in self.directories and name:
+                path = os.path.join(self.directories[wd], name)
+                if not mask & IN_ISDIR:
+                    if changed is not None:
+                        changed.add(path)
+                elif mask & (IN_CREATE | IN_MOVED_TO) and name not in excluded:
+                    self.add_tree(path, excluded, changed)
+                elif mask & IN_MOVED_FROM:
+                    changed = None  # the files in the directory are no longer in the tree
+
+        return changed
@@ -0,0 +1,94 @@
+"""Generate pathological JSON Schema and codelist trees, at parameterised sizes."""
+
+import csv
+import os
+
+
+def field(codelist=None, codes=()):
+    if codelist:
+        return {
+            "title": "Field",
+            "description": "A field with a closed codelist.",
+            "type": ["string", "null"],
+            "codelist": codelist,
+            "openCodelist": False,
+            "enum": [*codes, None],
+        }
+    return {"title": "Field", "description": "A field.", "type": ["string", "null"]}
+
+
+def deep_schema(depth):
+    """Return a schema whose "properties" are nested to the given depth."""
+    schema = field()
+    for _ in range(depth):
+        schema = {"title": "Object", "description": "An object.", "type": "object", "properties": {"child": schema}}
+    return schema
+
+
+def wide_schema(properties):
+    """Return a schema with a definition with the given number of properties."""
+    return {
+        "type": "object",
+        "definitions": {
+            "Wide": {
+                "title": "Wide",
+                "description": "A definition with many properties.",
+                "type": "object",
+                "properties": {f"field{i}": field() for i in range(properties)},
+            }
+        },
+    }
+
+
+def cyclic_schema(definitions):
+    """
+    Return a schema with the given number of definitions, each of which refers to itself, directly and from an array.
+    Use ``jsonref.replace_refs`` to create cycles.
+    """
+    return {
+        "type": "object",
+        "properties": {"first": {"$ref": "#/definitions/Definition0"}},
+        "definitions": {
+            f"Definition{i}": {
+                "title": f"Definition {i}",
+                "description": "A self-referential definition.",
+                "type": "object",
+                "properties": {
+                    "id": field(),
+                    "self": {"$ref": f"#/definitions/Definition{i}"},
+                    "children": {
+                        "title": "Children",
+                        "description": "The child objects.",
+                        "type": "array",
+                        "items": {"$ref": f"#/definitions/Definition{i}"},
+                    },
+                },
+            }
+            for i in range(definitions)
+        },
+    }
+
+
+def codes(name, count):
+    return [f"{name}{i}" for i in range(count)]
+
+
+def codelist_schema(codelists, count):
+    """Return a schema with a field for each codelist, each of which has an "enum" with the given number of codes."""
+    return {
+        "type": "object",
+        "properties": {
+            f"field{i}": field(f"codelist{i}.csv", codes(f"codelist{i}Code", count)) for i in range(codelists)
+        },
+    }
+
+
+def write_codelists(directory, codelists, count):
+    """Write the codelists of :meth:`codelist_schema` to a ``codelists`` subdirectory."""
+    os.makedirs(os.path.join(directory, "codelists"), exist_ok=True)
+    for i in range(codelists):
+        with open(os.path.join(directory, "codelists", f"codelist{i}.csv"), "w", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["Code", "Title", "Description"])
+            for code in codes(f"codelist{i}Code", count):
+                writer.writerow([code, code, ""])
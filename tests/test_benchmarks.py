@@ -0,0 +1,33 @@
+import json
+
+from benchmarks.__main__ import compare, main
+
+
+def test_main(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+
+    status = main(
+        ["-k", "traverse", "-k", "validate_letter_case", "--scale", "1", "--repeat", "1", "--save", str(baseline)]
+    )
+
+    assert status == 0
+    assert "validate_letter_case" in capsys.readouterr().out
+
+    data = json.loads(baseline.read_text())
+    data["results"]["traverse"]["1"]["time"] /= 100
+    baseline.write_text(json.dumps(data))
+
+    status = main(["-k", "traverse", "--scale", "1", "--repeat", "1", "--compare", str(baseline)])
+
+    assert status == 1
+    assert "traverse at scale 1: time" in capsys.readouterr().out
+
+
+def test_compare():
+    baseline = {"a": {"1": {"time": 1.0, "peak": 1024}}}
+
+    assert compare({"a": {"1": {"time": 1.2, "peak": 1024}}}, baseline, 0.25, 0.1) == []
+    assert compare({"b": {"1": {"time": 2.0, "peak": 1024}}}, baseline, 0.25, 0.1) == []
+    assert compare({"a": {"1": {"time": 1.0, "peak": 2048}}}, baseline, 0.25, 0.1) == [
+        "a at scale 1: peak 2.0 KiB > 1.0 KiB + 10%"
+    ]
@@ -1,4 +1,6 @@
+import codecs
 import contextlib
+import copy
 import json
 import os
 import warnings
@@ -12,8 +14,10 @@ import jscc.testing.checks
 from jscc.exceptions import (
     ArrayItemsWarning,
     CodelistEnumWarning,
+    CodelistsWarning,
     DeepPropertiesWarning,
     DuplicateKeyError,
+    InvalidJSONError,
     ItemsTypeWarning,
     LetterCaseWarning,
     MergePropertiesWarning,
@@ -25,14 +29,27 @@ from jscc.exceptions import (
     SchemaWarning,
 )
 from jscc.testing.checks import (
+    CodelistRegistry,
+    ErrorBudget,
+    IncrementalState,
+    SubtreeMemo,
+    get_data_errors,
     get_empty_files,
     get_invalid_json_files,
     get_misindented_files,
+    get_schema_errors,
+    is_empty_file,
+    validate_array_items,
     validate_codelist_enum,
+    validate_codelists,
+    validate_letter_case,
+    validate_metadata_presence,
+    validate_null_type,
     validate_object_id,
     validate_ref,
     validate_schema_codelists_match,
 )
+from jscc.testing.util import PointerMatcher
 from tests import parse, path
 
 
@@ -75,6 +92,58 @@ def test_get_empty_files():
         }
 
 
+def test_get_empty_files_bytes(tmp_path):
+    (tmp_path / "binary.png").write_bytes(b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 1000)
+    (tmp_path / "large.txt").write_bytes(b" \n" * 100000)
+    (tmp_path / "large.json").write_bytes(b" \n" * 100000 + b"[ \n ]" + b" \n" * 100000)
+    (tmp_path / "nbsp.txt").write_text("\u00a0\n")
+    (tmp_path / "number.json").write_text("0\n")
+    (tmp_path / "string.json").write_text('" "\n')
+
+    with chdir(tmp_path):
+        paths = {os.path.basename(result[0]) for result in get_empty_files()}
+
+    assert paths == {"large.json", "large.txt", "nbsp.txt"}
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"\x89PNG\r\n\x1a\n",
+        b"\xff\xd8\xff\xe0",  # JPEG
+        b"\x1f\x8b\x08",  # gzip
+        "\u00a0\u00e9".encode(),
+    ],
+)
+def test_is_empty_file_binary(monkeypatch, tmp_path, content):
+    filepath = tmp_path / "large.bin"
+    filepath.write_bytes(content + bytes(range(256)) * 1000)
+
+    opened = []
+
+    def record(*args):
+        opened.append(args)
+        return open(*args)
+
+    monkeypatch.setattr(jscc.testing.checks, "open", record, raising=False)
+
+    decoded = []
+    getincrementaldecoder = codecs.getincrementaldecoder
+
+    def decoder(encoding):
+        instance = getincrementaldecoder(encoding)()
+        decode = instance.decode
+        instance.decode = lambda data, final=False: decoded.append(len(data)) or decode(data, final)
+        return instance
+
+    monkeypatch.setattr(codecs, "getincrementaldecoder", lambda encoding: lambda: decoder(encoding))
+
+    assert not is_empty_file(str(filepath))
+    # The file isn't read in text mode, and only its first bytes are decoded.
+    assert opened == [(str(filepath), "rb")]
+    assert sum(decoded) <= 64
+
+
 def test_get_misindented_files():
     directory = os.path.realpath(path("indent")) + os.sep
     with chdir(directory):
@@ -110,6 +179,21 @@ def test_get_invalid_json_files():
         )
 
 
+def test_get_invalid_json_files_stream_size():
+    directory = os.path.realpath(path("json")) + os.sep
+    with chdir(directory):
+        results = {}
+        for result in get_invalid_json_files(stream_size=0):
+            results[result[0].replace(directory, "")] = result[1]
+
+        assert len(results) == 2
+        assert isinstance(results["duplicate-key.json"], DuplicateKeyError)
+        assert isinstance(results["invalid.json"], InvalidJSONError)
+        assert str(results["duplicate-key.json"]) == "x"
+        assert results["duplicate-key.json"].pointer == "/x"
+        assert str(results["invalid.json"]) == "Expecting property name enclosed in double quotes: byte 2, pointer ''"
+
+
 def test_validate_codelist_enum():
     directory = os.path.realpath(path("schema")) + os.sep
 
@@ -177,6 +261,198 @@ def test_validate_letter_case():
     assert errors == len(records) == 4
 
 
+def test_subtree_memo():
+    organization = {
+        "type": "object",
+        "properties": {"Name": {"type": "string"}, "id": {"title": "ID", "description": "ID", "type": "string"}},
+    }
+    core = {"definitions": {"Organization": organization}}
+    extension = {"definitions": {"Organization": copy.deepcopy(organization)}}
+    profile = {"properties": {"buyer": copy.deepcopy(organization)}}
+
+    memo = SubtreeMemo()
+    expected = []
+    actual = []
+    for name, data in (("core.json", core), ("extension.json", extension), ("profile.json", profile)):
+        for method in (validate_letter_case, validate_metadata_presence):
+            with warnings.catch_warnings(record=True) as records:
+                warnings.simplefilter("always")
+                expected.append(method(name, data))
+                expected.extend(str(record.message) for record in records)
+
+            with warnings.catch_warnings(record=True) as records:
+                warnings.simplefilter("always")
+                actual.append(method(name, data, memo=memo))
+                actual.extend(str(record.message) for record in records)
+
+    assert actual == expected
+    message = "extension.json: /definitions/Organization/properties/Name field isn't lowerCamelCase ASCII letters"
+    assert message in actual
+    assert 'profile.json is missing "title" at /properties/buyer/properties/Name' in actual
+    # The extension reuses the core's "definitions" (2 checks). The profile reuses the "Name" and "id" fields only
+    # (2 checks), because its organization's pointer ends in different reference tokens.
+    assert memo.hits == 6
+
+    # The subtree's JSON Pointer is repeated within it.
+    nested = {"x": {"q": {"definitions": {"Bad_": {}}}}}
+    memo = SubtreeMemo()
+    for data in ({"q": {"definitions": nested}}, {"r": {"q": {"definitions": copy.deepcopy(nested)}}}):
+        with warnings.catch_warnings(record=True) as expected:
+            warnings.simplefilter("always")
+            validate_letter_case("schema.json", data)
+        with warnings.catch_warnings(record=True) as actual:
+            warnings.simplefilter("always")
+            validate_letter_case("schema.json", data, memo=memo)
+
+        assert [str(record.message) for record in actual] == [str(record.message) for record in expected]
+
+    assert [str(record.message) for record in actual] == [
+        "schema.json: /r/q/definitions/x block isn't UpperCamelCase ASCII letters",
+        "schema.json: /r/q/definitions/x/q/definitions/Bad_ block isn't UpperCamelCase ASCII letters",
+    ]
+    assert memo.hits
+
+
+def test_subtree_memo_allow():
+    data = {"definitions": {"A": {"type": "array"}}, "properties": {"a": {"type": "array"}}}
+    memo = SubtreeMemo()
+
+    with pytest.warns(ArrayItemsWarning):
+        validate_array_items("schema.json", data, memo=memo)
+    with pytest.warns(ArrayItemsWarning) as records:
+        errors = validate_array_items("schema.json", data, allow_invalid={"/properties/a"}, memo=memo)
+
+    assert [str(record.message) for record in records] == ['schema.json is missing "items" at /definitions/A']
+    assert errors == 1
+    assert memo.hits == 0
+
+
+def test_incremental_state():
+    data = {
+        "properties": {"a_b": {"type": "string"}, "c": {"properties": {"X": {}, "y": {"title": "t"}}}},
+        "definitions": {"Foo": {"properties": {"Z": {}}}},
+    }
+    state = IncrementalState()
+
+    with pytest.warns(LetterCaseWarning) as records:
+        errors = validate_letter_case("schema.json", data, state=state)
+
+    expected = [str(record.message) for record in records]
+    assert errors == 5
+    assert state.visited == 11
+    assert state.reused == 0
+
+    data = copy.deepcopy(data)
+    data["properties"]["c"]["properties"]["y"]["title"] = "u"
+    data["properties"]["c"]["properties"]["W"] = {}
+
+    with pytest.warns(LetterCaseWarning) as records:
+        errors = validate_letter_case("schema.json", data, state=state)
+
+    assert [str(record.message) for record in records] == [
+        *expected[:4],
+        "schema.json: /properties/c/properties/W field isn't lowerCamelCase ASCII letters",
+        *expected[4:],
+    ]
+    assert errors == 6
+    # The changed objects and their ancestors are re-run.
+    assert state.visited == 6
+    # /properties/a_b, /properties/c/properties/X and the 4 objects under /definitions are reused.
+    assert state.reused == 6
+
+    # A different file is re-run in full.
+    with pytest.warns(LetterCaseWarning):
+        validate_letter_case("other.json", data, state=state)
+
+    assert state.reused == 0
+
+
+def test_incremental_state_list():
+    data = [{"properties": {"a_b": {}}}, {"properties": {"cd": {}}}]
+    state = IncrementalState()
+
+    with pytest.warns(LetterCaseWarning):
+        assert validate_letter_case("schema.json", data, state=state) == 1
+
+    data = copy.deepcopy(data)
+    data[1]["properties"]["d_e"] = {}
+
+    with pytest.warns(LetterCaseWarning) as records:
+        errors = validate_letter_case("schema.json", data, state=state)
+
+    assert [str(record.message) for record in records] == [
+        "schema.json: /0/properties/a_b field isn't lowerCamelCase ASCII letters",
+        "schema.json: /1/properties/d_e field isn't lowerCamelCase ASCII letters",
+    ]
+    assert errors == 2
+    # The 3 objects under /0 and /1/properties/cd are reused.
+    assert state.reused == 4
+
+
+def test_error_budget():
+    data = {"properties": {f"a{i}": {"type": "array"} for i in range(5)}}
+    budget = ErrorBudget(2)
+
+    with pytest.warns(ArrayItemsWarning) as records:
+        errors = validate_array_items("schema.json", data, budget=budget)
+
+    assert [str(record.message) for record in records] == [
+        'schema.json is missing "items" at /properties/a0',
+        'schema.json is missing "items" at /properties/a1',
+    ]
+    assert errors == 2
+    assert budget.errors == 2
+    assert budget.exhausted
+    assert budget.truncated
+
+    # An exhausted budget stops other checks.
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+
+        assert validate_null_type("schema.json", data, budget=budget) == 0
+        assert list(get_empty_files(budget=budget)) == []
+
+
+def test_error_budget_not_exhausted():
+    data = {"properties": {f"a{i}": {"type": "array"} for i in range(5)}}
+    budget = ErrorBudget(10)
+
+    with pytest.warns(NullTypeWarning) as records:
+        errors = validate_null_type("schema.json", data, budget=budget)
+
+    assert errors == len(records) == 5
+    assert not budget.exhausted
+    assert not budget.truncated
+
+
+def test_error_budget_memo():
+    data = {"definitions": {"A": {"properties": {f"a{i}": {"type": "array"} for i in range(5)}}}}
+    memo = SubtreeMemo()
+    with pytest.warns(ArrayItemsWarning):
+        validate_array_items("core.json", data, memo=memo)
+
+    budget = ErrorBudget(1)
+    with pytest.warns(ArrayItemsWarning) as records:
+        errors = validate_array_items("extension.json", copy.deepcopy(data), memo=memo, budget=budget)
+
+    # The memo's results for /definitions aren't replayed all at once.
+    assert [str(record.message) for record in records] == [
+        'extension.json is missing "items" at /definitions/A/properties/a0'
+    ]
+    assert errors == 1
+    assert budget.truncated
+
+
+def test_error_budget_get_files():
+    directory = os.path.realpath(path("empty")) + os.sep
+    budget = ErrorBudget(1)
+    with chdir(directory):
+        results = list(get_empty_files(budget=budget))
+
+    assert len(results) == 1
+    assert budget.truncated
+
+
 def test_validate_merge_properties():
     with pytest.warns(MergePropertiesWarning) as records:
         errors = validate("merge_properties")
@@ -217,6 +493,19 @@ def test_validate_metadata_presence():
     assert errors == len(records) == 3
 
 
+@pytest.mark.parametrize("allow", [PointerMatcher(["/properties/allow"]), PointerMatcher(["/*/allow"])])
+def test_validate_pointer_matcher(allow):
+    with pytest.warns(MetadataPresenceWarning) as records:
+        errors = validate("metadata_presence", allow_missing=allow)
+
+    assert errors == len(records) == 3
+
+    with pytest.warns(ArrayItemsWarning) as records:
+        errors = validate("array_items", allow_invalid=allow)
+
+    assert errors == len(records) == 1
+
+
 def test_validate_null_type():
     with pytest.warns(NullTypeWarning) as records:
         errors = validate("null_type")
@@ -306,6 +595,36 @@ def test_validate_schema():
     assert errors == len(records) == 1
 
 
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_get_schema_errors(jobs):
+    paths = [path(os.path.join("schema", "schema.json")), path(os.path.join("json", "invalid.json"))]
+
+    assert list(get_schema_errors(paths, parse("meta-schema.json"), jobs=jobs)) == [
+        (paths[0], "[] is not of type 'object'", "properties/properties/type"),
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+@pytest.mark.parametrize("max_size", [1, 1048576])
+def test_get_data_errors(tmp_path, jobs, max_size):
+    schema = {
+        "definitions": {"Item": {"type": "object", "properties": {"id": {"type": "string"}}}},
+        "properties": {"items": {"type": "array", "items": {"$ref": "#/definitions/Item"}}},
+    }
+    (tmp_path / "examples").mkdir()
+    (tmp_path / "examples" / "valid.json").write_text('{"items": [{"id": "1"}]}')
+    (tmp_path / "examples" / "invalid.json").write_text('{"items": [{"id": "1"}, {"id": 2}], "a/b": 1}')
+    (tmp_path / "examples" / "syntax.json").write_text("{")
+    (tmp_path / "other.json").write_text('{"items": 1}')
+
+    def include(path, name):
+        return "examples" in path
+
+    errors = list(get_data_errors(schema, include, jobs=jobs, max_size=max_size, top=tmp_path))
+
+    assert errors == [(str(tmp_path / "examples" / "invalid.json"), "/items/1/id", "2 is not of type 'string'")]
+
+
 def test_validate_schema_codelists_match():
     filepath = os.path.join("schema", "codelist_enum.json")
     with pytest.warns(SchemaCodelistsMatchWarning) as records:
@@ -336,3 +655,98 @@ def test_validate_schema_codelists_match_codelist():
         "unused codelists: extra.csv",
     ]
     assert errors == len(records) == 3
+
+
+def test_validate_schema_codelists_match_registry():
+    core = CodelistRegistry({"failOpenArray.csv", "failOpenString.csv", "nonexistent.csv"})
+    registry = CodelistRegistry.from_directory(path("schema"), is_extension=True, parent=core)
+
+    filepath = os.path.join("schema", "codelist_enum.json")
+    with pytest.warns(SchemaCodelistsMatchWarning) as records:
+        errors = validate_schema_codelists_match(path(filepath), parse(filepath), path("schema"), registry=registry)
+
+    assert sorted(str(record.message) for record in records) == [
+        "missing codelists: missing.csv",
+        "unused codelists: extra.csv",
+    ]
+    assert errors == len(records) == 2
+
+
+def test_validate_codelists(tmp_path):
+    files = {
+        "codelists/a.csv": "Code,Title\nx,X\ny,Y\nx,X again\n,Blank\n",
+        "codelists/+a.csv": "Code,Title\ny,Y\nz,Z\n",
+        "codelists/-b.csv": "Code,Title\nx,X\nz,Z\n",
+        "codelists/+c.csv": "Code,Title\nx,X\n",
+        "patched/codelists/a.csv": "Title,Code\nX,x\nY,y\n",
+        "patched/codelists/-b.csv": "Code,Title,Description\nx,X,\n",
+        "es/codelists/a.csv": "Code,Título\nx,X\ny,Y\n",
+        "es/codelists/-b.csv": "Código,Título,Descripción\nx,X,\n",
+        "fr/codelists/-b.csv": "Titre,Code,Description\nX,x,\n",
+        "codelists/d.csv": "Code,Title,Description\nx,X,\n",
+        "patched/codelists/d.csv": "Code,Title,Details\nx,X,\n",
+        "other.csv": "Name\nx\nx\n",
+    }
+    for name, content in files.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(content)
+
+    with pytest.warns(CodelistsWarning) as records:
+        errors = validate_codelists(base_codelists={"b.csv": ["x", "y"]}, top=tmp_path)
+
+    assert sorted(str(record.message).replace(str(tmp_path) + os.sep, "") for record in records) == [
+        t("codelists/+a.csv adds codes that a.csv already has: y"),
+        t("codelists/-b.csv removes codes that b.csv doesn't have: z"),
+        t("codelists/a.csv has blank codes"),
+        t("codelists/a.csv has duplicate codes: x"),
+        (
+            f"{os.path.join('fr', 'codelists', '-b.csv')} has headers Titre, Code, Description, but "
+            f"{os.path.join('codelists', '-b.csv')} has headers Code, Title"
+        ),
+        (
+            f"{os.path.join('patched', 'codelists', '-b.csv')} has headers Code, Title, Description, but "
+            f"{os.path.join('codelists', '-b.csv')} has headers Code, Title"
+        ),
+        (
+            f"{os.path.join('patched', 'codelists', 'a.csv')} has headers Title, Code, but "
+            f"{os.path.join('codelists', 'a.csv')} has headers Code, Title"
+        ),
+        (
+            f"{os.path.join('patched', 'codelists', 'd.csv')} has headers Code, Title, Details, but "
+            f"{os.path.join('codelists', 'd.csv')} has headers Code, Title, Description"
+        ),
+    ]
+    assert errors == len(records) == 8
+
+
+def test_validate_codelists_budget(tmp_path):
+    for i in range(3):
+        (tmp_path / f"{i}.csv").write_text("Code\nx\nx\n")
+
+    budget = ErrorBudget(2)
+    with pytest.warns(CodelistsWarning) as records:
+        errors = validate_codelists(top=tmp_path, budget=budget)
+
+    assert [str(record.message).replace(str(tmp_path) + os.sep, "") for record in records] == [
+        "0.csv has duplicate codes: x",
+        "1.csv has duplicate codes: x",
+    ]
+    assert errors == len(records) == 2
+    assert budget.truncated
+
+
+def test_validate_codelists_fixtures():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert validate_codelists(top=path("schema")) == 0
+
+
+def test_codelist_registry_layers():
+    core = CodelistRegistry({"a.csv", "b.csv"})
+    extension = CodelistRegistry({"c.csv"}, {"+a.csv"}, parent=core)
+    profile = CodelistRegistry(patches={"-c.csv", "+d.csv"}, parent=extension)
+
+    assert profile.all_codelists == {"a.csv", "b.csv", "c.csv"}
+    assert extension.match({"a.csv", "d.csv"}) == ({"c.csv"}, {"d.csv"}, set())
+    assert extension.match({"a.csv"}, external=False) == ({"c.csv"}, {"a.csv"}, set())
+    assert profile.match({"c.csv"}) == (set(), set(), {"+d.csv"})
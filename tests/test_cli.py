@@ -0,0 +1,217 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from jscc import cli
+from jscc.cli import Session, main, run_batch
+from tests import path
+
+
+@pytest.fixture(autouse=True)
+def _restore_cwd(monkeypatch):
+    monkeypatch.chdir(os.getcwd())
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "schema.json").write_text(
+        json.dumps(
+            {
+                "properties": {
+                    "array": {"title": "Array", "description": "Array", "type": ["array", "null"]},
+                    "parent": {"properties": {"child": {"title": "Child", "description": "Child", "type": "string"}}},
+                },
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+    (tmp_path / "empty.txt").write_text("\n")
+    return tmp_path
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_main(capsys, tree, jobs):
+    status = main(["--check", "array-items", "--check", "empty", "--check", "indent", "--jobs", jobs, str(tree)])
+
+    assert status == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "ERROR: empty.txt is empty [empty]",
+        'ERROR: schema.json is missing "items" at /properties/array [array-items]',
+    ]
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_main_max_errors(capsys, tree, jobs):
+    status = main(["--check", "empty", "--check", "array-items", "--max-errors", "1", "--jobs", jobs, str(tree)])
+
+    assert status == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "ERROR: empty.txt is empty [empty]",
+        "Stopped at the maximum number of errors. Other files and checks might have errors.",
+    ]
+
+
+def test_main_max_errors_json(capsys, tree):
+    status = main(["--check", "array-items", "--max-errors", "1", "--format", "json", str(tree)])
+
+    assert status == 1
+    assert json.loads(capsys.readouterr().out)["truncated"] is True
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_main_profile(capsys, tree, tmp_path, jobs):
+    profile = tmp_path / "profile.json"
+
+    main(["--check", "array-items", "--check", "empty", "--jobs", jobs, "--profile", str(profile), str(tree)])
+
+    report = json.loads(profile.read_text())
+    names = report["names"]
+
+    assert names["check:array-items"]["calls"] == 1
+    assert names["check:array-items"]["warnings"] == 1
+    assert names["check:empty"]["warnings"] == 1
+    assert names["traverse:validate_array_items"]["nodes"] == 6
+    assert names["parse:json"]["files"] == 1
+    assert names["cache:memo"]["misses"] == 5
+    assert names["walk"]["files"] > 0
+    assert report["paths"]["schema.json"]["check:array-items"]["seconds"] >= 0
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_batch(tmp_path, tree, jobs):
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "empty.json").write_text("{}\n")
+    archive = shutil.make_archive(str(tmp_path / "archive"), "zip", tmp_path, "other")
+
+    roots = [str(tree), str(other), archive, str(tmp_path / "nonexistent")]
+    results = run_batch(roots, ["array-items", "empty"], jobs=jobs)
+
+    assert list(results) == roots
+    assert [(diagnostic["path"], diagnostic["check"]) for diagnostic in results[str(tree)]] == [
+        ("empty.txt", "empty"),
+        ("other/empty.json", "empty"),
+        ("schema.json", "array-items"),
+    ]
+    assert (
+        results[str(other)]
+        == results[archive]
+        == [{"check": "empty", "path": "empty.json", "message": "empty.json is empty", "error": True}]
+    )
+    assert len(results[roots[3]]) == 1
+    assert results[roots[3]][0]["check"] == "batch"
+    assert os.getcwd() != str(other)
+
+
+def test_main_json(capsys, tree):
+    status = main(["--check", "deep-properties", "--format", "json", str(tree)])
+
+    assert status == 0
+    assert json.loads(capsys.readouterr().out) == {
+        "errors": 0,
+        "diagnostics": [
+            {
+                "check": "deep-properties",
+                "path": "schema.json",
+                "message": 'schema.json has "properties" within "properties" at /properties/parent',
+                "error": False,
+            },
+        ],
+    }
+
+
+def test_main_file_checks(capsys):
+    status = main(["--check", "invalid-json", path("json")])
+
+    assert status == 1
+    assert sorted(capsys.readouterr().out.splitlines()) == [
+        "ERROR: duplicate-key.json is not valid JSON: x [invalid-json]",
+        (
+            "ERROR: invalid.json is not valid JSON: Expecting property name enclosed in double quotes: "
+            "line 2 column 1 (char 2) [invalid-json]"
+        ),
+    ]
+
+
+def test_main_schema_without_metaschema(capsys):
+    with pytest.raises(SystemExit):
+        main(["--check", "schema", path("schema")])
+
+    assert "the schema check requires --metaschema" in capsys.readouterr().err
+
+
+def test_session(monkeypatch, tree):
+    calls = []
+
+    def count(name):
+        check = cli.SCHEMA_CHECKS[name]
+
+        def method(path, data, **options):
+            calls.append((name, path))
+            return check(path, data, **options)
+
+        monkeypatch.setitem(cli.SCHEMA_CHECKS, name, method)
+
+    count("array-items")
+    count("codelist-enum")
+    monkeypatch.chdir(tree)
+    (tree / "other.json").write_text('{"properties": {}}\n')
+
+    session = Session(["empty", "array-items", "codelist-enum"])
+
+    assert [diagnostic["message"] for diagnostic in session.run()] == [
+        "empty.txt is empty",
+        'schema.json is missing "items" at /properties/array',
+    ]
+    assert sorted(calls) == [
+        ("array-items", "other.json"),
+        ("array-items", "schema.json"),
+        ("codelist-enum", "other.json"),
+        ("codelist-enum", "schema.json"),
+    ]
+
+    # A JSON Schema file changes.
+    calls.clear()
+    (tree / "empty.txt").write_text("text")
+    (tree / "schema.json").write_text('{"properties": {"array": {"type": "array", "items": {}}}}\n')
+
+    assert [diagnostic["message"] for diagnostic in session.run({"empty.txt", "schema.json"})] == []
+    assert sorted(calls) == [("array-items", "schema.json"), ("codelist-enum", "schema.json")]
+
+    # A CSV file is created.
+    calls.clear()
+    (tree / "codelist.csv").write_text("Code\nfoo\n")
+
+    assert [diagnostic["message"] for diagnostic in session.run({"codelist.csv"})] == []
+    assert sorted(calls) == [("codelist-enum", "other.json"), ("codelist-enum", "schema.json")]
+
+    # A JSON Schema file is deleted.
+    calls.clear()
+    os.remove(tree / "schema.json")
+
+    assert session.run({"schema.json"}) == []
+    assert calls == []
+    assert "schema.json" not in session.paths
+    assert list(session.schemas) == ["other.json"]
+
+
+def test_main_watch(capsys, monkeypatch, tree):
+    def watch(top, **kwargs):
+        yield {os.path.join(top, "schema.json")}
+        (tree / "empty.txt").write_text("text")
+        yield {os.path.join(top, "empty.txt")}
+
+    monkeypatch.setattr(cli, "watch", watch)
+
+    status = main(["--check", "empty", "--watch", str(tree)])
+
+    assert status == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "ERROR: empty.txt is empty [empty]",
+        "",
+        "ERROR: empty.txt is empty [empty]",
+        "",
+    ]
@@ -0,0 +1,205 @@
+import os
+import subprocess
+
+import pytest
+
+from jscc.testing.checks import get_empty_files, get_invalid_json_files, get_misindented_files
+from jscc.testing.filesystem import CodelistCache, GitObjectStore, walk, walk_csv_data, walk_json_data
+from tests import path
+
+
+def test_walk_git(tmp_path):
+    for name in ("tracked.json", "ignored.json", "untracked.json", os.path.join("build", "tracked.json")):
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text("{}\n")
+    (tmp_path / ".gitignore").write_text("ignored.json\n")
+
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(["git", "add", ".gitignore", "tracked.json", "build"], cwd=tmp_path, check=True)
+
+    assert sorted(name for _, name in walk(top=tmp_path, git=True)) == [".gitignore", "tracked.json"]
+    assert sorted(name for _, name in walk(top=tmp_path)) == [
+        ".gitignore",
+        "ignored.json",
+        "tracked.json",
+        "untracked.json",
+    ]
+
+
+def test_walk_git_fallback(tmp_path):
+    (tmp_path / "file.json").write_text("{}\n")
+
+    assert [(path, name) for path, name in walk(top=tmp_path, git=True)] == [
+        (os.path.join(tmp_path, "file.json"), "file.json")
+    ]
+
+
+def test_walk_csv_data_columnar():
+    top = path(os.path.join("schema", "codelists"))
+    expected = {name: (fieldnames, rows) for _, name, _, fieldnames, rows in walk_csv_data(top=top)}
+
+    actual = {}
+    for _, name, text, fieldnames, codelist in walk_csv_data(top=top, columnar=True):
+        assert text is None
+
+        actual[name] = (fieldnames, list(codelist))
+
+    assert actual == expected
+
+
+def test_codelist_cache(tmp_path):
+    filepath = tmp_path / "codelist.csv"
+    filepath.write_text("Code,Title\na,A\n")
+    directory = tmp_path / "cache"
+
+    cache = CodelistCache(directory)
+    assert list(cache.get(filepath).codes) == ["a"]
+    assert list(cache.get(filepath).codes) == ["a"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Read from disk.
+    cache = CodelistCache(directory)
+    assert list(cache.get(filepath).codes) == ["a"]
+    assert (cache.hits, cache.misses) == (1, 0)
+
+    # Invalidate on change.
+    filepath.write_text("Code,Title\na,A\nb,B\n")
+    cache = CodelistCache(directory)
+    assert list(cache.get(filepath).codes) == ["a", "b"]
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_walk_csv_data_cache(tmp_path):
+    top = path(os.path.join("schema", "codelists"))
+    cache = CodelistCache(tmp_path)
+
+    expected = {name: (fieldnames, rows) for _, name, _, fieldnames, rows in walk_csv_data(top=top)}
+    for _ in range(2):
+        actual = {
+            name: (fieldnames, list(rows)) for _, name, _, fieldnames, rows in walk_csv_data(top=top, cache=cache)
+        }
+
+        assert actual == expected
+    assert cache.hits == cache.misses == len(expected)
+
+
+def _commit(tmp_path, files):
+    for name, text in files.items():
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text(text)
+    subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)
+    subprocess.run(
+        ["git", "-c", "user.name=jscc", "-c", "user.email=jscc@example.com", "commit", "-q", "-m", "commit"],
+        cwd=tmp_path,
+        check=True,
+    )
+
+
+@pytest.fixture
+def repository(tmp_path):
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    _commit(
+        tmp_path,
+        {
+            "a.json": '{\n  "a": 1\n}\n',
+            "b.json": '{"b": 2}',
+            "empty.json": "{}\n",
+            "codelists/c.csv": "Code,Title\nx,X\n",
+            "build/d.json": "{}\n",
+        },
+    )
+    _commit(tmp_path, {"a.json": '{\n  "a": 2\n}\n', "invalid.json": "{"})
+    # The working tree differs from both revisions.
+    (tmp_path / "a.json").write_text('{\n  "a": 3\n}\n')
+    (tmp_path / "untracked.json").write_text("{}\n")
+    return tmp_path
+
+
+def test_git_tree(repository):
+    with GitObjectStore(repository) as store:
+        old = store.tree("HEAD~1")
+        new = store.tree("HEAD")
+
+        assert sorted(name for _, name in walk(source=old)) == ["a.json", "b.json", "c.csv", "empty.json"]
+        assert sorted(name for _, name in walk(source=new, excluded=())) == [
+            "a.json",
+            "b.json",
+            "c.csv",
+            "d.json",
+            "empty.json",
+            "invalid.json",
+        ]
+
+        assert {name: data for _, name, _, data in walk_json_data(source=old)} == {
+            "a.json": {"a": 1},
+            "b.json": {"b": 2},
+            "empty.json": {},
+        }
+        assert store.misses == 3
+
+        assert {name: data for _, name, _, data in walk_json_data(source=new)} == {
+            "a.json": {"a": 2},
+            "b.json": {"b": 2},
+            "empty.json": {},
+        }
+        # Only the changed and added files are parsed.
+        assert store.misses == 5
+        assert store.hits == 2
+
+        [(filepath, name, text, fieldnames, codelist)] = walk_csv_data(source=new, columnar=True)
+
+        assert filepath == os.path.join(repository, "codelists", "c.csv")
+        assert name == "c.csv"
+        assert text is None
+        assert fieldnames == ["Code", "Title"]
+        assert list(codelist) == [{"Code": "x", "Title": "X"}]
+
+        assert [os.path.basename(path) for (path,) in get_empty_files(source=new)] == ["empty.json"]
+        assert [os.path.basename(path) for (path,) in get_misindented_files(source=new)] == ["b.json"]
+        assert [os.path.basename(path) for path, _ in get_invalid_json_files(source=new)] == ["invalid.json"]
+        assert [os.path.basename(path) for path, _ in get_invalid_json_files(source=old)] == []
+
+
+def test_git_tree_get_empty_files(repository, monkeypatch):
+    (repository / "untracked.json").unlink()
+    subprocess.run(["git", "checkout", "-q", "a.json"], cwd=repository, check=True)
+    _commit(repository, {"zero.txt": ""})
+
+    with GitObjectStore(repository) as store:
+        reads = []
+        read = store.read
+        monkeypatch.setattr(store, "read", lambda oid: reads.append(oid) or read(oid))
+
+        assert [os.path.basename(path) for (path,) in get_empty_files(source=store.tree("HEAD~2"))] == ["empty.json"]
+        assert len(reads) == 4
+
+        for revision in ("HEAD~1", "HEAD"):
+            assert sorted(os.path.basename(path) for (path,) in get_empty_files(source=store.tree(revision))) == [
+                "empty.json",
+                *(["zero.txt"] if revision == "HEAD" else []),
+            ]
+        # Only the changed and added files are read, and zero-length files aren't read.
+        assert len(reads) == 6
+
+
+def test_git_tree_get_misindented_files_patch(repository):
+    with GitObjectStore(repository) as store:
+        tree = store.tree("HEAD")
+
+        assert [os.path.basename(path) for (path,) in get_misindented_files(source=tree)] == ["b.json"]
+
+        # The patched text isn't checked with the cached result of the unpatched text, or vice versa.
+        def patch(text):
+            return text.replace("\n", "")
+
+        assert sorted(os.path.basename(path) for (path,) in get_misindented_files(source=tree, patch=patch)) == [
+            "a.json",
+            "b.json",
+            "empty.json",
+        ]
+        assert [os.path.basename(path) for (path,) in get_misindented_files(source=tree)] == ["b.json"]
+
+
+def test_git_tree_error(repository):
+    with GitObjectStore(repository) as store, pytest.raises(subprocess.CalledProcessError):
+        store.tree("nonexistent")
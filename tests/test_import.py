@@ -0,0 +1,50 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Modules that are slow to import, and that are imported on first use.
+HEAVY = {"concurrent.futures.process", "json_merge_patch", "jsonref", "jsonschema", "requests", "urllib3"}
+
+# The cumulative import time of a module, in microseconds, on a slow machine.
+BUDGET = 200_000
+
+CODE = """
+import json
+import sys
+
+import {module}
+
+print(json.dumps(sorted(name for name in {heavy!r} if name in sys.modules)))
+"""
+
+
+def run(module, *options):
+    return subprocess.run(
+        [sys.executable, *options, "-c", CODE.format(module=module, heavy=HEAVY)],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+@pytest.mark.parametrize(
+    "module", ["jscc.schema", "jscc.jsonlib", "jscc.testing.checks", "jscc.testing.filesystem", "jscc.cli"]
+)
+def test_lazy_imports(module):
+    assert json.loads(run(module).stdout) == []
+
+
+@pytest.mark.parametrize("module", ["jscc.schema", "jscc.testing.checks"])
+def test_import_time(module):
+    process = run(module, "-X", "importtime")
+
+    # import time: self [us] | cumulative | imported package
+    for line in process.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            assert int(cumulative) < BUDGET
+            break
+    else:
+        pytest.fail(f"{module} wasn't imported")
@@ -0,0 +1,69 @@
+import warnings
+
+from jscc import instrument
+from jscc.instrument import Collector
+from jscc.testing.checks import validate_letter_case
+from jscc.testing.filesystem import CodelistCache, walk_csv_data, walk_json_data
+from tests import path
+
+
+def test_disabled():
+    assert instrument.hooks == []
+    with instrument.timed("check", "name") as metrics:
+        assert metrics is None
+
+
+def test_hook():
+    events = []
+
+    def hook(*args):
+        events.append(args)
+
+    instrument.register(hook)
+    try:
+        with instrument.timed("check", "name", "path") as metrics:
+            metrics["calls"] = 1
+        instrument.emit("cache", "codelists", hits=1)
+    finally:
+        instrument.unregister(hook)
+
+    assert instrument.hooks == []
+    assert events[0][:3] == ("check", "name", "path")
+    assert events[0][3]["calls"] == 1
+    assert events[0][3]["seconds"] >= 0
+    assert events[1] == ("cache", "codelists", None, {"hits": 1})
+
+
+def test_collector():
+    cache = CodelistCache()
+
+    with Collector() as collector, warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for _, _, _, data in walk_json_data(top=path("schema")):
+            validate_letter_case("schema.json", data)
+        for _ in range(2):
+            for _ in walk_csv_data(top=path(""), cache=cache):
+                pass
+
+    report = collector.report()
+    names = report["names"]
+
+    assert names["walk"]["files"] > names["parse:json"]["files"] > 0
+    assert names["parse:json"]["bytes"] > 0
+    assert names["traverse:validate_letter_case"]["calls"] == names["parse:json"]["files"]
+    assert names["traverse:validate_letter_case"]["nodes"] > 0
+    assert names["cache:codelists"]["hits"] == names["cache:codelists"]["misses"] == names["parse:csv"]["files"]
+    assert (
+        sum(
+            metrics["traverse:validate_letter_case"]["nodes"]
+            for metrics in report["paths"].values()
+            if "traverse:validate_letter_case" in metrics
+        )
+        == names["traverse:validate_letter_case"]["nodes"]
+    )
+
+    other = Collector()
+    other.merge(report)
+    other.merge(report)
+
+    assert other.report()["names"]["walk"]["files"] == 2 * names["walk"]["files"]
@@ -0,0 +1,125 @@
+import io
+import json
+
+import pytest
+
+from jscc import jsonlib
+from jscc.exceptions import DuplicateKeyError, InvalidJSONError
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"a": 1, "b": [1.5, -0.0, 1e16, true, null], "c": "\\u00e9"}',
+        '{"a": 1, "a": 2}',
+        "123456789012345678901234567890",
+        "-9223372036854775809",
+        "NaN",
+        '"\\ud800"',
+        " [ ] ",
+    ],
+)
+def test_loads(text):
+    expected = json.loads(text)
+
+    assert repr(jsonlib.loads(text)) == repr(expected)
+
+
+@pytest.mark.parametrize("text", ["{", '{"a": 1,}', '"\\x"', '"\x00"', "﻿{}"])
+def test_loads_error(text):
+    with pytest.raises(json.JSONDecodeError) as expected:
+        json.loads(text)
+    with pytest.raises(json.JSONDecodeError) as actual:
+        jsonlib.loads(text)
+
+    assert str(actual.value) == str(expected.value)
+
+
+def test_loads_fallback(monkeypatch):
+    monkeypatch.setattr(jsonlib, "orjson", None)
+
+    assert jsonlib.loads('{"a": 1}') == {"a": 1}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 65536])
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"a": 1, "b": [1.5, -0.0, 1e16, true, null], "c": "\\u00e9", "d": {}}',
+        '["é", NaN, -Infinity]',
+        " [ ] ",
+    ],
+)
+def test_check(text, chunk_size):
+    jsonlib.check(io.BytesIO(text.encode()), chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 7, 16, 17, 33, 65536])
+@pytest.mark.parametrize(
+    "text",
+    [
+        "[" + " " * 16 + "true]",
+        "[1," + "\n" * 40 + "-Infinity]",
+        '{"a":' + " " * 20 + "null, " + "\t" * 17 + '"b": 12345}',
+    ],
+)
+def test_check_whitespace(text, chunk_size):
+    jsonlib.check(io.BytesIO(text.encode()), chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1000, 4096, 65536])
+def test_check_indented(chunk_size):
+    # Literals are indented by more than 16 spaces.
+    data = [{"a": {"b": {"c": {"d": [True, False, None, 1.5, -2, i]}}}, "e": "x" * (i % 50)} for i in range(1000)]
+    text = json.dumps(data, indent=4).encode()
+
+    assert len(text) > 2 * chunk_size
+    jsonlib.check(io.BytesIO(text), chunk_size)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 65536])
+@pytest.mark.parametrize(
+    ("text", "message"),
+    [
+        ("", "Expecting value: byte 0, pointer ''"),
+        ('{"a": [1,]}', "Expecting value: byte 9, pointer '/a/1'"),
+        ('{"a": [1 2]}', "Expecting ',' delimiter: byte 9, pointer '/a/0'"),
+        ('{"a" 1}', "Expecting ':' delimiter: byte 5, pointer '/a'"),
+        ('{"a": 1,}', "Expecting property name enclosed in double quotes: byte 8, pointer '/a'"),
+        ('{"a/~": [tru]}', "Expecting value: byte 9, pointer '/a~1~0/0'"),
+        ('{"a": "\\x"}', "Invalid string: byte 7, pointer '/a'"),
+        ('{"a": "b', "Invalid string: byte 8, pointer '/a'"),
+        ("{} {}", "Extra data: byte 3, pointer ''"),
+        ("{", "Expecting property name enclosed in double quotes: byte 1, pointer ''"),
+        ("[" + " " * 20 + "tru]", "Expecting value: byte 21, pointer '/0'"),
+    ],
+)
+def test_check_error(text, message, chunk_size):
+    with pytest.raises(InvalidJSONError) as excinfo:
+        jsonlib.check(io.BytesIO(text.encode()), chunk_size)
+
+    assert str(excinfo.value) == message
+
+
+def test_check_error_utf8():
+    with pytest.raises(InvalidJSONError) as excinfo:
+        jsonlib.check(io.BytesIO(b'["\xc3"]'))
+
+    assert str(excinfo.value) == "Invalid UTF-8 (invalid continuation byte): byte 2, pointer '/0'"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 65536])
+def test_check_duplicate_key(chunk_size):
+    with pytest.raises(DuplicateKeyError) as excinfo:
+        jsonlib.check(io.BytesIO(b'{"a": [{"x": 0, "y": 1, "x": 2}]}'), chunk_size)
+
+    assert str(excinfo.value) == "x"
+    assert excinfo.value.pos == 24
+    assert excinfo.value.pointer == "/a/0/x"
+
+
+def test_check_duplicate_key_escaped():
+    with pytest.raises(DuplicateKeyError) as excinfo:
+        jsonlib.check(io.BytesIO(b'{"a": 1, "\\u0061": 2}'))
+
+    assert str(excinfo.value) == "a"
@@ -0,0 +1,26 @@
+import json
+
+from jscc.testing.plugin import shard
+
+pytest_plugins = ["pytester"]
+
+
+def test_shard():
+    assert shard({"a": 5, "b": 4, "c": 3, "d": 3, "e": 1}, 2) == {"a": 0, "b": 1, "c": 1, "d": 0, "e": 1}
+
+
+def test_plugin(pytester):
+    pytester.makefile(".json", schema=json.dumps({"properties": {}}), data=json.dumps([]))
+    pytester.makefile(".csv", codelist="Code\na\n")
+    pytester.makepyfile(
+        """
+        def test_schema(jscc_schema_path, jscc_schemas, jscc_dereferenced, jscc_codelists):
+            assert jscc_schemas[jscc_schema_path] == {"properties": {}}
+            assert jscc_dereferenced[jscc_schema_path] == {"properties": {}}
+            assert jscc_codelists.codelists == {"codelist.csv"}
+        """
+    )
+
+    result = pytester.runpytest("-p", "jscc.testing.plugin")
+
+    result.assert_outcomes(passed=1)
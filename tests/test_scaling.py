@@ -0,0 +1,143 @@
+import os
+import sys
+import time
+import warnings
+
+import jsonref
+import pytest
+
+from jscc.testing.checks import (
+    IncrementalState,
+    SubtreeMemo,
+    _traverse,
+    validate_codelist_enum,
+    validate_letter_case,
+    validate_null_type,
+    validate_schema_codelists_match,
+)
+from jscc.testing.filesystem import CodelistCache
+from tests import synthetic
+
+# A quadratic method takes 64 times longer on 8 times the input.
+FACTOR = 8
+ALLOWED = FACTOR * 2.5
+
+
+def seconds(function, *args):
+    times = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for _ in range(3):
+            start = time.perf_counter()
+            function(*args)
+            times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def assert_linear(function, make, size):
+    small = make(size)
+    large = make(size * FACTOR)
+
+    ratio = seconds(function, *large) / seconds(function, *small)
+
+    assert ratio < ALLOWED, f"{ratio:.1f}x slower on {FACTOR}x the input"
+
+
+def count(path, data, pointer):
+    return 1
+
+
+def letter_case_state(path, data):
+    state = IncrementalState()
+    validate_letter_case(path, data, state=state)
+    # The second call finds the changed values, and reuses the results.
+    return validate_letter_case(path, data, state=state)
+
+
+@pytest.mark.parametrize(
+    "function",
+    [
+        _traverse(count),
+        _traverse(count, SubtreeMemo(), ("count",)),
+        validate_null_type,
+        validate_letter_case,
+        letter_case_state,
+    ],
+    ids=["traverse", "traverse-memo", "null_type", "letter_case", "letter_case-state"],
+)
+def test_deep(function):
+    depth = sys.getrecursionlimit() * 3
+
+    function("schema.json", synthetic.deep_schema(depth))
+
+
+@pytest.mark.parametrize(
+    "function",
+    [
+        _traverse(count),
+        validate_null_type,
+        validate_letter_case,
+    ],
+    ids=["traverse", "null_type", "letter_case"],
+)
+def test_wide(function):
+    assert_linear(function, lambda size: ("schema.json", synthetic.wide_schema(size)), 1000)
+
+
+@pytest.mark.parametrize(
+    "function",
+    [
+        _traverse(count),
+        validate_null_type,
+    ],
+    ids=["traverse", "null_type"],
+)
+def test_cyclic(function):
+    assert_linear(function, lambda size: ("schema.json", jsonref.replace_refs(synthetic.cyclic_schema(size))), 100)
+
+
+def test_cyclic_traverse():
+    data = jsonref.replace_refs(synthetic.cyclic_schema(1))
+
+    # /, /properties, /properties/first, /properties/first/properties, /properties/first/properties/id,
+    # /properties/first/properties/children, /properties/first/properties/children/items, and so on, under
+    # /definitions/Definition0. Each reference is followed once.
+    assert _traverse(count)("schema.json", data) == 15
+
+
+def test_codelist_enum_large_enum(tmp_path, monkeypatch):
+    def make(size):
+        directory = tmp_path / str(size)
+        synthetic.write_codelists(directory, 1, size)
+        return (os.path.join(directory, "schema.json"), synthetic.codelist_schema(1, size))
+
+    def function(path, data):
+        monkeypatch.chdir(os.path.dirname(path))
+        assert validate_codelist_enum(path, data, cache=CodelistCache()) == 0
+
+    assert_linear(function, make, 1000)
+
+
+def test_codelist_enum_many_codelists(tmp_path, monkeypatch):
+    def make(size):
+        directory = tmp_path / str(size)
+        synthetic.write_codelists(directory, size, 2)
+        return (os.path.join(directory, "schema.json"), synthetic.codelist_schema(size, 2))
+
+    def function(path, data):
+        monkeypatch.chdir(os.path.dirname(path))
+        assert validate_codelist_enum(path, data, cache=CodelistCache()) == 0
+
+    assert_linear(function, make, 50)
+
+
+def test_schema_codelists_match_many_codelists(tmp_path):
+    def make(size):
+        directory = tmp_path / str(size)
+        synthetic.write_codelists(directory, size, 2)
+        return (str(directory), synthetic.codelist_schema(size, 2))
+
+    def function(directory, data):
+        assert validate_schema_codelists_match("schema.json", data, directory) == 0
+
+    assert_linear(function, make, 100)
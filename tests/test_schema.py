@@ -1,10 +1,17 @@
 import csv
 import json
+import pickle
+from io import StringIO
 
+import jsonref
 import pytest
 
 from jscc.exceptions import DuplicateKeyError
 from jscc.schema import (
+    Codelist,
+    NodeTable,
+    collect_codelists,
+    diff,
     extend_schema,
     get_types,
     is_array_of_objects,
@@ -31,6 +38,28 @@ def test_is_codelist(filename, expected):
         assert is_codelist(reader.fieldnames) == expected
 
 
+def test_codelist():
+    codelist = Codelist.read(StringIO("Code,Title\r\na,A\r\n\r\nb\r\na,Duplicate,Extra\r\n"))
+
+    assert codelist.fieldnames == ["Code", "Title"]
+    assert codelist.columns == [("a", "b", "a"), ("A", None, "Duplicate")]
+    assert codelist.column("Title") == ("A", None, "Duplicate")
+    assert list(codelist.codes) == ["a", "b"]
+    assert codelist.row("a") == {"Code": "a", "Title": "A"}
+    assert "b" in codelist
+    assert "c" not in codelist
+    assert len(codelist) == 3
+    assert list(codelist) == list(csv.DictReader(StringIO("Code,Title\r\na,A\r\nb\r\na,Duplicate\r\n")))
+
+
+def test_codelist_empty():
+    codelist = Codelist.read(StringIO(""))
+
+    assert codelist.fieldnames == []
+    assert list(codelist.codes) == []
+    assert len(codelist) == 0
+
+
 @pytest.mark.parametrize(
     ("filename", "expected"),
     [
@@ -94,6 +123,102 @@ def test_get_types(field, expected):
     assert get_types(parse("schema.json")["properties"][field]) == expected
 
 
+def test_collect_codelists():
+    data = {
+        "properties": {
+            "a": {"codelist": "a.csv"},
+            "b": {"items": [{"codelist": "b.csv"}]},
+        },
+    }
+    data["properties"]["cycle"] = data
+    codelists = {"c.csv"}
+
+    assert collect_codelists(data) == {"a.csv", "b.csv"}
+    assert collect_codelists(data, codelists) is codelists
+    assert codelists == {"a.csv", "b.csv", "c.csv"}
+
+
+def test_diff():
+    old = {"a": 1, "b": {"c": [1, 2], "d": "x"}, "e": 1}
+    new = {"a": 1, "b": {"c": [1, 3], "d": "y"}, "f": 1, "e": 1.5}
+
+    assert sorted(diff(old, new)) == ["/b/c/1", "/b/d", "/e", "/f"]
+
+
+@pytest.mark.parametrize(
+    ("old", "new", "expected"),
+    [
+        ({"a": 1}, {"a": 1}, []),
+        ([1], [1, 2], [""]),
+        ({"a": {"b": 1}}, {"a": 1}, ["/a"]),
+        ({"a": 1}, {"a": True}, ["/a"]),
+        ({"a/b": {"c": 1}}, {"a/b": {"c": 2}}, ["/a/b/c"]),
+    ],
+)
+def test_diff_cases(old, new, expected):
+    assert list(diff(old, new)) == expected
+
+
+def test_node_table():
+    schema = {
+        "type": "object",
+        "required": ["a"],
+        "properties": {
+            "a": {"type": ["string", "null"], "codelist": "a.csv", "openCodelist": True, "enum": ["x", None]},
+            "b": {"type": "array", "items": {"$ref": "#/definitions/B"}},
+        },
+        "definitions": {"B": {"type": "object", "properties": {"c": {"type": "integer"}}}},
+    }
+
+    table = NodeTable.compile(schema)
+
+    assert len(table) == 12
+    assert [table.pointer(i) for i in table.children(0)] == ["/required", "/properties", "/definitions"]
+    assert [table.pointer(i) for i in table.children(2)] == ["/properties/a", "/properties/b"]
+    assert table.pointer(table.parent[table.parent[11]]) == "/definitions/B"
+    assert table.types[3] == NodeTable.TYPES["string"] | NodeTable.TYPES["null"]
+    assert table.flags[1] == NodeTable.ARRAY
+
+    assert [table.pointer(i) for i in table.select(NodeTable.REQUIRED)] == ["/properties/a"]
+    assert [table.pointer(i) for i in table.select(NodeTable.CODELIST | NodeTable.OPEN_CODELIST)] == ["/properties/a"]
+    assert [table.pointer(i) for i in table.select(NodeTable.REF)] == ["/properties/b/items"]
+    assert [table.pointer(i) for i in table.select(NodeTable.ARRAY_OF_OBJECTS)] == ["/properties/b"]
+    assert [table.pointer(i) for i in table.select(types=NodeTable.TYPES["integer"])] == [
+        "/definitions/B/properties/c"
+    ]
+
+    copy = pickle.loads(pickle.dumps(table))
+
+    assert copy.parent == table.parent
+    assert copy.end == table.end
+    assert copy.keys == table.keys
+    assert copy.types == table.types
+    assert copy.flags == table.flags
+
+
+def test_node_table_cycle():
+    schema = jsonref.replace_refs(
+        {
+            "properties": {"a": {"$ref": "#/definitions/A"}},
+            "definitions": {"A": {"properties": {"a": {"$ref": "#/definitions/A"}}}},
+        }
+    )
+
+    table = NodeTable.compile(schema)
+
+    assert [table.pointer(i) for i in range(len(table))] == [
+        "",
+        "/properties",
+        "/properties/a",
+        "/properties/a/properties",
+        "/properties/a/properties/a",
+        "/definitions",
+        "/definitions/A",
+        "/definitions/A/properties",
+        "/definitions/A/properties/a",
+    ]
+
+
 def test_extend_schema():
     schema = {
         "title": "A schema",
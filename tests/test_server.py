@@ -0,0 +1,120 @@
+import os
+import sys
+import threading
+
+import pytest
+
+import jscc.server
+from jscc import client
+from jscc.server import Server
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Unix domain sockets")
+
+
+@pytest.fixture(autouse=True)
+def _restore_cwd(monkeypatch):
+    monkeypatch.chdir(os.getcwd())
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = str(tmp_path / "jscc.sock")
+    with Server(path) as server:
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        yield path, server
+        server.shutdown()
+        thread.join()
+
+
+def test_request(monkeypatch, tmp_path, server):
+    path, instance = server
+    (tmp_path / "empty.txt").write_text("\n")
+    monkeypatch.chdir(tmp_path)
+
+    response = client.request(["--check", "empty", "--path", "empty.txt"], path)
+
+    assert response == {
+        "status": 1,
+        "output": "ERROR: empty.txt is empty [empty]\n",
+        "error": "",
+        "diagnostics": [{"check": "empty", "path": "empty.txt", "message": "empty.txt is empty", "error": True}],
+    }
+    assert oct(os.stat(path).st_mode & 0o777) == "0o600"
+
+    (tmp_path / "empty.txt").write_text("text")
+
+    response = client.request(["--check", "empty", "--path", "empty.txt"], path)
+
+    assert response["status"] == 0
+    assert response["output"] == ""
+    assert len(instance.sessions) == 1
+
+
+def test_request_error(server):
+    path, _ = server
+
+    response = client.request(["--check", "nonexistent"], path)
+
+    assert response["status"] == 2
+    assert "invalid choice: 'nonexistent'" in response["error"]
+
+
+def test_main_fallback(capsys, monkeypatch, tmp_path):
+    (tmp_path / "empty.txt").write_text("\n")
+    monkeypatch.setenv("JSCC_SOCKET", str(tmp_path / "nonexistent.sock"))
+
+    status = client.main(["--check", "empty", str(tmp_path)])
+
+    assert status == 1
+    assert capsys.readouterr().out == "ERROR: empty.txt is empty [empty]\n"
+
+
+def test_main(capsys, monkeypatch, tmp_path, server):
+    path, _ = server
+    (tmp_path / "tree").mkdir()
+    (tmp_path / "tree" / "empty.txt").write_text("\n")
+    monkeypatch.setenv("JSCC_SOCKET", path)
+
+    status = client.main(["--check", "empty", str(tmp_path / "tree")])
+
+    assert status == 1
+    assert capsys.readouterr().out == "ERROR: empty.txt is empty [empty]\n"
+
+
+def test_socket_path(monkeypatch, tmp_path):
+    monkeypatch.delenv("JSCC_SOCKET", raising=False)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+
+    assert client.socket_path() == str(tmp_path / "jscc.sock")
+
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+
+    assert os.path.basename(os.path.dirname(client.socket_path())).startswith("jscc-")
+
+
+def test_request_not_socket(capsys, monkeypatch, tmp_path):
+    path = tmp_path / "jscc.sock"
+    path.write_text("")
+    (tmp_path / "empty.txt").write_text("\n")
+    monkeypatch.setenv("JSCC_SOCKET", str(path))
+
+    with pytest.raises(PermissionError):
+        client.request(["--check", "empty"], str(path))
+
+    status = client.main(["--check", "empty", str(tmp_path)])
+
+    assert status == 1
+    assert capsys.readouterr().err == f"jscc-client: {path} is not a socket, running the checks in-process\n"
+
+    with pytest.raises(SystemExit):
+        jscc.server.main(["--socket", str(path)])
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid") or os.getuid() != 0, reason="requires root, to change the owner")
+def test_request_other_user(server):
+    path, _ = server
+    os.chown(path, 65534, -1)
+
+    with pytest.raises(PermissionError, match="is owned by another user"):
+        client.request(["--check", "empty"], path)
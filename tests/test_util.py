@@ -3,7 +3,8 @@ from unittest.mock import patch
 import pytest
 import requests
 
-from jscc.testing.util import http_get, http_head, warn_and_assert
+from jscc.testing.util import PointerMatcher, get_validator, http_get, http_head, warn_and_assert
+from tests import parse
 
 
 @patch("requests.head")
@@ -30,6 +31,45 @@ def test_http_get_error():
         http_get("http://httpbin.org/status/400")
 
 
+def test_get_validator():
+    validator = get_validator(parse("meta-schema.json"))
+
+    assert get_validator(parse("meta-schema.json")) is validator
+    assert get_validator(parse("meta-schema.json"), format_checker=False) is not validator
+    assert validator.format_checker is not None
+
+
+@pytest.mark.parametrize(
+    ("pointer", "expected"),
+    [
+        ("", False),
+        ("/properties/tag", True),
+        ("/properties/tags", False),
+        ("/definitions/Award/properties/id", True),
+        ("/definitions/Award/properties/title", False),
+        ("/definitions/Award/properties/id/items", False),
+        ("/definitions/Award/properties", False),
+        ("/definitions/Award/items/x/properties/id", True),
+        ("/definitions/*/properties/id", True),
+    ],
+)
+def test_pointer_matcher(pointer, expected):
+    matcher = PointerMatcher(
+        ["/properties/tag", "/definitions/*/properties/id", "/definitions/*/items/*/properties/id"]
+    )
+
+    assert (pointer in matcher) is expected
+    assert matcher(pointer) is expected
+
+
+def test_pointer_matcher_empty():
+    matcher = PointerMatcher()
+
+    assert not matcher
+    assert "/properties/tag" not in matcher
+    assert list(PointerMatcher(["/a", "/*"])) == ["/a", "/*"]
+
+
 def test_warn_and_assert():
     with pytest.raises(AssertionError) as excinfo, pytest.warns(UserWarning) as records:  # noqa: PT030
         warn_and_assert([("path/",)], "{0} is invalid", "See errors above")
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+from jscc.watch import watch
+
+
+@pytest.mark.parametrize(
+    "polling",
+    [
+        True,
+        pytest.param(False, marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify")),
+    ],
+)
+def test_watch(tmp_path, polling):
+    (tmp_path / "a.json").write_text("{}")
+    (tmp_path / "build").mkdir()
+
+    changes = watch(str(tmp_path), polling=polling, interval=0.01)
+
+    (tmp_path / "a.json").write_text('{"a": 1}')
+    (tmp_path / "build" / "b.json").write_text("{}")
+
+    assert next(changes) == {os.path.join(tmp_path, "a.json")}
+
+    (tmp_path / "directory").mkdir()
+    (tmp_path / "directory" / "c.json").write_text("{}")
+    (tmp_path / "a.json").unlink()
+
+    changed = set()
+    while len(changed) < 2:
+        changed |= next(changes)
+
+    assert changed == {os.path.join(tmp_path, "a.json"), os.path.join(tmp_path, "directory", "c.json")}
+
+    changes.close()